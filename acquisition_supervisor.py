@@ -0,0 +1,123 @@
+"""
+Acquisition thread supervisor.
+Marks the data stale when samples stop arriving and restarts the
+measurement thread and the serial transport when the thread is wedged
+(e.g. a hung read holding the instrument lock). Recovery time is measured.
+The supervisor runs in the GUI thread: GUI-thread device calls take the
+instrument lock with try_lock() so a wedged read cannot block it.
+"""
+
+# libraries
+import logging
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+log = logging.getLogger("laplace.gas")
+
+
+def try_lock(mutex, timeout_ms, action):
+    """
+    Takes 'mutex' waiting at most 'timeout_ms'. A blocking lock() behind a
+    read that never returns would freeze the event loop for good, and with
+    it the supervisor timer that restarts the thread. Logs and returns False
+    on timeout; the caller then skips 'action'.
+    """
+    if mutex.tryLock(int(timeout_ms)):
+        return True
+    log.error(f"Instrument busy for {timeout_ms} ms (measurement thread wedged?): {action} not sent.")
+    return False
+
+
+class AcquisitionSupervisor(QObject):
+    """
+    Runs in the GUI thread.
+
+    - 'beat(sample)' is an acquisition pipeline stage: it stamps every sample.
+    - The measurement thread stamps 'last_cycle' at each loop, also while the
+      device is offline, so "no samples" (offline: data stale) and "no loop"
+      (wedged: restart) are told apart.
+    - Restarts back off (doubling up to 'max_restart_interval_s') while the
+      thread does not recover.
+    """
+
+    stale_changed = pyqtSignal(bool)
+
+    def __init__(self, period_s, get_thread, restart, stale_periods=5, restart_after_s=5.0,
+                 max_restart_interval_s=60.0, instrumentation=None, parent=None):
+        super().__init__(parent)
+        self.period_s = float(period_s)
+        self.stale_after_s = max(1, int(stale_periods)) * self.period_s
+        self.restart_after_s = float(restart_after_s)
+        self.max_restart_interval_s = float(max_restart_interval_s)
+        self.get_thread = get_thread
+        self.restart = restart
+        self.recovery_histogram = instrumentation.histogram("acquisition recovery") if instrumentation else None
+
+        self.last_sample = time.monotonic()
+        self.stale = False
+        self.restarts = 0
+        self.last_recovery_s = None
+        self._wedged_since = None        # last_cycle of the wedged thread, until a sample arrives
+        self._restarted_at = None        # Last restart; later samples come from a new thread
+        self._restart_interval = self.restart_after_s
+        self._next_restart = 0.0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+
+    def start(self):
+        self.last_sample = time.monotonic()
+        self.timer.start(int(max(self.period_s, 0.1) * 1000))
+
+    def stop(self):
+        self.timer.stop()
+
+    def beat(self, sample):
+        """Acquisition stage (measurement thread)."""
+        self.last_sample = time.monotonic()
+
+    @property
+    def sample_age(self):
+        return time.monotonic() - self.last_sample
+
+    def check(self):
+        now = time.monotonic()
+
+        # --- Recovery after a restart ---
+        if self._restarted_at is not None and self.last_sample > self._restarted_at:
+            self.last_recovery_s = self.last_sample - self._wedged_since
+            if self.recovery_histogram is not None:
+                self.recovery_histogram.record(self.last_recovery_s)
+            log.info(f"Acquisition recovered {self.last_recovery_s:.1f} s after the last loop "
+                     f"({self.restarts} restarts so far).")
+            self._wedged_since = self._restarted_at = None
+            self._restart_interval = self.restart_after_s
+
+        # --- Staleness ---
+        stale = now - self.last_sample > self.stale_after_s
+        if stale != self.stale:
+            self.stale = stale
+            if stale:
+                log.warning(f"Pressure data stale: no sample for {now - self.last_sample:.1f} s.")
+            else:
+                log.info("Pressure data fresh again.")
+            self.stale_changed.emit(stale)
+
+        # --- Wedged thread ---
+        thread = self.get_thread()
+        last_cycle = getattr(thread, 'last_cycle', None)
+        if last_cycle is None or now - last_cycle <= self.restart_after_s or now < self._next_restart:
+            return
+        if self._wedged_since is None:
+            self._wedged_since = last_cycle
+        self.restarts += 1
+        log.error(f"Measurement thread wedged ({now - last_cycle:.1f} s without a loop), "
+                  f"restart #{self.restarts}.")
+        self._restarted_at = time.monotonic()
+        try:
+            self.restart()
+        except Exception as e:
+            log.error(f"Acquisition restart failed: {e}")
+        self._next_restart = time.monotonic() + self._restart_interval
+        self._restart_interval = min(self._restart_interval * 2.0, self.max_restart_interval_s)
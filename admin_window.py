@@ -1,4 +1,7 @@
-from PyQt6.QtWidgets import QMainWindow, QApplication, QMessageBox
+from PyQt6.QtWidgets import (QMainWindow, QApplication, QMessageBox, QPlainTextEdit, QPushButton,
+                             QVBoxLayout, QHBoxLayout, QWidget)
+from PyQt6.QtGui import QFont
+from PyQt6.QtCore import QTimer
 from PyQt6 import uic
 import time
 
@@ -30,6 +33,15 @@ class AdminWindow(QMainWindow):
         # Connect the button (which is now in this window's UI)
         if hasattr(self, 'set_pid_button'):
             self.set_pid_button.clicked.connect(self.set_pid_parameters)
+        if hasattr(self, 'timing_button'):
+            self.timing_button.clicked.connect(self.open_timing_window)
+            self.timing_button.setEnabled(getattr(self.main_window, 'instrumentation', None) is not None)
+        self.timing_w = None
+        if hasattr(self, 'profile_button'):
+            self.profile_button.clicked.connect(self.start_profiling)
+        if hasattr(self, 'capture_button'):
+            self.capture_button.clicked.connect(self.start_capture)
+            self.capture_button.setEnabled(getattr(self.main_window, 'capture', None) is not None)
 
         # Read the current PID values when the window opens
         self.read_pid_parameters()
@@ -45,7 +57,8 @@ class AdminWindow(QMainWindow):
         user_tag = "Unknown"
 
         # 2. Hardware Read (LOCKED)
-        self.main_window.instrument_mutex.lock()
+        if not self.main_window.lock_instrument("PID read"):
+            return
         try:
             p_gain = instrument.readParameter(167)
             i_gain = instrument.readParameter(168)
@@ -84,6 +97,31 @@ class AdminWindow(QMainWindow):
         except Exception as e:
             print(f"Error updating UI: {e}")
 
+    def open_timing_window(self):
+        if self.timing_w is None:
+            self.timing_w = TimingWindow(self.main_window, self)
+        self.timing_w.show()
+        self.timing_w.raise_()
+
+    def start_profiling(self):
+        session = self.main_window.start_profiling()
+        if session is not None:
+            self.statusbar.showMessage(f"Profiling for {session.duration_s:.0f} s...")
+            QTimer.singleShot(int(session.duration_s * 1000) + 2000,
+                              lambda: self.statusbar.showMessage("Profiling reports written to the log folder."))
+
+    def start_capture(self):
+        capture = self.main_window.capture
+        if self.main_window.capture_event("manual"):
+            self.statusbar.showMessage(f"Capturing, file in the log folder in {capture.post_s:.0f} s...")
+        else:
+            self.statusbar.showMessage("A capture is already running.")
+
+    def closeEvent(self, event):
+        if self.timing_w is not None:
+            self.timing_w.close()
+        event.accept()
+
     def set_pid_parameters(self):
         """Attempts a full sequence to unlock, write, and save new PID values."""
         instrument = self.main_window.instrument
@@ -102,7 +140,9 @@ class AdminWindow(QMainWindow):
 
             # --- Step 1: Set Control Mode to allow RS232 writes ---
             print("Setting device to initreset: enable changes mode...")
-            self.main_window.instrument_mutex.lock()  # <--- ADD LOCK
+            if not self.main_window.lock_instrument("PID write"):
+                QMessageBox.warning(self, "Instrument busy", "The device did not answer, nothing was written.")
+                return
             try:
                 instrument.writeParameter(7, 64)
                 #time.sleep(0.1)
@@ -123,6 +163,9 @@ class AdminWindow(QMainWindow):
                 #time.sleep(0.1)
             finally:
                 self.main_window.instrument_mutex.unlock()
+            self.main_window.journal_event("pid_write", source="admin", kp=p_gain, ti=i_gain, td=d_gain,
+                                           kspeed=speed_gain, kopen=open_gain, knormal=norm_gain,
+                                           kstable=stab_gain, hysteresis=hyster_gain, user_tag=user_tag)
             print(f"Set and saved new control values: Kp={p_gain}, Ti={i_gain}, Td={d_gain}, Kspeed={speed_gain},Kopen={open_gain}, Knormal={norm_gain},Kstable={stab_gain},Hysteresis={hyster_gain},UserTag={user_tag}")
 
             #QMessageBox.information(self, "Success", "Control parameters have been updated.")
@@ -155,6 +198,14 @@ class AdminWindow(QMainWindow):
             instrument = self.main_window.instrument
             main_ui = self.main_window.win
 
+            # Send the command to the instrument
+            if not self.main_window.lock_instrument("force open"):
+                return
+            try:
+                instrument.writeParameter(12, 8)  # 'Valve Forced Open' command
+            finally:
+                self.main_window.instrument_mutex.unlock()
+
             # Update status label and OTHER buttons on the MAIN window
             main_ui.label_valve_status.setText('Force Opened')
             main_ui.openButton.setStyleSheet("background-color: gray;")
@@ -163,15 +214,62 @@ class AdminWindow(QMainWindow):
             # Update the button on THIS admin window
             self.force_open_button.setStyleSheet("background-color: red;")
 
-            # Send the command to the instrument
-            self.main_window.instrument_mutex.lock()  # <--- ADD LOCK
-            try:
-                instrument.writeParameter(12, 8)  # 'Valve Forced Open' command
-            finally:
-                self.main_window.instrument_mutex.unlock()
-
             # Update the state variable in the MAIN window instance
             self.main_window.valve_status = "force_open"
+            self.main_window.journal_event("valve_mode", source="admin", mode="force_open")
         else:
             # If the user clicks "No"
-            print("Valve Force Open cancelled by user.")
\ No newline at end of file
+            print("Valve Force Open cancelled by user.")
+
+class TimingWindow(QMainWindow):
+    """Live view of the instrumentation histograms (refreshed every second)."""
+
+    def __init__(self, main_window, parent=None):
+        super(TimingWindow, self).__init__(parent)
+        self.setWindowTitle("Timing Statistics")
+        self.resize(760, 420)
+        self.main_window = main_window
+
+        self.text = QPlainTextEdit(self)
+        self.text.setReadOnly(True)
+        self.text.setFont(QFont("Consolas", 9))
+
+        self.reset_button = QPushButton("Reset", self)
+        self.reset_button.clicked.connect(self.reset_statistics)
+        self.dump_button = QPushButton("Dump to file", self)
+        self.dump_button.clicked.connect(self.dump_statistics)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(self.reset_button)
+        buttons.addWidget(self.dump_button)
+        layout = QVBoxLayout()
+        layout.addWidget(self.text)
+        layout.addLayout(buttons)
+        central = QWidget(self)
+        central.setLayout(layout)
+        self.setCentralWidget(central)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start(1000)
+        super().showEvent(event)
+
+    def refresh(self):
+        self.text.setPlainText(self.main_window.instrumentation.report())
+
+    def reset_statistics(self):
+        self.main_window.instrumentation.reset()
+        self.refresh()
+
+    def dump_statistics(self):
+        path = self.main_window.dump_timing_statistics()
+        if path is not None:
+            self.statusBar().showMessage(f"Written to {path}")
+
+    def closeEvent(self, event):
+        self.refresh_timer.stop()
+        event.accept()
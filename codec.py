@@ -0,0 +1,91 @@
+"""
+Payload encodings for the GAS server, stream and history replies.
+JSON stays the default; msgpack is used when installed and requested.
+"""
+
+# libraries
+import copy
+import json
+import logging
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency: JSON only
+    msgpack = None
+
+from laplace_server.protocol import CMD_GET, make_get_reply
+
+log = logging.getLogger("laplace.gas")
+
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+
+
+def available_encodings():
+    return [ENCODING_JSON] + ([ENCODING_MSGPACK] if msgpack is not None else [])
+
+
+def negotiate(requested):
+    """Returns the encoding to use for a request asking for 'requested'."""
+    if requested == ENCODING_MSGPACK and msgpack is not None:
+        return ENCODING_MSGPACK
+    return ENCODING_JSON
+
+
+def encode(obj, encoding=ENCODING_JSON) -> bytes:
+    if encoding == ENCODING_MSGPACK:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def decode(data: bytes, encoding=ENCODING_JSON):
+    if encoding == ENCODING_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("msgpack payload received but msgpack is not installed.")
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
+
+
+class ServerPayload:
+    """
+    Two payload dicts reused alternately for GasServer data.
+
+    The GUI thread fills the spare dict in place and swaps it in under the
+    server data lock, so no dict is rebuilt per tick, the server thread never
+    sees a half-written payload, and the JSON debug dump done by 'set_data()'
+    for every update is skipped.
+    """
+
+    def __init__(self, server, template: dict):
+        self.server = server
+        # Deep copies: nested lists/dicts are filled in place too
+        self._buffers = [copy.deepcopy(template), copy.deepcopy(template)]
+        self._active = 0
+
+    def spare(self) -> dict:
+        """Dict to fill for the next update (not read by the server thread)."""
+        return self._buffers[1 - self._active]
+
+    def commit(self):
+        """Makes the spare dict the server data."""
+        self._active = 1 - self._active
+        self.server.swap_data(self._buffers[self._active])
+
+
+def register_encoded_get(server):
+    """
+    Replaces the CMD_GET handler of a GasServer: the reply is encoded while
+    holding the data lock (payload dicts are reused, see ServerPayload) and
+    in msgpack when the request payload asks for {"encoding": "msgpack"}.
+    """
+
+    def handle_get(server, message: dict, target: str) -> None:
+        encoding = negotiate((message.get("payload") or {}).get("encoding"))
+        server.emit("on_get")
+        body = server.encode_data(
+            lambda data: encode(make_get_reply(sender=server.name, target=target, data=data), encoding))
+        server.socket.send(body)
+        if server.empty_data_after_get:
+            server.empty_data()
+
+    server.register_command(CMD_GET, handle_get)
@@ -0,0 +1,129 @@
+"""
+Online control-quality metrics.
+Rolling IAE/ISE, time-in-band and setpoint-tracking lag, updated per sample.
+"""
+
+# libraries
+from collections import deque
+
+
+class ControlQualityMetrics:
+    """
+    Keeps rolling control-quality figures over a time window.
+
+    Every sample adds one entry holding its contribution (|e|*dt, e^2*dt,
+    in-band time) and the running sums are corrected when entries leave the
+    window, so each update costs O(1) amortized whatever the window length.
+    """
+
+    # Resynchronize the running sums from the entries every N evictions
+    # to stop floating point drift from accumulating over weeks of uptime.
+    RESYNC_EVERY = 10000
+
+    def __init__(self, window_s=60.0, band_tolerance=0.1, max_dt=1.0):
+        self.window_s = float(window_s)
+        self.band_tolerance = float(band_tolerance)
+        # Gaps longer than this (offline, valve shut) are not integrated
+        self.max_dt = float(max_dt)
+
+        self._entries = deque()  # (timestamp, abs_err_dt, sq_err_dt, in_band_dt, dt)
+        self.reset()
+
+    def reset(self):
+        """Clears the window and the tracking state."""
+        self._entries.clear()
+        self._sum_iae = 0.0
+        self._sum_ise = 0.0
+        self._sum_in_band = 0.0
+        self._sum_time = 0.0
+        self._evictions = 0
+
+        self._last_timestamp = None
+        self._last_setpoint = None
+        self._setpoint_change_time = None
+        self.tracking_lag_s = None  # Lag of the last completed setpoint step
+
+    def pause(self):
+        """Breaks the integration, e.g. while the valve is shut."""
+        self._last_timestamp = None
+
+    def update(self, timestamp, measured, setpoint):
+        """Adds one sample (seconds since epoch, bar, bar)."""
+        error = measured - setpoint
+        in_band = abs(error) <= self.band_tolerance
+
+        # --- Setpoint tracking lag ---
+        if self._last_setpoint is None or setpoint != self._last_setpoint:
+            self._last_setpoint = setpoint
+            self._setpoint_change_time = timestamp if not in_band else None
+        elif self._setpoint_change_time is not None and in_band:
+            self.tracking_lag_s = timestamp - self._setpoint_change_time
+            self._setpoint_change_time = None
+
+        # --- Integration (rectangle rule on the current error) ---
+        if self._last_timestamp is not None:
+            dt = timestamp - self._last_timestamp
+            if 0.0 < dt <= self.max_dt:
+                abs_dt = abs(error) * dt
+                sq_dt = error * error * dt
+                band_dt = dt if in_band else 0.0
+                self._entries.append((timestamp, abs_dt, sq_dt, band_dt, dt))
+                self._sum_iae += abs_dt
+                self._sum_ise += sq_dt
+                self._sum_in_band += band_dt
+                self._sum_time += dt
+        self._last_timestamp = timestamp
+
+        self._evict(timestamp - self.window_s)
+
+    def _evict(self, oldest_allowed):
+        entries = self._entries
+        while entries and entries[0][0] < oldest_allowed:
+            _, abs_dt, sq_dt, band_dt, dt = entries.popleft()
+            self._sum_iae -= abs_dt
+            self._sum_ise -= sq_dt
+            self._sum_in_band -= band_dt
+            self._sum_time -= dt
+            self._evictions += 1
+
+        if self._evictions >= self.RESYNC_EVERY:
+            self._evictions = 0
+            self._sum_iae = sum(e[1] for e in entries)
+            self._sum_ise = sum(e[2] for e in entries)
+            self._sum_in_band = sum(e[3] for e in entries)
+            self._sum_time = sum(e[4] for e in entries)
+
+    @property
+    def iae(self):
+        """Integral of absolute error over the window (bar*s)."""
+        return max(0.0, self._sum_iae)
+
+    @property
+    def ise(self):
+        """Integral of squared error over the window (bar^2*s)."""
+        return max(0.0, self._sum_ise)
+
+    @property
+    def in_band_percent(self):
+        """Share of the integrated window time spent within tolerance."""
+        if self._sum_time <= 0.0:
+            return 0.0
+        return min(100.0, max(0.0, 100.0 * self._sum_in_band / self._sum_time))
+
+    def pending_lag(self, now):
+        """Elapsed time since a setpoint step that is not reached yet, else None."""
+        if self._setpoint_change_time is None:
+            return None
+        return now - self._setpoint_change_time
+
+    def snapshot(self, now=None, out=None):
+        """Returns the current figures as a plain dict (JSON friendly), filling 'out' if given."""
+        pending = self.pending_lag(now if now is not None else self._last_timestamp or 0.0)
+        out = {} if out is None else out
+        out["window_s"] = self.window_s
+        out["iae"] = round(self.iae, 6)
+        out["ise"] = round(self.ise, 6)
+        out["in_band_percent"] = round(self.in_band_percent, 2)
+        out["tracking_lag_s"] = None if self.tracking_lag_s is None else round(self.tracking_lag_s, 3)
+        out["tracking_pending_s"] = None if pending is None else round(pending, 3)
+        return out
@@ -0,0 +1,196 @@
+"""
+Event journal.
+Safety-relevant events (alarms, purges, mode and setpoint changes, PID
+writes, connection changes) are appended to an SQLite database by a
+background thread, indexed by time and type.
+
+Command line:
+    python event_journal.py [PATH] --type purge_end --since 7d
+    python event_journal.py [PATH] --summary --since 24h
+"""
+
+# libraries
+import argparse
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger("laplace.gas")
+
+DEFAULT_NAME = "events.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    type TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    value REAL,
+    duration_s REAL,
+    pressure REAL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_type_ts ON events (type, ts);
+"""
+
+FIELDS = ("id", "ts", "type", "source", "value", "duration_s", "pressure", "data")
+
+
+class EventJournal:
+    """
+    'record()' only puts a tuple on a queue: it never waits for the disk and
+    can be called from any thread. The writer thread inserts in batches, one
+    transaction per batch. Rows are never updated or deleted.
+    """
+
+    def __init__(self, path, batch_size=200):
+        self.path = str(path)
+        self.batch_size = int(batch_size)
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=10000)
+        self._thread = threading.Thread(target=self._run, name="event-journal", daemon=True)
+
+    def start(self):
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")  # Queries do not block the writer
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+        self._thread.start()
+        log.info(f"Event journal: {self.path}")
+
+    def record(self, event_type, source="", value=None, duration_s=None, pressure=None, **data):
+        try:
+            self._queue.put_nowait((time.time(), event_type, source, value, duration_s, pressure,
+                                    json.dumps(data, default=str) if data else None))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=2.0):
+        """Writes what is queued and stops the writer."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _run(self):
+        connection = sqlite3.connect(self.path)
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [row for row in batch if row is not None]
+            if not batch:
+                continue
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO events (ts, type, source, value, duration_s, pressure, data) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                self.written += len(batch)
+            except sqlite3.Error as e:
+                self.dropped += len(batch)
+                log.error(f"Event journal: {len(batch)} events not written: {e}")
+        connection.close()
+
+
+def query(path, types=None, since=None, until=None, source=None, limit=None):
+    """
+    Events as dicts (oldest first), 'data' decoded. 'types' is a name or a
+    list of names, 'since'/'until' are epoch seconds.
+    """
+    clauses, args = [], []
+    if types:
+        types = [types] if isinstance(types, str) else list(types)
+        clauses.append(f"type IN ({', '.join('?' * len(types))})")
+        args += types
+    if since is not None:
+        clauses.append("ts >= ?")
+        args.append(since)
+    if until is not None:
+        clauses.append("ts < ?")
+        args.append(until)
+    if source:
+        clauses.append("source = ?")
+        args.append(source)
+    sql = f"SELECT {', '.join(FIELDS)} FROM events"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY ts"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = connection.execute(sql, args).fetchall()
+    finally:
+        connection.close()
+    events = []
+    for row in rows:
+        event = dict(zip(FIELDS, row))
+        event["data"] = json.loads(event["data"]) if event["data"] else {}
+        events.append(event)
+    return events
+
+
+def summary(path, since=None, until=None):
+    """Number of events per type."""
+    sql = "SELECT type, COUNT(*) FROM events WHERE ts >= ? AND ts < ? GROUP BY type ORDER BY type"
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return dict(connection.execute(sql, (since or 0.0, until or float("inf"))).fetchall())
+    finally:
+        connection.close()
+
+
+def parse_age(text):
+    """'90s', '30m', '24h', '7d' or a number of seconds -> seconds."""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+    text = text.strip().lower()
+    if text[-1:] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def _format(event):
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(event["ts"]))
+    columns = [stamp, f"{event['type']:<16}", f"{event['source']:<8}"]
+    for name, unit in (("value", ""), ("duration_s", " s"), ("pressure", " bar")):
+        if event[name] is not None:
+            columns.append(f"{name}={event[name]:.3f}{unit}")
+    if event["data"]:
+        columns.append(json.dumps(event["data"]))
+    return "  ".join(columns)
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description="Query the event journal")
+    cli.add_argument("path", nargs="?", default=f"logs/{DEFAULT_NAME}")
+    cli.add_argument("--type", action="append", dest="types", help="event type (repeatable)")
+    cli.add_argument("--since", help="age of the oldest event, e.g. 30m, 24h, 7d")
+    cli.add_argument("--source", help="event source, e.g. ui, remote, device")
+    cli.add_argument("--limit", type=int)
+    cli.add_argument("--summary", action="store_true", help="count events per type")
+    args = cli.parse_args(argv)
+
+    since = time.time() - parse_age(args.since) if args.since else None
+    if args.summary:
+        for event_type, count in summary(args.path, since=since).items():
+            print(f"{event_type:<16} {count}")
+        return
+    for event in query(args.path, types=args.types, since=since, source=args.source, limit=args.limit):
+        print(_format(event))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Fleet dashboard for many GAS nodes.
+
+One compact table (pressure, setpoint, status, stability, sparkline) for all
+the gas lines of a beamline. Data is collected off the GUI thread by a single
+asyncio loop: PUB streams when available (full rate) and pooled GET polling
+for status; the table only repaints the rows that changed, a few times per
+second, so 50+ nodes at several Hz stay responsive.
+
+Usage:
+    python fleet_dashboard.py --node "GAS He=tcp://host1:1122" --stream "GAS He=tcp://host1:1123"
+    python fleet_dashboard.py --simulate 50
+"""
+
+# libraries
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+os.environ['QT_API'] = 'pyqt6'
+import qdarkstyle
+import zmq
+import zmq.asyncio
+from PyQt6 import QtCore
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor, QPen, QPolygonF
+from PyQt6.QtWidgets import (QApplication, QHeaderView, QMainWindow, QStyledItemDelegate,
+                             QTableView)
+
+from codec import decode
+from gas_client import GasFleet
+
+SPARKLINE_POINTS = 120
+
+
+class NodeState:
+    """Latest known values of one gas line (written by the collector thread)."""
+    __slots__ = ("name", "address", "stream", "pressure", "setpoint", "status",
+                 "stabilized", "last_update", "history", "error", "gaps")
+    # 'last_update' is the local receive time: node clocks may be skewed
+
+    def __init__(self, name, address, stream=None):
+        self.name = name
+        self.address = address
+        self.stream = stream
+        self.pressure = None
+        self.setpoint = None
+        self.status = None
+        self.stabilized = False
+        self.last_update = 0.0
+        self.history = deque(maxlen=SPARKLINE_POINTS)
+        self.error = None
+        self.gaps = 0  # Stream frames lost
+
+
+class FleetCollector(threading.Thread):
+    """Runs the asyncio loop that feeds the NodeState objects."""
+
+    def __init__(self, nodes, poll_hz=2.0, timeout=1.0):
+        super().__init__(daemon=True)
+        self.nodes = nodes
+        self.poll_interval = 1.0 / poll_hz if poll_hz > 0 else 1.0
+        self.timeout = timeout
+        self.dirty = set()
+        self._dirty_lock = threading.Lock()
+        self._loop = None
+        self._stop_future = None
+
+    def take_dirty(self):
+        """Names of the nodes changed since the last call."""
+        with self._dirty_lock:
+            dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def _mark(self, name):
+        with self._dirty_lock:
+            self.dirty.add(name)
+
+    def run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._stop_future = self._loop.create_future()
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self):
+        fleet = GasFleet({n.name: n.address for n in self.nodes.values()},
+                         sender="fleet_dashboard", timeout=self.timeout, retries=0)
+        tasks = [asyncio.ensure_future(self._poll(fleet))]
+        tasks += [asyncio.ensure_future(self._follow(node))
+                  for node in self.nodes.values() if node.stream]
+        await self._stop_future
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        fleet.close()
+
+    async def _poll(self, fleet):
+        while True:
+            started = time.time()
+            results = await fleet.read_all()
+            now = time.time()
+            for name, data in results.items():
+                node = self.nodes[name]
+                if isinstance(data, Exception):
+                    node.error = str(data) or type(data).__name__
+                else:
+                    node.error = None
+                    node.status = data.get("status")
+                    node.stabilized = bool(data.get("stabilized"))
+                    if data.get("setpoint") is not None:
+                        node.setpoint = data["setpoint"]
+                    # Streamed nodes get their pressure (and history) from the stream
+                    if not node.stream and data.get("positions"):
+                        node.pressure = data["positions"][0]
+                        node.history.append(node.pressure)
+                        node.last_update = now
+                self._mark(name)
+            await asyncio.sleep(max(0.0, self.poll_interval - (time.time() - started)))
+
+    async def _follow(self, node):
+        socket = zmq.asyncio.Context.instance().socket(zmq.SUB)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(node.stream)
+        socket.setsockopt(zmq.SUBSCRIBE, b"")
+        expected_seq = None
+        try:
+            while True:
+                _, encoding, body = await socket.recv_multipart()
+                frame = decode(body, encoding.decode("ascii"))
+                if expected_seq is not None and frame["seq"] != expected_seq:
+                    node.gaps += frame["seq"] - expected_seq
+                expected_seq = frame["seq"] + 1
+                for _, pressure, setpoint in frame["samples"]:
+                    node.history.append(pressure)
+                node.pressure = pressure
+                node.setpoint = setpoint
+                node.last_update = time.time()
+                self._mark(node.name)
+        finally:
+            socket.close()
+
+    def stop(self):
+        if self._loop is not None and self._stop_future is not None:
+            self._loop.call_soon_threadsafe(
+                lambda: self._stop_future.done() or self._stop_future.set_result(None))
+        self.join(timeout=2)
+
+
+class FleetModel(QtCore.QAbstractTableModel):
+    COLUMNS = ["Line", "Pressure (bar)", "Setpoint (bar)", "Status", "Stable", "Trend", "Age (s)"]
+    TREND_COLUMN = 5
+
+    def __init__(self, nodes, stale_s=3.0, deviation_alarm=1.0, parent=None):
+        super().__init__(parent)
+        self.nodes = list(nodes.values())
+        self.rows = {node.name: i for i, node in enumerate(self.nodes)}
+        self.stale_s = stale_s
+        self.deviation_alarm = deviation_alarm
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return len(self.nodes)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def alarm(self, node, now=None):
+        """Returns an alarm text for the node, or None."""
+        now = now or time.time()
+        if node.error:
+            return "No reply"
+        if node.last_update and now - node.last_update > self.stale_s:
+            return "Stale"
+        if node.status and str(node.status).lower() not in ("normal",):
+            return str(node.status)
+        if (node.pressure is not None and node.setpoint is not None
+                and node.pressure - node.setpoint > self.deviation_alarm):
+            return "Over setpoint"
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        node = self.nodes[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return node.name
+            if column == 1:
+                return "—" if node.pressure is None else f"{node.pressure:.3f}"
+            if column == 2:
+                return "—" if node.setpoint is None else f"{node.setpoint:.2f}"
+            if column == 3:
+                return self.alarm(node) or (node.status or "—")
+            if column == 4:
+                return "yes" if node.stabilized else ""
+            if column == 6:
+                return "—" if not node.last_update else f"{time.time() - node.last_update:.1f}"
+        elif role == Qt.ItemDataRole.UserRole and column == self.TREND_COLUMN:
+            return list(node.history)
+        elif role == Qt.ItemDataRole.BackgroundRole and self.alarm(node):
+            return QColor("#5c1a1a")
+        return None
+
+    def refresh(self, names):
+        """Repaints only the given rows."""
+        last_column = len(self.COLUMNS) - 1
+        for name in names:
+            row = self.rows.get(name)
+            if row is not None:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+
+class SparklineDelegate(QStyledItemDelegate):
+    """Draws the recent pressure history as a polyline inside the cell."""
+
+    def __init__(self, color="#00E676", parent=None):
+        super().__init__(parent)
+        self.pen = QPen(QColor(color))
+        self.pen.setWidthF(1.2)
+
+    def paint(self, painter, option, index):
+        values = index.data(Qt.ItemDataRole.UserRole)
+        if not values or len(values) < 2:
+            return
+        rect = option.rect.adjusted(2, 3, -2, -3)
+        low, high = min(values), max(values)
+        span = (high - low) or 1.0
+        step = rect.width() / (SPARKLINE_POINTS - 1)
+        x0 = rect.right() - step * (len(values) - 1)
+        points = QPolygonF([
+            QtCore.QPointF(x0 + i * step, rect.bottom() - (v - low) / span * rect.height())
+            for i, v in enumerate(values)
+        ])
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setPen(self.pen)
+        painter.drawPolyline(points)
+        painter.restore()
+
+
+class FleetDashboard(QMainWindow):
+    def __init__(self, nodes, poll_hz=2.0, refresh_hz=5.0, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"LOA Gas Fleet ({len(nodes)} lines)")
+        self.resize(900, 40 + 26 * min(len(nodes), 30))
+
+        self.model = FleetModel(nodes, parent=self)
+        self.table = QTableView(self)
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(FleetModel.TREND_COLUMN, SparklineDelegate(parent=self.table))
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        self.table.horizontalHeader().setSectionResizeMode(FleetModel.TREND_COLUMN, QHeaderView.ResizeMode.Stretch)
+        self.setCentralWidget(self.table)
+
+        self.collector = FleetCollector(nodes, poll_hz=poll_hz)
+        self.collector.start()
+
+        # Batched repaint of the changed rows only
+        self._ticks = 0
+        self._full_refresh_every = max(1, int(refresh_hz))
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self._refresh)
+        self.refresh_timer.start(int(1000 / refresh_hz))
+
+    def _refresh(self):
+        dirty = self.collector.take_dirty()
+        # Age and staleness change without new data: repaint everything once a second
+        self._ticks += 1
+        if self._ticks % self._full_refresh_every == 0:
+            dirty = self.model.rows.keys()
+        self.model.refresh(dirty)
+
+    def closeEvent(self, event):
+        self.refresh_timer.stop()
+        self.collector.stop()
+        event.accept()
+
+
+def parse_pairs(pairs):
+    """['NAME=tcp://...', ...] -> {NAME: address}."""
+    result = {}
+    for pair in pairs or []:
+        name, _, address = pair.partition("=")
+        result[name.strip()] = address.strip()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monitor many GAS nodes.")
+    parser.add_argument("--node", action="append", help="NAME=tcp://host:port (GAS server)")
+    parser.add_argument("--stream", action="append", help="NAME=tcp://host:port (sample stream, optional)")
+    parser.add_argument("--simulate", type=int, default=0, help="start N local simulated nodes")
+    parser.add_argument("--base-port", type=int, default=6100)
+    parser.add_argument("--poll-hz", type=float, default=2.0)
+    parser.add_argument("--refresh-hz", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    servers = parse_pairs(args.node)
+    streams = parse_pairs(args.stream)
+    simulated = []
+    if args.simulate:
+        from simulated_server import SimulatedGasServer
+        for i in range(args.simulate):
+            name = f"GAS SIM{i:02d}"
+            node = SimulatedGasServer(name, args.base_port + i, stream_port=args.base_port + 1000 + i,
+                                      period_s=0.2, wander_s=15.0)
+            node.start()
+            simulated.append(node)
+            servers[name] = f"tcp://localhost:{args.base_port + i}"
+            streams[name] = f"tcp://localhost:{args.base_port + 1000 + i}"
+
+    if not servers:
+        parser.error("give at least one --node or --simulate N")
+
+    nodes = {name: NodeState(name, address, streams.get(name)) for name, address in servers.items()}
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setStyleSheet(qdarkstyle.load_stylesheet())
+    window = FleetDashboard(nodes, poll_hz=args.poll_hz, refresh_hz=args.refresh_hz)
+    window.show()
+    code = app.exec()
+    for node in simulated:
+        node.shutdown()
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,6 +22,8 @@ import pyqtgraph as pg
 from PyQt6.QtGui import QIcon
 import sys
 import time
+import threading
+import argparse
 import qdarkstyle
 from PyQt6.QtCore import Qt
 
@@ -30,14 +32,19 @@ import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 import configparser
 
-from laplace_server.server_lhc import ServerLHC
 from laplace_server.protocol import DEVICE_GAS
 from laplace_server.server_controller import ServerController
 
 from laplace_log import LoggerLHC, log
+from laplace_log.utils import get_logger_instance
+from log_queue import LogQueue
+from tick_labels import TickLabelCache
+from ui_state import UiState
 from laplace_server.protocol import LOGGER_NAME
 
 LoggerLHC("laplace.gas", file_level="debug", console_level="info")
+# File and console writes in a listener thread: logging calls never wait for I/O
+LOG_QUEUE = LogQueue().start()
 log.info("Starting flowControl...")
 
 # set log level for libraries
@@ -46,7 +53,28 @@ logging.getLogger("PyQt6.uic.properties").setLevel(logging.INFO)
 logging.getLogger("PyQt6.uic.uiparser").setLevel(logging.INFO)
 
 
-from qt_logging_bridge import QtLogHandler
+from qt_logging_bridge import LogView, QtLogHandler
+from control_metrics import ControlQualityMetrics
+from stability_detector import StabilityDetector
+from stream_publisher import SamplePublisher
+from sample_buffer import SampleRingBuffer
+from gas_server import GasServer
+from history_service import register_history_command
+from setpoint_coalescer import RemoteSetpointCoalescer, register_set_ack
+from codec import ServerPayload, register_encoded_get
+from sample_record import Sample
+from pipeline import ACQUISITION, CONSUMER, SamplePipeline
+from oversampling import BlockStats, fill_block
+from running_median import HampelFilter
+from instrumentation import Instrumentation, InstrumentedInstrument, TimedMutex
+from prometheus_exporter import MetricsExporter
+from profiling import MODE_SAMPLING, ProfilingSession
+from gui_watchdog import GuiWatchdog
+from acquisition_supervisor import AcquisitionSupervisor, try_lock
+from safety_monitor import SafetyMonitor
+from purge_sequence import TARGET, PurgeSequence
+from trigger_capture import TriggerCapture
+from event_journal import DEFAULT_NAME as JOURNAL_NAME, EventJournal
 
 
 def load_configuration():
@@ -63,17 +91,87 @@ def load_configuration():
             'set_point_above_tolerance': '1',
             'set_point_above_delay': '2',
             'set_point_above_safety_enable': '1',
-            'purge_shut_delay_timeout': '7'
+            'software_monitor': '1',
+            'purge_shut_delay_timeout': '7',
+            'purge_tolerance': '1.5',
+            'purge_hold_s': '0'
             # ----------------------
         },
-        'Thread': {'thread_sleep_time': '0.2'},
+        'Thread': {'thread_sleep_time': '0.2', 'oversample': '0', 'oversample_min_interval': '0.0'},
         'Plotting': {
             'max_history': '24000',
             'default_duration': '10',
 
         },
         'Security': {'admin_password': 'appli'},
-        'UI': {'window_title': 'LOA Pressure Control'}
+        'UI': {'window_title': 'LOA Pressure Control', 'log_level': 'info', 'log_lines': '2000',
+               'log_refresh_ms': '250'},
+        'Metrics': {
+            'window_s': '60',
+            'band_tolerance': '0.1'
+        },
+        'Stability': {
+            'window_s': '3',
+            'relative_tolerance': '0.01',
+            'absolute_tolerance': '0.05',
+            'max_slope': '0.02'
+        },
+        'Stream': {
+            'enable': '0',
+            'port': '1123',
+            'max_batch': '50',
+            'encoding': 'json'
+        },
+        'Remote': {
+            'coalesce_window_ms': '100',
+            'max_write_rate_hz': '5'
+        },
+        'Filter': {
+            'enable': '0',
+            'window': '15',
+            'n_sigmas': '3.0',
+            'min_deviation': '0.05',
+            'apply_to_display': '0'
+        },
+        'Instrumentation': {
+            'enable': '1',
+            'dump_on_exit': '0'
+        },
+        'Prometheus': {
+            'enable': '0',
+            'host': '127.0.0.1',
+            'port': '9123'
+        },
+        'Profiling': {
+            'mode': 'cprofile',
+            'duration_s': '30',
+            'tracemalloc_interval_s': '10',
+            'top': '40'
+        },
+        'Watchdog': {
+            'enable': '1',
+            'heartbeat_ms': '50',
+            'stall_threshold_ms': '500'
+        },
+        'Supervisor': {
+            'enable': '1',
+            'stale_periods': '5',
+            'restart_after_s': '5',
+            'max_restart_interval_s': '60',
+            'gui_lock_timeout_ms': '1000'
+        },
+        'Capture': {
+            'enable': '1',
+            'pre_s': '10',
+            'post_s': '10',
+            'fast_period_s': '0.05',
+            'on_alarm': '1',
+            'on_purge': '1'
+        },
+        'Journal': {
+            'enable': '1',
+            'path': ''
+        }
     }
 
     # Load the file
@@ -175,33 +273,17 @@ class TimeAxisItem(pg.AxisItem):
     """
     Custom AxisItem that displays system timestamps (seconds since epoch)
     converted explicitly from UTC to local time zone.
+    Labels are cached (see TickLabelCache); milliseconds appear when zoomed
+    below one second per tick.
     """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.enableAutoSIPrefix(False)
+        self.label_cache = TickLabelCache()
 
     def tickStrings(self, values, scale, spacing):
-        strings = []
-        for value in values:
-            try:
-                # 1. Create a datetime object using the raw timestamp, assuming it is UTC.
-                #    We use utcfromtimestamp to avoid locale ambiguities, though fromtimestamp
-                #    should work if you are on a very old Python version.
-                #    A simpler way for modern python is: dt.datetime.fromtimestamp(value, dt.timezone.utc)
-
-                # --- The most robust conversion to local time ---
-                utc_dt = dt.datetime.fromtimestamp(value, dt.timezone.utc)
-
-                # 2. Convert the UTC time to the local time zone of the machine.
-                local_dt = utc_dt.astimezone(None)  # None uses the system's local time zone
-
-                # 3. Format the LOCALIZED datetime object to display time as HH:MM:SS
-                strings.append(local_dt.strftime('%H:%M:%S'))
-
-            except Exception:
-                strings.append('')
-        return strings
+        return self.label_cache.labels(values, spacing)
 
 class PlotWindow(QMainWindow):
     # ... (other code)
@@ -356,10 +438,14 @@ class Bronkhost(QMainWindow):
             return  # Stop initialization
 
         self.config = config  # Store config for later use
+        self.com = com
 
         super(Bronkhost, self).__init__(parent)
         self.is_offline = False
         self.connection_successful = False
+        self._last_status = None  # Last device status seen by update_device_status
+        self.ui = UiState()  # Per-sample widget updates only reach Qt when the value changes
+        self._notice_until = 0.0  # time.monotonic() until which show_notice() keeps the status bar
         p = pathlib.Path(__file__)
         sepa = os.sep
         self.win = uic.loadUi('flow.ui', self)
@@ -395,28 +481,61 @@ class Bronkhost(QMainWindow):
         self.lower_setpoint_cooldown = 2.0  # Default value, updated later from config
         #self.was_last_change_decrease = False
         self.is_purging = False
-        self.instrument_mutex = QMutex()
+        self.profiling_session = None  # Running ProfilingSession, see start_profiling()
+
+        # Latency histograms (device calls, mutex, loop timing), see [Instrumentation]
+        self.instrumentation = None
+        if not self.config.has_section('Instrumentation') or self.config['Instrumentation'].getboolean('enable', True):
+            self.instrumentation = Instrumentation()
+        self.instrument_mutex = TimedMutex(self.instrumentation) if self.instrumentation else QMutex()
+        # Longest wait of a GUI-thread device call for the lock (see lock_instrument)
+        self.gui_lock_timeout_ms = self.config.getint('Supervisor', 'gui_lock_timeout_ms', fallback=1000)
+
+        # Append-only journal of safety-relevant events (see [Journal])
+        self.journal = None
+        if self.config.has_section('Journal') and self.config['Journal'].getboolean('enable', True):
+            journal_path = self.config['Journal'].get('path', '').strip()
+            try:
+                self.journal = EventJournal(journal_path or self.report_folder().parent / JOURNAL_NAME)
+                self.journal.start()
+                self.journal.record("app_start", "ui", port=com)
+            except Exception as e:
+                log.error(f"Event journal disabled: {e}")
+                self.journal = None
 
         self.purge_target = 0.0  # Default target
         self.purge_timeout_limit = 10.0  # Default timeout
 
         self.current_pressure_bar = 0.0  # Stores the latest reading
-        self.purge_target = 0.0  # Stores target for check
-        self.purge_check_timer = QTimer(self)
-        self.purge_check_timer.timeout.connect(self._check_purge_condition)
-        self.purge_start_time = 0.0
+        self.data_stale = False  # No recent sample, see AcquisitionSupervisor
+        self._last_server_sample = None
+        # Purge end (target or timeout) decided on every sample, see purge_system()
+        self.purge_sequence = PurgeSequence(
+            close_valve=self._close_valve_for_purge,
+            tolerance_bar=self.config['Safety'].getfloat('purge_tolerance', 1.5),
+            hold_s=self.config['Safety'].getfloat('purge_hold_s', 0.0),
+            parent=self
+        )
+        self.purge_sequence.finished.connect(self._finalize_purge)
 
         # --- REDIRECT PRINT STATEMENTS ---
         # self.log_stream = Stream()
         # self.log_stream.new_text.connect(self.update_log)
         # sys.stdout = self.log_stream
-        qt_handler = QtLogHandler()
-        logging.getLogger().addHandler(qt_handler)
-        qt_handler.new_log.connect(self.update_log)
+        # Log panel fed in batches from the log listener thread (see [UI])
+        ui_cfg = self.config['UI'] if self.config.has_section('UI') else {}
+        log_lines = int(ui_cfg.get('log_lines', 2000))
+        self.log_handler = QtLogHandler(max_lines=log_lines)
+        self.log_handler.setLevel(str(ui_cfg.get('log_level', 'info')).upper())
+        LOG_QUEUE.add_handler(self.log_handler)
+        self.log_view = LogView(self.log_handler, self.win.log_display,
+                                interval_ms=int(ui_cfg.get('log_refresh_ms', 250)), max_lines=log_lines, parent=self)
         log.info(f"  LOA Pressure Control v{__version__}  ")
 
         try:
             self.instrument = propar.instrument(com)
+            if self.instrumentation is not None:
+                self.instrument = InstrumentedInstrument(self.instrument, self.instrumentation)
             device_serial = self.instrument.readParameter(1)  # Try to read the serial number
             if device_serial is None:
                 raise ConnectionError("Device is not responding on this port.")
@@ -453,6 +572,7 @@ class Bronkhost(QMainWindow):
         self.valve_close()
 
         self.alarm_popup_active = False
+        self._alarm_queued = False  # A critical sample's alarm handling is waiting in the event queue
         self.last_reset_time = 0.0
 
         # --- Read device capacity and units ---
@@ -522,11 +642,92 @@ class Bronkhost(QMainWindow):
                 f"and thread time ({thread_time}s)."
             )
 
-        self.threadFlow = THREADFlow(self, capacity=self.capacity, thread_sleep_time=thread_time)
+        # --- Control quality metrics (IAE/ISE, time-in-band, tracking lag) ---
+        metrics_cfg = self.config['Metrics'] if self.config.has_section('Metrics') else {}
+        self.control_metrics = ControlQualityMetrics(
+            window_s=float(metrics_cfg.get('window_s', 60.0)),
+            band_tolerance=float(metrics_cfg.get('band_tolerance', 0.1)),
+            # Anything longer than a few missed cycles is a gap, not control time
+            max_dt=5 * thread_time
+        )
+
+        # --- Stability detector (drives the server "stabilized" flag) ---
+        stab_cfg = self.config['Stability'] if self.config.has_section('Stability') else {}
+        self.stability_detector = StabilityDetector(
+            window_s=float(stab_cfg.get('window_s', 3.0)),
+            relative_tolerance=float(stab_cfg.get('relative_tolerance', 0.01)),
+            absolute_tolerance=float(stab_cfg.get('absolute_tolerance', 0.05)),
+            max_slope=float(stab_cfg.get('max_slope', 0.02))
+        )
+
+        # Stages run on every sample, in the acquisition thread or in the GUI thread
+        self.pipeline = SamplePipeline()
+
+        # Ring buffer of raw samples, served to remote masters by the HISTORY command
+        self.sample_buffer = SampleRingBuffer(capacity=hist)
+
+        # Kept for restart_acquisition()
+        self._thread_kwargs = dict(
+            capacity=self.capacity, thread_sleep_time=thread_time,
+            oversample=self.config['Thread'].getboolean('oversample', False),
+            min_read_interval=self.config['Thread'].getfloat('oversample_min_interval', 0.0)
+        )
+        self._abandoned_threads = []  # Wedged threads left behind by restart_acquisition()
+        self.threadFlow = THREADFlow(self, **self._thread_kwargs)
+        self.pipeline.add("record", lambda s: self.sample_buffer.append(s.timestamp, s.pressure, s.setpoint),
+                          ACQUISITION)
+
+        # Optional outlier filter, between conversion and recording (records stay raw)
+        self.outlier_filter = None
+        self.filter_display = False
+        self._filter_setpoint = None  # Setpoint of the samples in the filter window
+        self._filter_reset = False  # Set by the GUI thread, done by the filter stage
+        if self.config.has_section('Filter') and self.config['Filter'].getboolean('enable', False):
+            filter_cfg = self.config['Filter']
+            self.outlier_filter = HampelFilter(
+                window=filter_cfg.getint('window', 15),
+                n_sigmas=filter_cfg.getfloat('n_sigmas', 3.0),
+                min_deviation=filter_cfg.getfloat('min_deviation', 0.05)
+            )
+            self.filter_display = filter_cfg.getboolean('apply_to_display', False)
+            self.pipeline.add("filter", self.filter_sample, ACQUISITION, before="record")
+
+        # Software deviation check in the measurement thread, ahead of the device alarm path
+        self.safety_monitor = None
+        if self.config['Safety'].getboolean('software_monitor', True):
+            self.safety_monitor = SafetyMonitor(
+                self.instrument, self.instrument_mutex,
+                tolerance_bar=self.config['Safety'].getfloat('set_point_above_tolerance', 2.0),
+                delay_s=self.config['Safety'].getfloat('set_point_above_delay', 2.0),
+                safe_setpoint_raw=self.bar_to_propar(self.get_safe_setpoint_bar(), self.capacity),
+                instrumentation=self.instrumentation,
+                parent=self
+            )
+            self.safety_monitor.tripped.connect(self.on_safety_trip)
+            self.pipeline.add("safety", self.safety_monitor.check, ACQUISITION, before="record")
+        self.pipeline.add("purge", self.purge_sequence.check, ACQUISITION, before="record")
+
+        # Pre-/post-trigger capture around alarms and purges (see [Capture])
+        self.capture = None
+        if self.config.has_section('Capture') and self.config['Capture'].getboolean('enable', True):
+            capture_cfg = self.config['Capture']
+            self.capture_fast_period = min(capture_cfg.getfloat('fast_period_s', 0.05), thread_time)
+            self.capture_on = {reason for reason in ("alarm", "purge")
+                               if capture_cfg.getboolean(f'on_{reason}', True)}
+            self.capture = TriggerCapture(
+                folder=self.report_folder,
+                set_fast=self._set_capture_rate,
+                pre_s=capture_cfg.getfloat('pre_s', 10.0),
+                post_s=capture_cfg.getfloat('post_s', 10.0),
+                period_s=thread_time,
+                # Oversampling: the reads of each block, in bar
+                convert=lambda raw: self.propar_to_bar(raw, self.capacity)
+            )
+            self.pipeline.add("capture", self.capture.record, ACQUISITION)
         #self.threadFlow = THREADFlow(self, capacity=self.capacity)
         self.threadFlow.start()
         port = str(self.config["Server"].get("port", "0123"))
-        self.serv = ServerLHC(
+        self.serv = GasServer(
             name=f"GAS {self.win.user_tag_label.text()}",
             address=f"tcp://*:{port}",
             freedom=1,
@@ -541,16 +742,106 @@ class Bronkhost(QMainWindow):
         self.server_controller.position_changed.connect(
             self.on_remote_setpoint_received
         )
+
+        # Remote setpoints are coalesced and rate limited before reaching the device
+        remote_cfg = self.config['Remote'] if self.config.has_section('Remote') else {}
+        self.remote_setpoint_ack = None
+        self.setpoint_coalescer = RemoteSetpointCoalescer(
+            window_ms=int(remote_cfg.get('coalesce_window_ms', 100)),
+            max_rate_hz=float(remote_cfg.get('max_write_rate_hz', 5.0)),
+            parent=self
+        )
+        self.setpoint_coalescer.apply.connect(self._apply_remote_setpoint)
+        register_set_ack(self.serv, lambda: self.remote_setpoint_ack)
+        register_history_command(self.serv, self.sample_buffer)
+        register_encoded_get(self.serv)
+        self.server_payload = ServerPayload(self.serv, {
+            "shootNumber": 0,
+            "stabilized": False,
+            "stabilizedSince": None,
+            "positions": [0.0],
+            "pressureRange": [0.0, 0.0],
+            "readsPerPoint": 1,
+            "setpoint": 0.0,
+            "status": None,
+            "unit": "bar",
+            "metrics": {},
+            "lastRemoteSet": None,
+            "stale": False,
+            "sampleAge": 0.0
+        })
         self.serv.start()
 
-        # 5. Connect thread signals
-        self.threadFlow.MEAS.connect(self.aff)
-        self.threadFlow.MEAS.connect(self.updateServer)
-        self.threadFlow.VALVE1_MEAS.connect(self.update_inlet_valve_display)
-        self.threadFlow.DEBUG_MEAS.connect(self.update_debug_display)
-        self.threadFlow.MEAS.connect(self.plot_window.update_plot)
-        self.threadFlow.DEVICE_STATUS_UPDATE.connect(self.update_device_status)
-        self.threadFlow.CRITICAL_ALARM.connect(self.handle_critical_alarm)
+        # Optional PUB stream of every sample (see [Stream] in config.ini)
+        self.stream_publisher = None
+        if self.config.has_section('Stream') and self.config['Stream'].getboolean('enable', False):
+            self.stream_publisher = SamplePublisher(
+                address=f"tcp://*:{self.config['Stream'].get('port', '1123')}",
+                name=f"GAS {self.win.user_tag_label.text()}",
+                max_batch=self.config['Stream'].getint('max_batch', 50),
+                encoding=self.config['Stream'].get('encoding', 'json')
+            )
+            self.stream_publisher.start()
+            self.pipeline.add("publish", lambda s: self.stream_publisher.publish(s.timestamp, s.pressure, s.setpoint),
+                              ACQUISITION)
+
+        # Optional Prometheus endpoint, fed by an acquisition stage (see [Prometheus])
+        self.metrics_exporter = None
+        if self.config.has_section('Prometheus') and self.config['Prometheus'].getboolean('enable', False):
+            self.metrics_exporter = MetricsExporter(
+                host=self.config['Prometheus'].get('host', '127.0.0.1'),
+                port=self.config['Prometheus'].getint('port', 9123),
+                instrumentation=self.instrumentation,
+                name=f"GAS {self.win.user_tag_label.text()}"
+            )
+            if self.metrics_exporter.start():
+                self.pipeline.add("metrics_http", self.metrics_exporter.observe, ACQUISITION)
+            else:
+                self.metrics_exporter = None
+
+        # 5. Consumer stages and thread signals
+        # One SAMPLE per cycle, run through the consumer stages by dispatch_sample
+        self.pipeline.add("status", self.sample_status)
+        self.pipeline.add("control", self.sample_control)
+        self.pipeline.add("display", lambda s: self.aff(s.timestamp, self.display_pressure(s)))
+        self.pipeline.add("metrics", lambda s: self.update_control_metrics(s.timestamp, s.pressure))
+        self.pipeline.add("stability", lambda s: self.update_stability(s.timestamp, s.filtered))
+        self.pipeline.add("server", self.sample_server)
+        self.pipeline.add("plot", lambda s: self.plot_window.update_plot(s.timestamp, self.display_pressure(s)))
+        self.pipeline.add("valve", self.sample_valve)
+        # Last: the alarm handler opens a modal dialog
+        self.pipeline.add("alarm", self.sample_alarm)
+        self.delivery_histogram = self.instrumentation.histogram("signal delivery") if self.instrumentation else None
+        self._connect_acquisition_thread(self.threadFlow)
+
+        # Stale data flag and restart of a wedged measurement thread (see [Supervisor])
+        self.acquisition_supervisor = None
+        # Existing config.ini files may have no [Supervisor] section: fallback, not KeyError
+        if self.config.getboolean('Supervisor', 'enable', fallback=True):
+            self.acquisition_supervisor = AcquisitionSupervisor(
+                period_s=thread_time,
+                get_thread=lambda: self.threadFlow,
+                restart=self.restart_acquisition,
+                stale_periods=self.config.getint('Supervisor', 'stale_periods', fallback=5),
+                restart_after_s=self.config.getfloat('Supervisor', 'restart_after_s', fallback=5.0),
+                max_restart_interval_s=self.config.getfloat('Supervisor', 'max_restart_interval_s', fallback=60.0),
+                instrumentation=self.instrumentation,
+                parent=self
+            )
+            self.pipeline.add("heartbeat", self.acquisition_supervisor.beat, ACQUISITION)
+            self.acquisition_supervisor.stale_changed.connect(self.on_acquisition_stale)
+            self.acquisition_supervisor.start()
+
+        # Event-loop lag watchdog: logs the GUI stack when the loop stalls (see [Watchdog])
+        self.gui_watchdog = None
+        if self.config.getboolean('Watchdog', 'enable', fallback=True):
+            self.gui_watchdog = GuiWatchdog(
+                instrumentation=self.instrumentation,
+                heartbeat_ms=self.config.getint('Watchdog', 'heartbeat_ms', fallback=50),
+                stall_threshold_ms=self.config.getint('Watchdog', 'stall_threshold_ms', fallback=500),
+                parent=self
+            )
+            self.gui_watchdog.start()
 
         self.win.title_2.setText('Pressure Control')
 
@@ -581,15 +872,40 @@ class Bronkhost(QMainWindow):
                 f"Remote setpoint {new_setpoint} outside allowed range "
                 f"[{min_allowed}, {max_allowed}]"
             )
+            self.remote_setpoint_ack = {
+                "status": "rejected",
+                "requested": new_setpoint,
+                "time": time.time()
+            }
             return
 
+        # Bursts are merged: only the latest value is written, at a bounded rate
+        self.setpoint_coalescer.submit(new_setpoint)
+
+    def _apply_remote_setpoint(self, new_setpoint: float):
+        """Writes a coalesced remote setpoint to the UI and the device."""
         # Update UI safely (this runs in GUI thread)
         self.win.setpoint.blockSignals(True)
         self.win.setpoint.setValue(new_setpoint)
         self.win.setpoint.blockSignals(False)
 
         # Apply to device
-        self.setPoint()
+        if self.setPoint(source="remote"):
+            status = "applied"
+        elif self.is_offline or not self.connection_successful or self.capacity <= 0:
+            status = "skipped"
+        else:
+            status = "busy"  # Instrument lock timeout, see lock_instrument()
+
+        # Acknowledgement returned to the clients (SET reply and GET data)
+        self.remote_setpoint_ack = {
+            "status": status,
+            "requested": new_setpoint,
+            "applied": self.last_known_setpoint,  # Setpoint in force on the device
+            "time": time.time(),
+            "requests": self.setpoint_coalescer.requests_total,
+            "writes": self.setpoint_coalescer.writes_total
+        }
 
 
     def reset_alarm_cmd(self):
@@ -597,7 +913,8 @@ class Bronkhost(QMainWindow):
         try:
             log.debug("Sending Alarm Reset Command...")
             # Good practice: Send 0 first to clear previous commands
-            self.instrument_mutex.lock()  # <--- Lock
+            if not self.lock_instrument("alarm reset"):
+                return
             try:
                 self.instrument.writeParameter(114, 0)
                 time.sleep(0.1)
@@ -634,6 +951,13 @@ class Bronkhost(QMainWindow):
 
         self.alarm_popup_active = True
         log.error(f"CRITICAL ALARM {alarm_code}: Executing AUTO-SAFETY sequence.")
+        self.capture_event("alarm")
+        if isinstance(alarm_code, int):
+            self.journal_event("alarm", source="device", value=alarm_code, pressure=self.current_pressure_bar,
+                               setpoint=self.last_known_setpoint)
+        else:
+            self.journal_event("alarm", source="software", pressure=self.current_pressure_bar,
+                               setpoint=self.last_known_setpoint, code=alarm_code)
 
         # ----------------------------------------------------------
         # STEP 1: IMMEDIATE ACTIONS
@@ -656,7 +980,7 @@ class Bronkhost(QMainWindow):
         #   1. Set is_purging = True (Disable alarms)
         #   2. Send Setpoint 0.0 bar
         #   3. Switch to PID
-        #   4. Start the 200ms loop to check for 0 bar OR timeout
+        #   4. Start the purge sequence (checks 0 bar OR timeout on every sample)
         log.info("Transferring control to Purge Logic...")
         self.purge_system()
 
@@ -682,11 +1006,48 @@ class Bronkhost(QMainWindow):
         msg.addButton("OK", QMessageBox.ButtonRole.AcceptRole)
 
         # This blocks the User Interface (mouse clicks),
-        # BUT the purge_check_timer continues running in the background.
+        # BUT the purge sequence keeps running in the measurement thread.
         msg.exec()
 
         self.alarm_popup_active = False
 
+    def on_safety_trip(self, event):
+        """
+        The software monitor already sent the safe setpoint from the measurement
+        thread: the usual sequence follows (UI, purge bookkeeping, notification).
+        If its commands failed, the GUI purge path sends them again.
+        """
+        if getattr(self, 'metrics_exporter', None) is not None:
+            self.metrics_exporter.increment("safety_trips")
+        self.journal_event("safety_trip", source="software", value=event['limit'], pressure=event['pressure'],
+                           setpoint=event['setpoint'], response_s=event['response_s'],
+                           success=event['success'], failed=event['failed'])
+        # One trip per arming: the debounce meant for repeated device alarms does not apply
+        self.last_reset_time = 0.0
+        if event['success']:
+            self.handle_critical_alarm(
+                f"software monitor, {event['pressure']:.2f} bar > {event['limit']:.2f} bar "
+                f"(safe setpoint sent in {event['response_s'] * 1000:.0f} ms)")
+            return
+
+        log.error(f"Safe setpoint not acknowledged (parameters {event['failed']}): falling back to the GUI purge.")
+        if self.alarm_popup_active:
+            # handle_critical_alarm() returns early while its notification is open
+            self.purge_system()
+        else:
+            self.handle_critical_alarm(
+                f"software monitor, {event['pressure']:.2f} bar > {event['limit']:.2f} bar "
+                f"(safe setpoint NOT acknowledged, parameters {event['failed']}: sent again by the purge)")
+
+    def _set_software_alarm(self, armed):
+        """Keeps the software monitor in step with the device alarm (parameter 118)."""
+        monitor = getattr(self, 'safety_monitor', None)
+        if monitor is not None:
+            if armed:
+                monitor.arm()
+            else:
+                monitor.disarm()
+
     def get_safe_setpoint_bar(self):
         """
         Single source of truth for the safe state pressure.
@@ -696,13 +1057,7 @@ class Bronkhost(QMainWindow):
 
     def update_device_status(self, status: str):
         """Updates the device status label and enables/disables controls."""
-        # Track previous status to avoid repeated reads
-        if not hasattr(self, '_last_status'):
-            self._last_status = None
-
-        # Update the UI label
-        if hasattr(self.win, 'device_status_label'):
-            self.win.device_status_label.setText(status)
+        ui = self.ui
 
         normalized_status = status.lower().strip()
 
@@ -711,30 +1066,28 @@ class Bronkhost(QMainWindow):
             if not self.is_offline:
                 log.warning("Connection to device lost...")
                 self.is_offline = True
-            self.win.device_status_label.setText("Offline")
+                self.journal_event("device_status", source="device", status="offline")
+                if getattr(self, 'metrics_exporter', None) is not None:
+                    self.metrics_exporter.set_online(False)
+            ui.set_text(self.win.device_status_label, "Offline")
 
-            self.win.device_status_label.setStyleSheet("color: red")
+            ui.set_style(self.win.device_status_label, "color: red")
 
             # DISABLE RADIO BUTTONS
-            self.win.radioPID.setEnabled(False)
-            self.win.radioShut.setEnabled(False)
+            ui.set_enabled(self.win.radioPID, False)
+            ui.set_enabled(self.win.radioShut, False)
 
             # Stop flickering, disable UI, gray out everything
             self.flicker_timer.stop()
-            self.win.label_valve_status.setText("...")
-            self.win.label_valve_status.setStyleSheet("color: gray;")
-
-            self.win.measure.setText("...")
-            self.win.inlet_valve_label.setText("...")
-
-            self.win.plotButton.setEnabled(False)
-            self.win.setpoint.setEnabled(False)
-            self.win.plot_duration_spinbox.setEnabled(False)
-            self.win.purgeButton.setEnabled(False)
-            self.win.admin_button.setEnabled(False)
-            self.win.plotButton.setEnabled(False)
+            ui.set_text(self.win.label_valve_status, "...")
+            ui.set_style(self.win.label_valve_status, "color: gray;")
 
+            ui.set_text(self.win.measure, "...")
+            ui.set_text(self.win.inlet_valve_label, "...")
 
+            for widget in (self.win.plotButton, self.win.setpoint, self.win.plot_duration_spinbox,
+                           self.win.purgeButton, self.win.admin_button):
+                ui.set_enabled(widget, False)
 
             gray_text_style = "color: gray;"
             for attr in [
@@ -742,7 +1095,7 @@ class Bronkhost(QMainWindow):
                 'mode_label', 'label_In_Out', 'inlet_valve_label', 'user_tag_label'
             ]:
                 if hasattr(self.win, attr):
-                    getattr(self.win, attr).setStyleSheet(gray_text_style)
+                    ui.set_style(getattr(self.win, attr), gray_text_style)
 
         # --- NORMAL STATE ---
         elif normalized_status == "normal":
@@ -750,6 +1103,10 @@ class Bronkhost(QMainWindow):
             if self.is_offline:
                 self.is_offline = False
                 log.info("Device back online. Resetting offline status.")
+                self._filter_reset = True
+                self.journal_event("device_status", source="device", status="normal")
+                if getattr(self, 'metrics_exporter', None) is not None:
+                    self.metrics_exporter.set_online(True)
 
             # Only trigger the refresh once per transition
             if self._last_status != "normal":
@@ -763,7 +1120,12 @@ class Bronkhost(QMainWindow):
                 self.configure_response_alarm()
 
                 try:
-                    valve1_output = self.instrument.readParameter(55)
+                    valve1_output = None
+                    if self.lock_instrument("valve read"):
+                        try:
+                            valve1_output = self.instrument.readParameter(55)
+                        finally:
+                            self.instrument_mutex.unlock()
                     if valve1_output is not None:
                         current_valve_value = calculate_valve_percentage(valve1_output)
                         self.update_inlet_valve_display(current_valve_value)
@@ -776,11 +1138,9 @@ class Bronkhost(QMainWindow):
                         self.win.inlet_valve_label.setText("...")
 
                 # Re-enable UI
-                self.win.plotButton.setEnabled(True)
-                self.win.plot_duration_spinbox.setEnabled(True)
-                self.win.radioPID.setEnabled(True)
-                self.win.purgeButton.setEnabled(True)
-                self.win.radioShut.setEnabled(True)
+                for widget in (self.win.plotButton, self.win.plot_duration_spinbox, self.win.radioPID,
+                               self.win.purgeButton, self.win.radioShut):
+                    ui.set_enabled(widget, True)
                 # Restore correct selection visually based on internal state
                 if self.valve_status == "PID":
                     self.win.radioPID.setChecked(True)  # Check PID
@@ -790,9 +1150,9 @@ class Bronkhost(QMainWindow):
                     self.win.label_valve_status.setText("Shut")
                     if not self.flicker_timer.isActive():
                         self.flicker_timer.start(500)
-                self.win.setpoint.setEnabled(True)
+                ui.set_enabled(self.win.setpoint, True)
                 if hasattr(self.win, 'admin_button'):
-                    self.win.admin_button.setEnabled(True)
+                    ui.set_enabled(self.win.admin_button, True)
 
                 # Restore colors
                 default_label_color = "color: white;"
@@ -801,14 +1161,14 @@ class Bronkhost(QMainWindow):
                     'mode_label', 'user_tag_label', 'inlet_valve_label', 'label_In_Out'
                 ]:
                     if hasattr(self.win, attr):
-                        getattr(self.win, attr).setStyleSheet(default_label_color)
+                        ui.set_style(getattr(self.win, attr), default_label_color)
 
                 # Restore buttons and valve labels
                 if self.valve_status == "PID":
                     #self.win.openButton.setStyleSheet("background-color: green;")
                     #self.win.closeButton.setStyleSheet("background-color: gray;")
-                    self.win.label_valve_status.setText("PID")
-                    self.win.label_valve_status.setStyleSheet("color: white;")
+                    ui.set_text(self.win.label_valve_status, "PID")
+                    ui.set_style(self.win.label_valve_status, "color: white;")
                 elif self.valve_status == "closed":
                     #self.win.openButton.setStyleSheet("background-color: gray;")
                     #self.win.closeButton.setStyleSheet("background-color: red;")
@@ -817,16 +1177,18 @@ class Bronkhost(QMainWindow):
                         self.flicker_timer.start(500)
 
                 # Update status text and color
-                self.win.device_status_label.setText('Normal')
-                self.win.device_status_label.setStyleSheet("color: green;")
+                ui.set_text(self.win.device_status_label, 'Normal')
+                ui.set_style(self.win.device_status_label, "color: green;")
 
         # --- ERROR or WARNING STATE ---
         elif normalized_status == 'error':
-            self.win.device_status_label.setText('ERROR')
-            self.win.device_status_label.setStyleSheet("color: red;")
+            ui.set_text(self.win.device_status_label, 'ERROR')
+            ui.set_style(self.win.device_status_label, "color: red;")
         elif normalized_status == 'warning':
-            self.win.device_status_label.setText('Warning')
-            self.win.device_status_label.setStyleSheet("color: orange;")
+            ui.set_text(self.win.device_status_label, 'Warning')
+            ui.set_style(self.win.device_status_label, "color: orange;")
+        elif hasattr(self.win, 'device_status_label'):
+            ui.set_text(self.win.device_status_label, status)
 
         # Update last status for transition detection
         self._last_status = normalized_status
@@ -850,15 +1212,6 @@ class Bronkhost(QMainWindow):
         # 3. Reconnect the signal
         self.win.setpoint.editingFinished.connect(self.setPoint)
 
-    def update_log(self, text):
-        """Appends text to the QTextEdit."""
-        self.win.log_display.append(text)
-        # cursor = self.win.log_display.textCursor()
-        # cursor.movePosition(cursor.End)
-        # cursor.insertText(text)
-        # self.win.log_display.setTextCursor(cursor)
-        # self.win.log_display.ensureCursorVisible()
-
     def actionButton(self):
         self.mode_group.buttonClicked.connect(self.on_mode_changed)
 
@@ -944,7 +1297,8 @@ class Bronkhost(QMainWindow):
     def read_device_info(self):
         """Reads the capacity and unit from the instrument to calculate absolute values."""
         try:
-            self.instrument_mutex.lock()  # <--- ADD LOCK
+            if not self.lock_instrument("device info read"):
+                return
             try:
                 capacity = self.instrument.readParameter(21)
                 unit = self.instrument.readParameter(129)
@@ -1057,7 +1411,9 @@ class Bronkhost(QMainWindow):
             log.info(f"Safe State: {safe_pressure_bar} bar (Int: {safe_setpoint_int})")
 
             # 4. Send Configuration
-            self.instrument_mutex.lock()  # <--- Lock
+            self._set_software_alarm(False)
+            if not self.lock_instrument("alarm configuration"):
+                return
             try:
                 self.instrument.writeParameter(118, 0)  # Disable temporarily
                 self.instrument.writeParameter(116, dev_above_int)
@@ -1112,8 +1468,9 @@ class Bronkhost(QMainWindow):
         if self.is_purging:
             log.warning("Manual Override: Cancelling Purge Sequence.")
             self.is_purging = False
-            if self.purge_check_timer.isActive():
-                self.purge_check_timer.stop()
+            self.purge_sequence.cancel()
+            self.journal_event("purge_cancel", source="ui", duration_s=time.time() - self.purge_sequence.started,
+                               pressure=self.purge_sequence.peak_bar)
         # -------------------------------------------------------------------
         if button == self.win.radioPID:
             self.valve_PID()
@@ -1125,7 +1482,8 @@ class Bronkhost(QMainWindow):
         Purge Sequence:
         1. Set Setpoint to configured purge pressure.
         2. Switch to PID mode.
-        3. Start a timer that checks if we reached target OR if timeout occurred.
+        3. Start the purge state machine: the measurement thread closes the valve
+           when the target is reached OR the timeout occurred.
         """
         if self.is_offline or not self.connection_successful:
             log.info("Purge skipped: Device is offline.")
@@ -1134,87 +1492,100 @@ class Bronkhost(QMainWindow):
         # *** FIX: UNINDENTED THIS BLOCK ***
         # --- 1. SET FLAG & DISABLE ALARM ---
         self.is_purging = True
+        if getattr(self, 'metrics_exporter', None) is not None:
+            self.metrics_exporter.increment("purges")
+        self.capture_event("purge")
+        self.journal_event("purge_start", value=self.purge_target, pressure=self.current_pressure_bar,
+                           timeout_s=self.purge_timeout_limit)
 
         # Explicitly disable alarm (Param 118 -> 0)
-        try:
-            self.instrument_mutex.lock()
-            self.instrument.writeParameter(118, 0)
-        except Exception as e:
-            log.error(f"Error disabling alarm for purge: {e}")
-        finally:
-            self.instrument_mutex.unlock()
+        self._set_software_alarm(False)
+        if self.lock_instrument("alarm disable for purge"):
+            try:
+                self.instrument.writeParameter(118, 0)
+            except Exception as e:
+                log.error(f"Error disabling alarm for purge: {e}")
+            finally:
+                self.instrument_mutex.unlock()
         # -----------------------------------
 
         log.info(f"  Purge Initiated: Target={self.purge_target} bar, Max Wait={self.purge_timeout_limit}s  ")
 
         # 2. Update UI and Send Setpoint
         self.win.setpoint.setValue(self.purge_target)
-        self.setPoint()
+        self.setPoint(source="purge")
 
         # 3. Activate PID Mode
         self.valve_PID(force_cooldown=True)
 
-        # 4. Start the Logic Check
-        self.purge_start_time = time.time()
-
-        # Check the condition every 200ms (0.2 seconds)
-        self.purge_check_timer.start(200)
+        # 4. Start the Logic Check (evaluated on every sample)
+        self.purge_sequence.start(self.purge_target, self.purge_timeout_limit)
 
-    def _check_purge_condition(self):
+    def _close_valve_for_purge(self, generation):
         """
-        Called repeatedly by purge_check_timer.
-        Checks if pressure is close to target or if timeout has passed.
+        Called by the purge sequence when it ends, from the measurement thread or
+        from its GUI backstop timer, so the lock wait is bounded. Checked under
+        the lock: if the user cancelled the purge meanwhile, their command wins.
+        On timeout _finalize_purge() tries again through valve_close().
         """
-        # Define "Close enough" (e.g., +/- 0.5 bar)
-        TOLERANCE = 1.5
-
-        elapsed = time.time() - self.purge_start_time
-        current_diff = abs(self.current_pressure_bar - self.purge_target)
-
-        # 1. SUCCESS CONDITION: Pressure is within tolerance
-        if current_diff <= TOLERANCE:
-            log.info(f"Purge Target Reached! (Diff: {current_diff:.4f} bar). Closing.")
-            self._finalize_purge()
-
-        # 2. TIMEOUT CONDITION: Time exceeded limit
-        elif elapsed >= self.purge_timeout_limit:
-            log.info(f"Purge Timeout ({elapsed:.1f}s > {self.purge_timeout_limit}s). Forcing Close.")
-            self._finalize_purge()
-
-        # 3. Otherwise, do nothing and wait for next timer tick
+        if not try_lock(self.instrument_mutex, self.gui_lock_timeout_ms, "valve close for purge"):
+            return
+        try:
+            if not self.purge_sequence.is_current(generation):
+                log.info("Purge cancelled meanwhile: valve left as set by the user.")
+                return
+            self.instrument.writeParameter(12, 3)  # 'Valve Closed' command
+            self.instrument.writeParameter(118, 0)
+        finally:
+            self.instrument_mutex.unlock()
 
-    def _finalize_purge(self):
+    def _finalize_purge(self, reason, elapsed, generation):
         """
-        Stops the timer and closes the valves.
+        The valve is already closed by the purge sequence: updates the state and the UI.
+        Ignored for a purge cancelled by the user or replaced by a newer one.
         """
-        # Stop the checking timer so it doesn't fire again
-        if self.purge_check_timer.isActive():
-            self.purge_check_timer.stop()
+        if not self.is_purging or not self.purge_sequence.is_current(generation):
+            log.info(f"Ignoring the end ({reason}) of a cancelled or older purge.")
+            return
+        if reason == TARGET:
+            log.info(f"Purge Target Reached! (Diff: {self.purge_sequence.last_diff:.4f} bar, "
+                     f"after {elapsed:.1f}s). Closing.")
+        else:
+            log.info(f"Purge Timeout ({elapsed:.1f}s >= {self.purge_timeout_limit}s). Forcing Close.")
+        self.journal_event("purge_end", source=reason, value=self.purge_target, duration_s=elapsed,
+                           pressure=self.purge_sequence.peak_bar, final_diff=self.purge_sequence.last_diff)
         self.is_purging = False
         log.info("Purge Sequence Complete. Closing valves.")
 
         # Close the valve
         self.valve_close()
+        if self.valve_status != "closed":
+            log.error("Purge ended but the valve could not be closed: left in PID at the purge target.")
+            self.journal_event("purge_close_failed", source=reason, value=self.purge_target)
+            return
 
         # Ensure the UI Radio Button reflects the change
         self.win.radioShut.setChecked(True)
 
-    def _trigger_alarm_cooldown(self):
+    def _trigger_alarm_cooldown(self, locked=False):
         """
         Disables the alarm temporarily and starts the re-arm timer.
         Used when lowering setpoint OR when switching to PID mode.
+        'locked': the caller already holds the instrument lock.
         """
         if self.response_alarm_enabled:
             try:
                 log.info(f"Safety Wait Period: Disabling alarm for {self.lower_setpoint_cooldown}s...")
 
                 # 1. Disable Alarm (Mode 0) immediately
-
-                self.instrument_mutex.lock()  # <--- ADD LOCK
-                try:
+                self._set_software_alarm(False)
+                if locked:
                     self.instrument.writeParameter(118, 0)
-                finally:
-                    self.instrument_mutex.unlock()
+                elif self.lock_instrument("alarm disable"):
+                    try:
+                        self.instrument.writeParameter(118, 0)
+                    finally:
+                        self.instrument_mutex.unlock()
 
                 # 2. Start/Restart the timer (converts seconds to ms)
                 # When this timer finishes, it calls _reenable_alarm automatically
@@ -1223,9 +1594,10 @@ class Bronkhost(QMainWindow):
             except Exception as e:
                 log.error(f"Error triggering alarm cooldown: {e}")
 
-    def _handle_setpoint_safety_logic(self, new_bar_setpoint):
+    def _handle_setpoint_safety_logic(self, new_bar_setpoint, locked=False):
         """
         Safety Check when user changes Setpoint while in PID.
+        'locked': the caller already holds the instrument lock.
         """
         # --- NEW: Ignore check if Purging ---
         if self.is_purging:
@@ -1239,12 +1611,23 @@ class Bronkhost(QMainWindow):
             if self.current_pressure_bar > alarm_threshold:
                 log.info(f"PID Safety: Pressure ({self.current_pressure_bar:.2f}) > "
                       f"Limit ({alarm_threshold:.2f}). Triggering cooldown.")
-                self._trigger_alarm_cooldown()
+                self._trigger_alarm_cooldown(locked=locked)
 
     def valve_PID(self, force_cooldown=False):
         log.info('Valve PID controlled')
 
-        # 1. Update UI Visuals
+        # 1. Send Command to Device (nothing changes if it cannot be sent)
+        if not self.lock_instrument("PID mode"):
+            return
+        try:
+            self.instrument.writeParameter(12, 0)  # 'PID Control' command
+            self.valve_status = "PID"
+        finally:
+            self.instrument_mutex.unlock()
+        self.journal_event("valve_mode", pressure=self.current_pressure_bar, mode="PID",
+                           setpoint=self.last_known_setpoint)
+
+        # 2. Update UI Visuals
         self.flicker_timer.stop()
         self.win.label_valve_status.setStyleSheet("color: white;")
         self.win.label_valve_status.setText('PID')
@@ -1256,14 +1639,6 @@ class Bronkhost(QMainWindow):
         if hasattr(self.win, 'label_In_Out'):
             self.win.label_In_Out.setStyleSheet("color: white;")
 
-        # 2. Send Command to Device
-        self.instrument_mutex.lock()
-        try:
-            self.instrument.writeParameter(12, 0)  # 'PID Control' command
-            self.valve_status = "PID"
-        finally:
-            self.instrument_mutex.unlock()
-
         # 3. ALARM LOGIC
         if self.response_alarm_enabled:
 
@@ -1286,11 +1661,15 @@ class Bronkhost(QMainWindow):
             # Case C: Safe Condition (Pressure is within tolerance)
             else:
                 try:
-                    self.instrument_mutex.lock()
+                    if not self.lock_instrument("alarm enable"):
+                        # Retried by the re-arm timer
+                        self.rearm_timer.start(int(self.lower_setpoint_cooldown * 1000))
+                        return
                     try:
                         self.instrument.writeParameter(118, 2)
                     finally:
                         self.instrument_mutex.unlock()
+                    self._set_software_alarm(True)
                     log.info("Safety alarm: ENABLED (Mode 2) - Immediate")
                 except Exception as e:
                     log.error(f"Failed to enable alarm: {e}")
@@ -1298,7 +1677,8 @@ class Bronkhost(QMainWindow):
         # 4. Attempt to read the new valve value
         time.sleep(0.1)
         try:
-            self.instrument_mutex.lock()
+            if not self.lock_instrument("valve read"):
+                return
             try:
                 valve1_output = self.instrument.readParameter(55)
             finally:
@@ -1317,25 +1697,28 @@ class Bronkhost(QMainWindow):
 
     def valve_close(self):
         log.info('Valve closing')
-        self.win.label_valve_status.setText('Shut')
-        #self.win.closeButton.setStyleSheet("background-color: red")
-        #self.win.openButton.setStyleSheet("background-color: gray")
-        self.flicker_timer.start(500)  # 500 ms interval
-        self.instrument_mutex.lock()  # <--- Lock
+        if not self.lock_instrument("valve close"):
+            return
         try:
             self.instrument.writeParameter(12, 3)  # 'Valve Closed' command
         finally:
             self.instrument_mutex.unlock()
+        self.win.label_valve_status.setText('Shut')
+        #self.win.closeButton.setStyleSheet("background-color: red")
+        #self.win.openButton.setStyleSheet("background-color: gray")
+        self.flicker_timer.start(500)  # 500 ms interval
         self.valve_status = "closed"
+        self.journal_event("valve_mode", pressure=self.current_pressure_bar, mode="closed")
 
         # --- Disable Alarm ---
+        self._set_software_alarm(False)
         try:
-            self.instrument_mutex.lock()  # <--- Lock
-            try:
-                self.instrument.writeParameter(118, 0)
-            finally:
-                self.instrument_mutex.unlock()
-            log.info("Safety Alarm: DISABLED (Mode 0)")
+            if self.lock_instrument("alarm disable"):
+                try:
+                    self.instrument.writeParameter(118, 0)
+                finally:
+                    self.instrument_mutex.unlock()
+                log.info("Safety Alarm: DISABLED (Mode 0)")
         except Exception as e:
             log.error(f"Failed to disable alarm: {e}")
         # --------------------------
@@ -1346,31 +1729,49 @@ class Bronkhost(QMainWindow):
         if hasattr(self.win, 'label_In_Out'):
             self.win.label_In_Out.setStyleSheet("color: gray;")
 
-    def setPoint(self):
+    def setPoint(self, source="ui"):
+        """
+        Sends the spinbox value to the device. Returns True once sent; otherwise
+        nothing is recorded and the spinbox shows the setpoint still in force.
+        """
         # *** Guard against running while offline ***
         if self.is_offline or not self.connection_successful:
             log.info("Set point skipped: Device is offline.")
-            return
+            return False
 
         bar_setpoint = self.win.setpoint.value()
+        previous = self.last_known_setpoint
 
-        self._handle_setpoint_safety_logic(bar_setpoint)
+        if self.capacity <= 0:
+            log.warning("Warning: Cannot set point, device capacity is unknown or zero.")
+            self._show_setpoint(previous)
+            return False
+        # Lock first: the alarm cooldown and the journal only follow a setpoint actually sent
+        if not self.lock_instrument("setpoint"):
+            # The device keeps the previous setpoint
+            self._show_setpoint(previous)
+            return False
+        try:
+            self._handle_setpoint_safety_logic(bar_setpoint, locked=True)
+            self.instrument.writeParameter(9, self.bar_to_propar(bar_setpoint, self.capacity))
+            # --- Re-engage control mode every time setpoint changes ---
+            if self.valve_status == "PID":
+                self.instrument.writeParameter(12, 0)  # 'PID Control' command
+        finally:
+            self.instrument_mutex.unlock()
 
         log.info(f"Bar setpoint set to: {bar_setpoint} {self.unit}")
+        self.journal_event("setpoint", source=source, value=bar_setpoint, pressure=self.current_pressure_bar,
+                           previous=previous)
         self.plot_window.set_setpoint_value(bar_setpoint)
+        self.last_known_setpoint = bar_setpoint
+        return True
 
-        if self.capacity > 0:
-            propar_value = self.bar_to_propar(bar_setpoint, self.capacity)
-            self.instrument_mutex.lock()
-            try:
-                self.instrument.writeParameter(9, propar_value)
-                # --- Re-engage control mode every time setpoint changes ---
-                if self.valve_status == "PID":
-                    self.instrument.writeParameter(12, 0)  # 'PID Control' command
-            finally:
-                self.instrument_mutex.unlock()
-        else:
-            log.warning("Warning: Cannot set point, device capacity is unknown or zero.")
+    def _show_setpoint(self, bar_setpoint):
+        """Puts 'bar_setpoint' back in the spinbox without sending it again."""
+        self.win.setpoint.blockSignals(True)
+        self.win.setpoint.setValue(bar_setpoint)
+        self.win.setpoint.blockSignals(False)
 
     def _reenable_alarm(self):
         """
@@ -1401,24 +1802,219 @@ class Bronkhost(QMainWindow):
 
             try:
                 log.info("Cooldown finished & Pressure Safe: Re-enabling Safety Alarm (Mode 2)")
-                self.instrument_mutex.lock()
+                if not self.lock_instrument("alarm re-enable"):
+                    self.rearm_timer.start(int(self.lower_setpoint_cooldown * 1000))
+                    return
                 try:
                     self.instrument.writeParameter(118, 2)
                 finally:
                     self.instrument_mutex.unlock()
+                self._set_software_alarm(True)
             except Exception as e:
                 log.error(f"Failed to re-enable alarm: {e}")
 
     def update_inlet_valve_display(self, raw_value):
         if self.valve_status != "closed":
             if hasattr(self.win, 'inlet_valve_label'):
-                self.win.inlet_valve_label.setText(f"{raw_value:.2f}")
+                self.ui.set_text(self.win.inlet_valve_label, f"{raw_value:.2f}")
 
 
     def update_debug_display(self, raw_value):
         """Updates the debug display with a raw value from the thread."""
         if hasattr(self.win, 'debug_param_output'):
-            self.win.debug_param_output.setText(f"{int(raw_value)} %")
+            self.ui.set_text(self.win.debug_param_output, f"{int(raw_value)} %")
+
+    def dispatch_sample(self, sample):
+        """Runs one acquisition sample through the consumer stages (GUI thread)."""
+        if self.delivery_histogram is not None:
+            self.delivery_histogram.record(time.perf_counter() - sample.emitted_at)
+        self.pipeline.run(CONSUMER, sample)
+
+    def _connect_acquisition_thread(self, thread):
+        thread.SAMPLE.connect(self.dispatch_sample)
+        thread.DEBUG_MEAS.connect(self.update_debug_display)
+        thread.DEVICE_STATUS_UPDATE.connect(self.update_device_status)
+
+    def lock_instrument(self, action):
+        """
+        Instrument lock for device calls made from the GUI thread, see try_lock().
+        On timeout 'action' is reported and the caller must not send anything.
+        """
+        if try_lock(self.instrument_mutex, self.gui_lock_timeout_ms, action):
+            return True
+        self.show_notice(f"Instrument busy: {action} not sent.")
+        self.journal_event("device_busy", source="gui", action=action)
+        return False
+
+    def show_notice(self, text, seconds=5.0):
+        """Temporary status bar message, not overwritten by the per-sample metrics meanwhile."""
+        self._notice_until = time.monotonic() + seconds
+        self.statusBar().showMessage(text, int(seconds * 1000))
+
+    def restart_acquisition(self):
+        """
+        Replaces a wedged measurement thread and reopens the serial port.
+        A thread blocked inside a propar call cannot be interrupted: it is left
+        behind with its own mutex and exits after its call returns.
+        """
+        old = self.threadFlow
+        old.stopThread()
+        for signal, slot in ((old.SAMPLE, self.dispatch_sample),
+                             (old.DEBUG_MEAS, self.update_debug_display),
+                             (old.DEVICE_STATUS_UPDATE, self.update_device_status)):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass
+        if not old.wait(500):
+            log.warning("Measurement thread still blocked, leaving it behind.")
+            self._abandoned_threads.append(old)
+            # The old thread may hold the old mutex forever
+            self.instrument_mutex = TimedMutex(self.instrumentation) if self.instrumentation else QMutex()
+            if self.safety_monitor is not None:
+                self.safety_monitor.mutex = self.instrument_mutex
+        self._abandoned_threads = [t for t in self._abandoned_threads if t.isRunning()]
+
+        # Transport: close and reopen the serial port of the shared propar master
+        self.instrument_mutex.lock()
+        try:
+            self.instrument.master.stop()
+            self.instrument.master.start()
+        except Exception as e:
+            log.error(f"Could not reopen {self.com}: {e}")
+        finally:
+            self.instrument_mutex.unlock()
+
+        # The new thread replaces the 'convert' stage of the old one
+        self.threadFlow = THREADFlow(self, **self._thread_kwargs)
+        self._connect_acquisition_thread(self.threadFlow)
+        self._filter_reset = True
+        self.threadFlow.start()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.increment("restarts")
+        log.info("Measurement thread restarted.")
+        self.journal_event("acquisition_restart", source="supervisor",
+                           abandoned=len(self._abandoned_threads))
+
+    def on_acquisition_stale(self, stale):
+        """Shows that the displayed pressure is old (no sample for several periods)."""
+        self.data_stale = stale
+        if not self.is_offline:  # Offline already grays the display out
+            self.ui.set_style(self.win.measure, "color: orange;" if stale else "color: white;")
+        if stale:
+            self.statusBar().showMessage("No pressure reading: displayed value is stale.")
+        else:
+            self.statusBar().clearMessage()
+        # No fresh sample will carry the flag to the server: republish the last one
+        if self._last_server_sample is not None:
+            self.sample_server(self._last_server_sample)
+
+    def journal_event(self, event_type, source="ui", value=None, duration_s=None, pressure=None, **data):
+        """Appends an event to the journal (no-op when disabled), never waits for the disk."""
+        if self.journal is not None:
+            self.journal.record(event_type, source, value, duration_s, pressure, **data)
+
+    def capture_event(self, reason):
+        """Starts a pre-/post-trigger capture ('manual' always, others per [Capture])."""
+        if self.capture is None or (reason != "manual" and reason not in self.capture_on):
+            return False
+        return self.capture.trigger(reason)
+
+    def _set_capture_rate(self, fast):
+        # Called by the capture from the measurement thread, read by it at the next cycle
+        normal = self._thread_kwargs['thread_sleep_time']
+        self.threadFlow.thread_sleep_time = self.capture_fast_period if fast else normal
+
+    def report_folder(self):
+        """Folder of today's log file, where diagnostic reports are written."""
+        try:
+            folder = pathlib.Path(get_logger_instance().date_folder)
+        except Exception:
+            folder = pathlib.Path("logs")
+        folder.mkdir(parents=True, exist_ok=True)
+        return folder
+
+    def dump_timing_statistics(self):
+        """Writes the instrumentation histograms next to the log files, returns the path."""
+        path = self.report_folder() / f"timing_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        try:
+            return self.instrumentation.dump(path)
+        except OSError as e:
+            log.error(f"Could not write timing statistics: {e}")
+            return None
+
+    def start_profiling(self, duration_s=None, mode=None):
+        """
+        Profiles the acquisition thread and the GUI event loop for a bounded
+        time (see [Profiling]); reports are written to the log folder.
+        Returns the session, or None if one is already running.
+        """
+        if self.profiling_session is not None and self.profiling_session.is_alive():
+            log.warning("Profiling already running.")
+            return None
+        cfg = self.config['Profiling'] if self.config.has_section('Profiling') else {}
+        session = ProfilingSession(
+            self.report_folder(),
+            duration_s=float(duration_s if duration_s is not None else cfg.get('duration_s', 30)),
+            mode=mode or cfg.get('mode', 'cprofile'),
+            tracemalloc_interval_s=float(cfg.get('tracemalloc_interval_s', 10)),
+            top=int(cfg.get('top', 40))
+        )
+        if session.mode == MODE_SAMPLING:
+            session.watch("gui", threading.get_ident())
+            if getattr(self.threadFlow, 'thread_ident', None) is not None:
+                session.watch("acquisition", self.threadFlow.thread_ident)
+        elif session.attach("gui"):
+            # cProfile of the event loop; the acquisition thread attaches itself on its next cycle
+            QTimer.singleShot(int(session.duration_s * 1000), lambda: session.detach("gui"))
+        self.profiling_session = session
+        session.start()
+        return session
+
+    def filter_sample(self, sample):
+        """Acquisition stage: Hampel filter on the pressure (raw value kept in sample.pressure)."""
+        # A new setpoint or a gap in the data starts a new window: the median of the old
+        # level would reject a genuine pressure step as an outlier for window/2 samples
+        if self._filter_reset or sample.setpoint != self._filter_setpoint:
+            self._filter_reset = False
+            self._filter_setpoint = sample.setpoint
+            self.outlier_filter.reset()
+        sample.filtered, sample.outlier = self.outlier_filter.update(sample.pressure)
+        if sample.outlier:
+            log.debug(f"Outlier rejected: {sample.pressure:.4f} bar (median {sample.filtered:.4f} bar)")
+
+    def sample_control(self, sample):
+        # Value used by the cooldown / alarm re-arm decisions: a single glitch must not
+        # make the pressure look safe. Over-pressure trips use the raw reading (SafetyMonitor)
+        self.current_pressure_bar = sample.filtered
+
+    def display_pressure(self, sample):
+        return sample.filtered if self.filter_display else sample.pressure
+
+    def sample_status(self, sample):
+        # Transitions only: the status word is read on every cycle
+        if sample.status is not None and sample.status.lower().strip() != self._last_status:
+            self.update_device_status(sample.status)
+
+    def sample_server(self, sample):
+        self._last_server_sample = sample
+        # Extremes of the oversampling block (equal to the pressure without oversampling)
+        self.updateServer(sample.timestamp, sample.pressure,
+                          pressure_range=(sample.pressure_min, sample.pressure_max), reads=sample.reads)
+
+    def sample_valve(self, sample):
+        if sample.valve is not None:
+            self.update_inlet_valve_display(sample.valve)
+
+    def sample_alarm(self, sample):
+        # Queued: the alarm handling opens a modal dialog, the stage must not wait for it
+        if sample.critical and not self._alarm_queued:
+            self._alarm_queued = True
+            QTimer.singleShot(0, lambda code=sample.alarm: self._handle_queued_alarm(code))
+
+    def _handle_queued_alarm(self, alarm_code):
+        self._alarm_queued = False
+        self.handle_critical_alarm(alarm_code)
 
     def aff(self, timestamp, M):
         # This function updates the display with the measurement from the thread
@@ -1428,25 +2024,85 @@ class Bronkhost(QMainWindow):
             absolute_value = (float(M) / 100.0) * self.capacity
             #if hasattr(self.win, 'absolute_measure'):
             #    self.win.absolute_measure.setText(f"{absolute_value:.2f}")
-            self.current_pressure_bar = float(M)
             s_percent = float(M)
             # Use f-string formatting to always show two decimal places
-            self.win.measure.setText(f"{s_percent:.2f}")
+            self.ui.set_text(self.win.measure, f"{s_percent:.2f}")
 
         elif self.valve_status == "Closed":
             self.label_win.valve_status.setText('Shut')
 
-    def updateServer(self, timestamp, pressure):
-        payload = {
-            "shootNumber": 0, 
-            "stabilized": False,
-            "positions": [pressure], 
-            "unit": "bar"
-        }
-        self.serv.set_data(payload)
+    def update_control_metrics(self, timestamp, pressure):
+        """Feeds the rolling quality metrics and shows them in the status bar."""
+        # Only regulation time is meaningful, a shut valve is not a control error
+        if self.valve_status != "PID":
+            self.control_metrics.pause()
+            return
+
+        self.control_metrics.update(timestamp, pressure, self.last_known_setpoint)
+
+        if time.monotonic() < self._notice_until:
+            return  # A notice is shown, see show_notice()
+        lag = self.control_metrics.tracking_lag_s
+        lag_text = f"{lag:.1f} s" if lag is not None else "—"
+        self.ui.show_message(self.statusBar(),
+            f"IAE {self.control_metrics.iae:.3f} bar·s | "
+            f"ISE {self.control_metrics.ise:.3f} bar²·s | "
+            f"In band {self.control_metrics.in_band_percent:.1f} % | "
+            f"Lag {lag_text}"
+        )
+
+    def update_stability(self, timestamp, pressure):
+        """Runs the stability detector on every sample while regulating."""
+        if self.valve_status != "PID" or self.is_purging:
+            if self.stability_detector.stabilized or self.stability_detector.count:
+                self.stability_detector.reset()
+            return
+
+        was_stable = self.stability_detector.stabilized
+        if self.stability_detector.update(timestamp, pressure, self.last_known_setpoint) and not was_stable:
+            log.info(f"Pressure stabilized at {self.stability_detector.mean:.3f} bar "
+                     f"(setpoint {self.last_known_setpoint} bar)")
+
+    def updateServer(self, timestamp, pressure, pressure_range=None, reads=1):
+        # The payload dicts are reused (double buffered), only values change
+        payload = self.server_payload.spare()
+        payload["stabilized"] = self.stability_detector.stabilized
+        payload["stabilizedSince"] = self.stability_detector.stable_since
+        payload["positions"][0] = pressure
+        payload["pressureRange"][0], payload["pressureRange"][1] = pressure_range or (pressure, pressure)
+        payload["readsPerPoint"] = reads
+        payload["setpoint"] = self.last_known_setpoint
+        payload["status"] = self._last_status
+        self.control_metrics.snapshot(timestamp, out=payload["metrics"])
+        payload["lastRemoteSet"] = self.remote_setpoint_ack
+        payload["stale"] = self.data_stale
+        payload["sampleAge"] = self.acquisition_supervisor.sample_age if self.acquisition_supervisor else 0.0
+        self.server_payload.commit()
     
     def closeEvent(self, event):
         self.serv.stop()
+        if getattr(self, 'stream_publisher', None) is not None:
+            self.stream_publisher.stop()
+        if getattr(self, 'metrics_exporter', None) is not None:
+            self.metrics_exporter.stop()
+        if getattr(self, 'gui_watchdog', None) is not None:
+            self.gui_watchdog.stop()
+            log.info(self.gui_watchdog.summary())
+        if getattr(self, 'acquisition_supervisor', None) is not None:
+            self.acquisition_supervisor.stop()
+            log.info(f"Measurement thread restarts: {self.acquisition_supervisor.restarts}")
+        if hasattr(self, 'ui'):
+            log.info(f"Widget updates: {self.ui.applied} applied, {self.ui.skipped} unchanged")
+        if hasattr(self, 'setpoint_coalescer'):
+            self.setpoint_coalescer.cancel()
+        if hasattr(self, 'pipeline'):
+            log.info("Pipeline timings:\n" + self.pipeline.report())
+        if getattr(self, 'instrumentation', None) is not None:
+            log.info("Timing statistics:\n" + self.instrumentation.report())
+            if self.config.has_section('Instrumentation') and self.config['Instrumentation'].getboolean('dump_on_exit', False):
+                self.dump_timing_statistics()
+        if getattr(self, 'outlier_filter', None) is not None:
+            log.info(f"Outlier filter rejected {self.outlier_filter.outliers} readings.")
         # Disconnect the signal to prevent it from firing during shutdown.
         self.win.setpoint.editingFinished.disconnect(self.setPoint)
         log.info("Closing application...")
@@ -1462,10 +2118,12 @@ class Bronkhost(QMainWindow):
             self.threadFlow.stopThread()
             # Wait for the thread to actually finish (blocking the close event slightly)
             self.threadFlow.wait()
+        for thread in getattr(self, '_abandoned_threads', []):
+            if not thread.wait(1000):
+                log.warning("A wedged measurement thread is still blocked at exit.")
 
         if self.connection_successful:
-            if hasattr(self, 'instrument'):
-                self.instrument_mutex.lock()
+            if hasattr(self, 'instrument') and self.lock_instrument("valve close at exit"):
                 try:
                     self.instrument.writeParameter(12, 3)
                     log.info("Closing valve...")
@@ -1475,6 +2133,14 @@ class Bronkhost(QMainWindow):
                     log.info("Connection closed.")
                 finally:
                     self.instrument_mutex.unlock()
+        if getattr(self, 'journal', None) is not None:
+            self.journal.record("app_stop", "ui")
+            self.journal.close()
+        if LOG_QUEUE.handler.dropped:
+            log.warning(f"{LOG_QUEUE.handler.dropped} log records dropped (queue full).")
+        if hasattr(self, 'log_view'):
+            self.log_view.stop()
+            LOG_QUEUE.remove_handler(self.log_handler)
         event.accept()
 
     def propar_to_bar(self, propar_value, capacity):  # Added 'capacity' argument
@@ -1524,78 +2190,146 @@ class Bronkhost(QMainWindow):
 
 
 class THREADFlow(QtCore.QThread):
-    MEAS = QtCore.pyqtSignal(float, float)
-    VALVE1_MEAS = QtCore.pyqtSignal(float)
+    SAMPLE = QtCore.pyqtSignal(object)  # One Sample record per cycle
     DEBUG_MEAS = QtCore.pyqtSignal(float)
-    DEVICE_STATUS_UPDATE = QtCore.pyqtSignal(str)
-    CRITICAL_ALARM = QtCore.pyqtSignal(int)
+    DEVICE_STATUS_UPDATE = QtCore.pyqtSignal(str)  # Only used for 'offline'
 
-    def __init__(self, parent, capacity, thread_sleep_time):
+    def __init__(self, parent, capacity, thread_sleep_time, oversample=False, min_read_interval=0.0):
         super(THREADFlow, self).__init__(parent)
         self.parent = parent
         self.instrument = self.parent.instrument
         self.propar_to_bar_func = self.parent.propar_to_bar
         self.capacity = capacity
         self.stop = False
+        self.reported_offline = False  # 'offline' is emitted once per outage, not on every retry
+        # Own reference: after a restart, a wedged old thread must not unlock the new mutex
+        self.mutex = self.parent.instrument_mutex
+        self.last_cycle = time.monotonic()  # Loop heartbeat, read by AcquisitionSupervisor
         self.thread_sleep_time = float(thread_sleep_time)
+        # Oversampling: extra pressure reads during the cycle, averaged into one sample
+        self.oversample = oversample
+        self.min_read_interval = float(min_read_interval)
+        self.block = BlockStats()
+        self.thread_ident = None  # Python thread id, set when run() starts
+        # Loop timing histograms (None when instrumentation is off)
+        instrumentation = self.parent.instrumentation
+        self.period_histogram = instrumentation.histogram("loop period") if instrumentation else None
+        self.jitter_histogram = instrumentation.histogram("loop jitter") if instrumentation else None
+        self.work_histogram = instrumentation.histogram("loop work") if instrumentation else None
+        # Acquisition stages run in this thread; conversion is always the first one
+        self.pipeline = self.parent.pipeline
+        self.pipeline.add("convert", self.convert, ACQUISITION, required=True)
+
+    def convert(self, sample):
+        """Pipeline stage: raw Propar values to bar and valve %."""
+        sample.pressure = sample.filtered = self.propar_to_bar_func(sample.raw_pressure, self.capacity)
+        if sample.raw_min is not None:
+            sample.pressure_min = self.propar_to_bar_func(sample.raw_min, self.capacity)
+            sample.pressure_max = self.propar_to_bar_func(sample.raw_max, self.capacity)
+        else:
+            sample.pressure_min = sample.pressure_max = sample.pressure
+        if sample.raw_valve is not None:
+            sample.valve = calculate_valve_percentage(sample.raw_valve)
+
+    def read_block(self, first_raw, deadline, reads=None, first_at=None):
+        """
+        Oversampling: keeps reading the pressure until the end of the cycle.
+        Each read takes the lock on its own so GUI writes are never held up
+        by a whole block. Returns (mean, min, max, count) of the raw values;
+        'reads' receives the timestamped reads (see fill_block()).
+        """
+        return fill_block(self.block, self._read_pressure, first_raw, deadline,
+                          self.min_read_interval, lambda: self.stop, reads, first_at)
+
+    def _read_pressure(self):
+        self.last_cycle = time.monotonic()
+        self.mutex.lock()
+        try:
+            return self.instrument.readParameter(8)
+        finally:
+            self.mutex.unlock()
 
     def run(self):
         last_alarm_status = 0  # Track changes
+        last_loop_start = None
+        self.thread_ident = threading.get_ident()  # For stack sampling
+        profiled = None  # ProfilingSession this thread is attached to
         while not self.stop:
+            # Profiling on request (cProfile must be enabled from this thread)
+            session = self.parent.profiling_session
+            if session is not None and session is not profiled and session.active:
+                session.attach("acquisition")
+                profiled = session
+            elif profiled is not None and not profiled.active:
+                profiled.detach("acquisition")
+                profiled = None
+
             # 1. Mark the start time of this cycle
             loop_start_time = time.time()
+            self.last_cycle = time.monotonic()
+            if self.period_histogram is not None and last_loop_start is not None:
+                period = loop_start_time - last_loop_start
+                self.period_histogram.record(period)
+                self.jitter_histogram.record(abs(period - self.thread_sleep_time))
+            last_loop_start = loop_start_time
 
             try:
                 # ACQUIRE LOCK BEFORE READING
-                self.parent.instrument_mutex.lock()
+                self.mutex.lock()
 
                 try:
                     # --- Perform all reads ---
                     # This is the "Work" that causes latency (e.g., takes 0.05s)
                     alarm_status = self.instrument.readParameter(28)
                     raw_measure = self.instrument.readParameter(8)
+                    raw_measure_at = time.time()
                     valve1_output = self.instrument.readParameter(55)
                 finally:
-                    self.parent.instrument_mutex.unlock()
+                    self.mutex.unlock()
+                # A thread replaced while blocked in a read ends here, without emitting
+                if self.stop:
+                    break
                 # --- Offline Logic ---
                 # If critical read fails (None), device is disconnected.
                 if raw_measure is None:
-                    self.DEVICE_STATUS_UPDATE.emit('offline')
+                    self.report_offline()
                     # If offline, don't do drift calculation, just wait 1s and retry
                     time.sleep(1.0)
                     continue
 
                 # --- Status Logic ---
-                if alarm_status is not None:
-                    # DEBUG: Print only if status changes or is critical
-                    if alarm_status != last_alarm_status:
-                        log.debug(f" [ALARM CHANGE] Status Code: {alarm_status} (Binary: {bin(alarm_status)})")
-                        last_alarm_status = alarm_status
-
-                    if alarm_status & 1:
-                        self.DEVICE_STATUS_UPDATE.emit('Error')
-                    elif alarm_status & 2:
-                        self.DEVICE_STATUS_UPDATE.emit('Warning')
-                    else:
-                        self.DEVICE_STATUS_UPDATE.emit('Normal')
-
-                    if (alarm_status & 32) or (alarm_status & 8):
-                        self.CRITICAL_ALARM.emit(alarm_status)
-                # --- Emission Logic (Pressure) ---
-                # We use the current time as the timestamp for the graph
-                timestamp = time.time()
-                bar_measure = self.propar_to_bar_func(raw_measure, self.capacity)
-                self.MEAS.emit(timestamp, bar_measure)
-
-                # --- Emission Logic (Valve) ---
-                if valve1_output is not None:
-                    # Ensure the helper function is accessible here
-                    current_valve_value = calculate_valve_percentage(valve1_output)
-                    self.VALVE1_MEAS.emit(current_valve_value)
+                # DEBUG: Print only if status changes
+                if alarm_status is not None and alarm_status != last_alarm_status:
+                    log.debug(f" [ALARM CHANGE] Status Code: {alarm_status} (Binary: {bin(alarm_status)})")
+                    last_alarm_status = alarm_status
+                self.reported_offline = False
+
+                # --- Emission Logic ---
+                if self.oversample:
+                    # The trigger capture keeps the individual reads
+                    block_reads = [] if self.parent.capture is not None else None
+                    raw_mean, raw_min, raw_max, reads = self.read_block(
+                        raw_measure, loop_start_time + self.thread_sleep_time, block_reads, raw_measure_at)
+                    # The block average belongs to the middle of the block
+                    timestamp = (loop_start_time + time.time()) / 2.0
+                    sample = Sample(timestamp, None, alarm=alarm_status, setpoint=self.parent.last_known_setpoint,
+                                    raw_pressure=raw_mean, raw_valve=valve1_output,
+                                    reads=reads, raw_min=raw_min, raw_max=raw_max)
+                    sample.block_reads = block_reads
+                else:
+                    # We use the current time as the timestamp for the graph
+                    sample = Sample(time.time(), None, alarm=alarm_status, setpoint=self.parent.last_known_setpoint,
+                                    raw_pressure=raw_measure, raw_valve=valve1_output)
+                # Acquisition stages (convert, record, publish...), then one signal to the GUI thread
+                if self.pipeline.run(ACQUISITION, sample):
+                    sample.emitted_at = time.perf_counter()
+                    self.SAMPLE.emit(sample)
 
                 # --- SMART SLEEP (Drift Correction) ---
                 # 1. Calculate how long the read/emit process took
                 work_duration = time.time() - loop_start_time
+                if self.work_histogram is not None:
+                    self.work_histogram.record(work_duration)
                 # 4. PRINT IT (Temporary Debug)
                 # log.debug(f"Hardware IO took: {work_duration:.4f} seconds")
                 # 2. Calculate remaining time to match the configured thread_sleep_time
@@ -1608,19 +2342,30 @@ class THREADFlow(QtCore.QThread):
                     time.sleep(sleep_time)
 
             except Exception as e:
-                self.DEVICE_STATUS_UPDATE.emit('offline')
+                self.report_offline()
                 log.error(f"Error reading from instrument: {e}")
                 # On exception, wait a safe fixed amount before retrying
                 time.sleep(2.0)
 
         log.info('Measurement thread stopped.')
 
+    def report_offline(self):
+        if not self.reported_offline:
+            self.reported_offline = True
+            self.DEVICE_STATUS_UPDATE.emit('offline')
+
     def stopThread(self):
         self.stop = True
 
 
 if __name__ == '__main__':
-    appli = QApplication(sys.argv)
+    cli = argparse.ArgumentParser(description="LOA pressure control")
+    cli.add_argument("--profile", type=float, metavar="SECONDS",
+                     help="profile the acquisition thread and GUI for SECONDS after start-up")
+    cli.add_argument("--profile-mode", choices=["cprofile", "sampling"], default=None)
+    cli_args, qt_args = cli.parse_known_args()
+
+    appli = QApplication(sys.argv[:1] + qt_args)
     appli.setStyleSheet(qdarkstyle.load_stylesheet())
     #appli.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
 
@@ -1671,6 +2416,8 @@ if __name__ == '__main__':
     if main_window and main_window.connection_successful:
         log.info("Connection established. Starting application.")
         main_window.show()
+        if cli_args.profile:
+            main_window.start_profiling(duration_s=cli_args.profile, mode=cli_args.profile_mode)
         appli.exec_()
     else:
         log.info("No valid port selected. Exiting application.")
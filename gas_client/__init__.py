@@ -0,0 +1,8 @@
+"""
+Asyncio client library for GAS servers, with pooled connections.
+"""
+
+from .pool import ConnectionPool, GasTimeout
+from .client import GasNode, GasFleet, GasServerError
+
+__all__ = ["ConnectionPool", "GasTimeout", "GasNode", "GasFleet", "GasServerError"]
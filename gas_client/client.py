@@ -0,0 +1,108 @@
+"""
+Asyncio client for GAS servers (laplace-server protocol).
+"""
+
+# libraries
+import asyncio
+
+from laplace_server.protocol import make_get_request, make_set_request
+
+from .pool import ConnectionPool
+from .wire import decode_history, make_history_request
+
+
+class GasServerError(RuntimeError):
+    """The server answered with an error message."""
+
+
+class GasNode:
+    """
+    One gas line.
+
+        gas = GasNode("tcp://host:1122", name="GAS He")
+        await gas.set(2.5)
+        data = await gas.read()
+    """
+
+    def __init__(self, address, name="GAS", pool=None, sender="gas_client",
+                 timeout=2.0, retries=1, encoding=None):
+        self.address = address
+        self.encoding = encoding  # "msgpack" asks the server for compact replies
+        self.name = name
+        self.pool = pool or ConnectionPool()
+        self.sender = sender
+        self.timeout = float(timeout)
+        self.retries = max(0, int(retries))
+
+    async def _request(self, message):
+        for attempt in range(self.retries + 1):
+            try:
+                reply = await self.pool.request(self.address, message, timeout=self.timeout)
+                break
+            except TimeoutError:
+                if attempt == self.retries:
+                    raise
+        if reply.get("error_msg"):
+            raise GasServerError(f"{self.name}: {reply['error_msg']}")
+        return reply
+
+    async def set(self, value):
+        """Sends a setpoint (bar); returns the reply payload (queued / last applied)."""
+        reply = await self._request(make_set_request(self.sender, self.name, positions=[float(value)]))
+        return reply.get("payload", {})
+
+    async def read(self):
+        """Returns the server data (positions, stabilized, metrics, ...)."""
+        message = make_get_request(self.sender, self.name)
+        if self.encoding:
+            message["payload"]["encoding"] = self.encoding
+        reply = await self._request(message)
+        return reply.get("payload", {}).get("data", {})
+
+    async def pressure(self):
+        """Shortcut for the last measured pressure (bar)."""
+        positions = (await self.read()).get("positions") or [None]
+        return positions[0]
+
+    async def history(self, seconds=None, since=None):
+        """Recent trace as a (n, 3) array [t, pressure, setpoint]."""
+        reply = await self._request(make_history_request(self.sender, self.name, seconds=seconds, since=since,
+                                                         encoding=self.encoding))
+        return decode_history(reply)
+
+
+class GasFleet:
+    """
+    Several gas lines sharing one connection pool; operations fan out
+    concurrently so N lines cost about one round trip.
+    """
+
+    def __init__(self, nodes=None, pool=None, **node_kwargs):
+        self.pool = pool or ConnectionPool()
+        self.nodes = {}
+        for name, address in (nodes or {}).items():
+            self.add(name, address, **node_kwargs)
+
+    def add(self, name, address, **node_kwargs):
+        node = GasNode(address, name=name, pool=self.pool, **node_kwargs)
+        self.nodes[name] = node
+        return node
+
+    def __getitem__(self, name):
+        return self.nodes[name]
+
+    async def _gather(self, coroutines):
+        names = list(coroutines)
+        results = await asyncio.gather(*coroutines.values(), return_exceptions=True)
+        return dict(zip(names, results))
+
+    async def set_many(self, setpoints: dict):
+        """{name: bar} -> {name: reply payload or exception}."""
+        return await self._gather({name: self.nodes[name].set(value) for name, value in setpoints.items()})
+
+    async def read_all(self):
+        """{name: data or exception} for every node."""
+        return await self._gather({name: node.read() for name, node in self.nodes.items()})
+
+    def close(self):
+        self.pool.close()
@@ -0,0 +1,78 @@
+"""
+Pool of asyncio ZeroMQ REQ sockets, per server address.
+"""
+
+# libraries
+import asyncio
+from collections import defaultdict
+
+import zmq
+import zmq.asyncio
+
+from .wire import decode_reply
+
+
+class GasTimeout(TimeoutError):
+    """No reply from a GAS server within the timeout."""
+
+
+class ConnectionPool:
+    """
+    Keeps idle REQ sockets per address so requests reuse connections.
+
+    A REQ socket whose reply never came is stuck in the REQ/REP lockstep
+    (it cannot send again), so it is closed instead of being returned to the
+    pool and the next request gets a fresh one.
+    """
+
+    def __init__(self, max_per_address=4, context=None):
+        self.max_per_address = max(1, int(max_per_address))
+        self.context = context or zmq.asyncio.Context.instance()
+        self._idle = defaultdict(list)
+        self._open = defaultdict(int)
+        self._slots = {}  # address -> Semaphore bounding concurrent sockets
+
+    def _slot(self, address):
+        if address not in self._slots:
+            self._slots[address] = asyncio.Semaphore(self.max_per_address)
+        return self._slots[address]
+
+    def _new_socket(self, address):
+        socket = self.context.socket(zmq.REQ)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(address)
+        self._open[address] += 1
+        return socket
+
+    def _discard(self, address, socket):
+        socket.close(0)
+        self._open[address] -= 1
+
+    async def request(self, address, message, timeout=2.0):
+        """Sends one JSON message and returns the decoded reply (JSON or msgpack)."""
+        async with self._slot(address):
+            idle = self._idle[address]
+            socket = idle.pop() if idle else self._new_socket(address)
+            try:
+                await socket.send_json(message)
+                if not await socket.poll(int(timeout * 1000), zmq.POLLIN):
+                    raise GasTimeout(f"No reply from {address} within {timeout} s")
+                reply = decode_reply(await socket.recv())
+            except BaseException:
+                # Lockstep is broken (or the task was cancelled): drop the socket
+                self._discard(address, socket)
+                raise
+            idle.append(socket)
+            return reply
+
+    def open_sockets(self, address=None):
+        """Number of open sockets (for one address or in total)."""
+        if address is not None:
+            return self._open[address]
+        return sum(self._open.values())
+
+    def close(self):
+        for address, sockets in self._idle.items():
+            for socket in sockets:
+                self._discard(address, socket)
+            sockets.clear()
@@ -0,0 +1,60 @@
+"""
+Wire format helpers shared by the client and the GAS server: HISTORY
+requests and replies, and replies that may be JSON or msgpack.
+"""
+
+# libraries
+import base64
+import json
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency: JSON only
+    msgpack = None
+
+from laplace_server.protocol import make_message
+
+CMD_HISTORY = "HISTORY"
+
+# Columns of a HISTORY reply
+HISTORY_FIELDS = ("t", "pressure", "setpoint")
+
+
+def make_history_request(sender: str, target: str, *, seconds=None, since=None, max_points=None,
+                         encoding=None):
+    """
+    Builds a HISTORY request: either the last 'seconds' of data or every
+    sample with timestamp >= 'since' (seconds since epoch).
+    With encoding="msgpack" the reply is a msgpack message carrying raw bytes.
+    """
+    payload = {}
+    if encoding is not None:
+        payload["encoding"] = encoding
+    if seconds is not None:
+        payload["seconds"] = float(seconds)
+    if since is not None:
+        payload["since"] = float(since)
+    if max_points is not None:
+        payload["max_points"] = int(max_points)
+    return make_message(cmd=CMD_HISTORY, sender=sender, target=target,
+                        payload=payload, msg="History request.")
+
+
+def decode_history(reply: dict):
+    """Returns the (n, 3) float64 array [t, pressure, setpoint] of a HISTORY reply."""
+    payload = reply.get("payload", {})
+    raw = payload.get("data", "")
+    if isinstance(raw, str):
+        raw = base64.b64decode(raw)
+    return np.frombuffer(raw, dtype=payload.get("dtype", "<f8")).reshape(-1, len(payload.get("fields", HISTORY_FIELDS)))
+
+
+def decode_reply(data: bytes):
+    """Decodes a REP reply without knowing its encoding (JSON starts with '{')."""
+    if data[:1] == b"{":
+        return json.loads(data)
+    if msgpack is None:
+        raise RuntimeError("msgpack payload received but msgpack is not installed.")
+    return msgpack.unpackb(data, raw=False)
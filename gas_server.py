@@ -0,0 +1,34 @@
+"""
+GAS server.
+ServerLHC with the extension points the application needs. ServerLHC has
+no public API to add or replace a command handler, or to swap the data dict
+without its JSON debug dump: this is the only module relying on its
+internals, so a change of the library breaks here only.
+"""
+
+# libraries
+from laplace_server.server_lhc import ServerLHC
+
+
+class GasServer(ServerLHC):
+    """ServerLHC with 'register_command()', 'swap_data()' and 'encode_data()'."""
+
+    def register_command(self, cmd: str, handler) -> None:
+        """
+        Adds the handler of 'cmd', or replaces the default one.
+        The handler is called as handler(server, message, target) and must
+        send exactly one reply on 'server.socket'.
+        """
+        self._handlers[cmd] = handler
+        if cmd not in self.capabilities:
+            self.capabilities.append(cmd)
+
+    def swap_data(self, new_data: dict) -> None:
+        """Like 'set_data()', without the JSON dump: 'new_data' must not be modified while it is in use."""
+        with self._data_lock:
+            self._data = new_data
+
+    def encode_data(self, encode_func):
+        """Returns encode_func(data), called while holding the data lock."""
+        with self._data_lock:
+            return encode_func(self._data)
@@ -0,0 +1,94 @@
+"""
+GUI event-loop watchdog.
+A QTimer heartbeat measures how late the Qt event loop runs; a separate
+thread notices when the heartbeat stops and logs the GUI thread stack
+while it is still blocked, so freezes in the field come with evidence.
+"""
+
+# libraries
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from PyQt6.QtCore import QObject, QTimer
+
+log = logging.getLogger("laplace.gas")
+
+
+class GuiWatchdog(QObject):
+    """
+    Create and start from the GUI thread.
+
+    - 'gui lag' histogram: lateness of every heartbeat (event-loop latency).
+    - 'gui stall' histogram: length of every stall above 'stall_threshold_ms'.
+    A stall is logged twice: when detected (with the GUI thread stack at that
+    moment) and when the loop resumes (with its total length).
+    """
+
+    def __init__(self, instrumentation=None, heartbeat_ms=50, stall_threshold_ms=500, parent=None):
+        super().__init__(parent)
+        self.heartbeat_s = heartbeat_ms / 1000.0
+        self.stall_threshold_s = stall_threshold_ms / 1000.0
+        self.lag_histogram = instrumentation.histogram("gui lag") if instrumentation else None
+        self.stall_histogram = instrumentation.histogram("gui stall") if instrumentation else None
+
+        self.stalls = 0
+        self.max_stall_s = 0.0
+        self.max_lag_s = 0.0
+        self._gui_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._reported_beat = None  # Heartbeat time of the stall already logged
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._beat)
+        self._running = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="gui-watchdog", daemon=True)
+
+    def start(self):
+        self._last_beat = time.perf_counter()
+        self.timer.start(int(self.heartbeat_s * 1000))
+        self._running.set()
+        self._thread.start()
+        log.info(f"GUI watchdog on (stall threshold {self.stall_threshold_s * 1000:.0f} ms).")
+
+    def stop(self):
+        self.timer.stop()
+        self._running.clear()
+
+    # --- GUI thread ---
+    def _beat(self):
+        now = time.perf_counter()
+        gap = now - self._last_beat
+        self._last_beat = now
+        lag = max(0.0, gap - self.heartbeat_s)
+        if lag > self.max_lag_s:
+            self.max_lag_s = lag
+        if self.lag_histogram is not None:
+            self.lag_histogram.record(lag)
+        if gap >= self.stall_threshold_s:
+            self.stalls += 1
+            self.max_stall_s = max(self.max_stall_s, gap)
+            if self.stall_histogram is not None:
+                self.stall_histogram.record(gap)
+            log.warning(f"GUI stall: event loop blocked for {gap * 1000:.0f} ms "
+                        f"({self.stalls} stalls, max {self.max_stall_s * 1000:.0f} ms).")
+
+    # --- Watchdog thread ---
+    def _watch(self):
+        check_s = min(self.stall_threshold_s / 4.0, 0.1)
+        while self._running.is_set():
+            time.sleep(check_s)
+            last_beat = self._last_beat
+            blocked_s = time.perf_counter() - last_beat
+            if blocked_s >= self.stall_threshold_s and self._reported_beat != last_beat:
+                # Once per stall, while the GUI thread is still stuck
+                self._reported_beat = last_beat
+                frame = sys._current_frames().get(self._gui_ident)
+                stack = "".join(traceback.format_stack(frame)) if frame is not None else "(no frame)"
+                log.warning(f"GUI thread blocked for {blocked_s * 1000:.0f} ms, stack:\n{stack}")
+
+    def summary(self):
+        return (f"GUI stalls: {self.stalls} (max {self.max_stall_s * 1000:.0f} ms), "
+                f"max event-loop lag {self.max_lag_s * 1000:.0f} ms")
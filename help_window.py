@@ -290,9 +290,12 @@ class HelpWindow(QDialog):
            <li><span class="param">purge_shut_delay_timeout:</span> The <b>maximum duration</b> (seconds) the system will 
            attempt to reach the purge target pressure. If the target is reached sooner, the valves close immediately; 
            otherwise, the system forces a shutdown once this timer expires.</li>
+            <li><span class="param">purge_tolerance:</span> Distance (bar) to the purge target at which the target counts as reached. Checked on every reading, the valve is closed from the measurement thread, also while a message box is open.</li>
+            <li><span class="param">purge_hold_s:</span> Time (seconds) the pressure must stay within the purge tolerance before the valve closes (0 = on the first reading).</li>
             <li><span class="param">set_point_above_safety_enable:</span> Master switch for the Deviation Alarm (1 = On, 0 = Off).</li>
             <li><span class="param">set_point_above_tolerance:</span> The allowed deviation (in bar) above the current setpoint. If <i>Measure > Setpoint + Upper Tolerance</i>, the alarm triggers. Tolerance below the setpoint is ignored.</li>
             <li><span class="param">set_point_above_delay:</span> Duration (seconds) the high pressure must persist before the safety shutdown is triggered.</li>
+            <li><span class="param">software_monitor:</span> 1 to also check the deviation in the measurement thread on every reading. On a trip the safe setpoint is sent to the device immediately, without waiting for the device alarm or the interface; the purge sequence and the message follow. Response times appear in <b>TIMING</b> (<i>safety response</i>).</li>
            <li><span class="param">set_point_lower_cooldown_delay:</span> The duration (seconds) of the safety grace period. 
            The alarm is deactivated for this interval when lowering the setpoint or purging; if the pressure remains larger than <b>Target Setpoint</b> + Tolerance after this time, 
            the grace period <b>extends automatically</b> until safe.</li>
@@ -306,6 +309,8 @@ class HelpWindow(QDialog):
         <h3>[Thread]</h3>
         <ul>
             <li><span class="param">thread_sleep_time:</span> The interval (seconds) between measurement updates. <span class="note">(Min recommended: 0.05s)</span>.</li>
+            <li><span class="param">oversample:</span> 1 to read the pressure continuously during each interval and display/publish the block average (min and max are sent to the server). Less noise without more GUI or network traffic.</li>
+            <li><span class="param">oversample_min_interval:</span> Minimum time (seconds) between two oversampling reads. 0 reads at the maximum bus rate.</li>
         </ul>
         
         <h3>[Plotting]</h3>
@@ -326,6 +331,104 @@ class HelpWindow(QDialog):
         <h3>[UI]</h3>
         <ul>
             <li><span class="param">window_title:</span> The text displayed in the main application window title bar.</li>
+            <li><span class="param">log_level:</span> Lowest level shown in the log panel (debug, info, warning, error). The log file always keeps debug messages.</li>
+            <li><span class="param">log_lines:</span> Number of lines kept in the log panel; older lines are removed.</li>
+            <li><span class="param">log_refresh_ms:</span> The log panel is updated in one batch at this interval (milliseconds).</li>
+        </ul>
+        
+        <h3>[Metrics]</h3>
+        <p>Control quality figures shown in the status bar and sent to the server (regulation time only).</p>
+        <ul>
+            <li><span class="param">window_s:</span> Rolling window (seconds) for the integral absolute/squared error and the time-in-band percentage.</li>
+            <li><span class="param">band_tolerance:</span> Band (bar) around the setpoint counted as "in tolerance". The tracking lag is the time needed to enter this band after a setpoint change.</li>
+        </ul>
+        
+        <h3>[Stability]</h3>
+        <p>Rolling-window detector reported to the master as the <i>stabilized</i> flag (with the time stability was reached).</p>
+        <ul>
+            <li><span class="param">window_s:</span> Duration (seconds) the pressure must stay settled after a setpoint change.</li>
+            <li><span class="param">relative_tolerance / absolute_tolerance:</span> Allowed deviation of the window mean and standard deviation; the larger of <i>relative x setpoint</i> and <i>absolute</i> (bar) is used.</li>
+            <li><span class="param">max_slope:</span> Maximum drift (bar/s) of the window, from a least-squares fit.</li>
+        </ul>
+        
+        <h3>[Stream]</h3>
+        <p>Optional push of every measurement to remote masters (ZeroMQ PUB/SUB), in addition to the GET server.</p>
+        <ul>
+            <li><span class="param">enable:</span> 1 = publish the sample stream, 0 = off.</li>
+            <li><span class="param">port:</span> TCP port of the PUB socket (must differ from the [Server] port).</li>
+            <li><span class="param">max_batch:</span> Maximum number of samples grouped in one frame when the rate is high. Frames carry a sequence number so subscribers can detect gaps.</li>
+            <li><span class="param">encoding:</span> <i>json</i> or <i>msgpack</i> (compact binary, requires the optional msgpack package).</li>
+        </ul>
+        
+        <h3>[Remote]</h3>
+        <p>Protection of the device bus against masters sending bursts of setpoints.</p>
+        <ul>
+            <li><span class="param">coalesce_window_ms:</span> Remote setpoints received within this window are merged; only the latest one is applied.</li>
+            <li><span class="param">max_write_rate_hz:</span> Maximum number of remote setpoint writes per second. The SET reply and the GET data report the last value actually applied and when.</li>
+        </ul>
+
+        <h3>[Filter]</h3>
+        <p>Rejects single bad readings (serial glitches) with a running median (Hampel) filter.</p>
+        <ul>
+            <li><span class="param">enable:</span> 1 to filter the pressure used to decide that it is safe (purge target reached, alarm re-arm after a cooldown) and by the stability detection. Over-pressure safety trips (software monitor), recorded and published data use the raw reading. The filter window restarts on setpoint changes and when the device comes back online.</li>
+            <li><span class="param">window:</span> Number of samples in the median window.</li>
+            <li><span class="param">n_sigmas:</span> A reading is replaced by the median when it is further than n_sigmas robust standard deviations (1.4826 &times; MAD) from it.</li>
+            <li><span class="param">min_deviation:</span> Smallest deviation (bar) that can be rejected, so normal steps of a steady signal are kept.</li>
+            <li><span class="param">apply_to_display:</span> 1 to also show the filtered value on the display and plot.</li>
+        </ul>
+
+        <h3>[Instrumentation]</h3>
+        <ul>
+            <li><span class="param">enable:</span> 1 to record latency histograms: every device read/write per parameter, instrument lock wait and hold times, acquisition loop period, jitter and work time, and the delay between the measurement thread and the GUI. Shown in the admin panel (<b>TIMING</b>).</li>
+            <li><span class="param">dump_on_exit:</span> 1 to write the statistics (JSON) to the log folder when the application closes.</li>
+        </ul>
+
+        <h3>[Prometheus]</h3>
+        <ul>
+            <li><span class="param">enable:</span> 1 to serve metrics at <i>http://host:port/metrics</i>: pressure, setpoint, valve, status bits, alarm/purge/reconnect counters and the timing histograms. Answered from memory, never from the device.</li>
+            <li><span class="param">host:</span> Listening address. <i>127.0.0.1</i> for local scrapes only, <i>0.0.0.0</i> for all network interfaces.</li>
+            <li><span class="param">port:</span> HTTP port of the endpoint.</li>
+        </ul>
+
+        <h3>[Profiling]</h3>
+        <p>Started at runtime with the <b>PROFILE</b> button of the admin panel, or at start-up with <i>--profile SECONDS</i>. Reports are written to the log folder.</p>
+        <ul>
+            <li><span class="param">mode:</span> <i>cprofile</i> (call counts and times of the measurement thread and the GUI) or <i>sampling</i> (stack samples, lower overhead, flame graph input).</li>
+            <li><span class="param">duration_s:</span> Length of the profiling window in seconds.</li>
+            <li><span class="param">tracemalloc_interval_s:</span> Interval between memory snapshots; the report lists the largest allocation growths. 0 disables it.</li>
+            <li><span class="param">top:</span> Number of entries in each report.</li>
+        </ul>
+
+        <h3>[Watchdog]</h3>
+        <ul>
+            <li><span class="param">enable:</span> 1 to measure the GUI event-loop latency continuously. When the interface freezes longer than the threshold, the stack of the GUI thread is written to the log while it is still blocked, then the stall length. Counts and durations appear in <b>TIMING</b> (<i>gui lag</i>, <i>gui stall</i>).</li>
+            <li><span class="param">heartbeat_ms:</span> Heartbeat interval of the measurement (milliseconds).</li>
+            <li><span class="param">stall_threshold_ms:</span> Blocking time (milliseconds) reported as a stall.</li>
+        </ul>
+
+        <h3>[Supervisor]</h3>
+        <ul>
+            <li><span class="param">enable:</span> 1 to supervise the measurement thread. Without a new reading the pressure turns orange and the server payload reports <i>stale</i> (with <i>sampleAge</i> in seconds); a purge is then only ended by its timeout. A thread blocked in a device call is replaced and the serial port reopened. Recovery times appear in <b>TIMING</b> (<i>acquisition recovery</i>).</li>
+            <li><span class="param">stale_periods:</span> Number of missed thread periods after which the data is stale.</li>
+            <li><span class="param">restart_after_s:</span> Seconds without a measurement loop before the thread is restarted (keep above 2 s, the retry delay after a read error).</li>
+            <li><span class="param">max_restart_interval_s:</span> Upper limit of the delay between restarts, doubled after each restart that did not recover.</li>
+            <li><span class="param">gui_lock_timeout_ms:</span> Longest wait of a command from the window (setpoint, valve, purge, admin) for the device while a reading is in progress. After that the command is not sent, the status bar says so and the event journal records <i>device_busy</i>.</li>
+        </ul>
+
+        <h3>[Capture]</h3>
+        <ul>
+            <li><span class="param">enable:</span> 1 to keep the last readings in memory and save them, with the readings that follow, to a <i>capture_*.csv</i> file in the log folder when an event occurs (pressure, min/max, setpoint, valve, status word). <b>CAPTURE</b> in the admin panel starts one manually. With <i>[Thread] oversample</i>, each read of a block is saved on its own row, with its own time stamp, instead of the block average.</li>
+            <li><span class="param">pre_s:</span> Seconds saved before the event.</li>
+            <li><span class="param">post_s:</span> Seconds saved after the event, read at the raised rate.</li>
+            <li><span class="param">fast_period_s:</span> Thread period (seconds) during the post-event window.</li>
+            <li><span class="param">on_alarm:</span> 1 to capture on a critical alarm (device or software monitor).</li>
+            <li><span class="param">on_purge:</span> 1 to capture when a purge starts.</li>
+        </ul>
+
+        <h3>[Journal]</h3>
+        <ul>
+            <li><span class="param">enable:</span> 1 to record alarms, purges (with duration and peak pressure), valve modes, setpoints (interface, remote, purge), PID writes and connection changes in an SQLite event journal. Query it with <i>python event_journal.py PATH --type purge_end --since 7d</i> (or <i>--summary</i>).</li>
+            <li><span class="param">path:</span> Journal file. Empty: <i>events.sqlite</i> in the log folder, next to the daily folders.</li>
         </ul>
         
         """
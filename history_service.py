@@ -0,0 +1,75 @@
+"""
+HISTORY command for the GAS server.
+Lets a master backfill the recent pressure trace in one request, answered
+from the acquisition ring buffer as a packed float64 array.
+"""
+
+# libraries
+import base64
+import logging
+
+import numpy as np
+
+from laplace_server.protocol import make_message, make_error
+from codec import ENCODING_MSGPACK, encode, negotiate
+from gas_client.wire import CMD_HISTORY
+from sample_buffer import SAMPLE_FIELDS
+
+log = logging.getLogger("laplace.gas")
+
+# Upper bound on the rows sent in one reply
+MAX_HISTORY_POINTS = 200000
+
+
+def pack_rows(rows):
+    """Encodes (n, 3) float64 rows as little-endian bytes in base64."""
+    return base64.b64encode(np.ascontiguousarray(rows, dtype="<f8").tobytes()).decode("ascii")
+
+
+def make_history_handler(buffer):
+    """Returns a ServerLHC command handler answering HISTORY from 'buffer'."""
+
+    def handle_history(server, message: dict, target: str) -> None:
+        log.debug(f"[Server {server.name}] Received: '{CMD_HISTORY}' from '{target}'.")
+        payload = message.get("payload") or {}
+        try:
+            max_points = min(int(payload.get("max_points", MAX_HISTORY_POINTS)), MAX_HISTORY_POINTS)
+            if "since" in payload:
+                rows = buffer.since(float(payload["since"]), max_points=max_points)
+            elif "seconds" in payload:
+                rows = buffer.last_seconds(float(payload["seconds"]), max_points=max_points)
+            else:
+                raise ValueError("Payload must contain 'seconds' or 'since'.")
+        except (TypeError, ValueError) as e:
+            server.socket.send_json(
+                make_error(sender=server.name, target=target, cmd=CMD_HISTORY, error_msg=str(e))
+            )
+            return
+
+        encoding = negotiate(payload.get("encoding"))
+        if encoding == ENCODING_MSGPACK:
+            data = np.ascontiguousarray(rows, dtype="<f8").tobytes()  # Raw bytes, no base64
+        else:
+            data = pack_rows(rows)
+        reply = make_message(
+            cmd=CMD_HISTORY,
+            sender=server.name,
+            target=target,
+            payload={
+                "fields": list(SAMPLE_FIELDS),
+                "unit": "bar",
+                "count": int(len(rows)),
+                "dtype": "<f8",
+                "encoding": encoding,
+                "data": data,
+            },
+            msg="History sent."
+        )
+        server.socket.send(encode(reply, encoding))
+
+    return handle_history
+
+
+def register_history_command(server, buffer):
+    """Adds the HISTORY command to a GasServer."""
+    server.register_command(CMD_HISTORY, make_history_handler(buffer))
@@ -0,0 +1,186 @@
+"""
+Hot-path instrumentation.
+Latency histograms with fixed buckets for propar reads/writes, instrument
+mutex wait/hold, acquisition loop period/jitter and signal delivery delay.
+Recording a value only increments counters: nothing is allocated per sample.
+"""
+
+# libraries
+import json
+import logging
+import time
+from bisect import bisect_left
+
+from PyQt6.QtCore import QMutex
+
+log = logging.getLogger("laplace.gas")
+
+
+def _default_bounds():
+    # 1 us .. 10 s, 4 buckets per decade
+    return [10 ** (exp / 4.0) for exp in range(-24, 5)]
+
+
+class LatencyHistogram:
+    """
+    Counts durations (seconds) in pre-allocated buckets.
+
+    Bucket i counts values <= bounds[i] (and above bounds[i-1]); the last
+    bucket counts everything larger. Percentiles are read from the buckets,
+    so they are accurate to one bucket (~78 % steps).
+    """
+    __slots__ = ("name", "bounds", "counts", "count", "total", "max")
+
+    def __init__(self, name, bounds=None):
+        self.name = name
+        self.bounds = bounds or _default_bounds()
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.reset()
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        # Increments are not atomic across threads; a rare lost count is acceptable here
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (seconds)."""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(1000.0 * self.mean, 4),
+            "p50_ms": round(1000.0 * self.percentile(50), 4),
+            "p95_ms": round(1000.0 * self.percentile(95), 4),
+            "p99_ms": round(1000.0 * self.percentile(99), 4),
+            "max_ms": round(1000.0 * self.max, 4),
+        }
+
+
+class Instrumentation:
+    """Named histograms of one application."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.started = time.time()
+
+    def histogram(self, name):
+        """Returns the histogram 'name', created on first use (keep the reference in hot paths)."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram(name)
+        return histogram
+
+    def reset(self):
+        for histogram in list(self.histograms.values()):
+            histogram.reset()
+        self.started = time.time()
+
+    def snapshot(self):
+        return {name: h.summary() for name, h in sorted(self.histograms.items())}
+
+    def report(self):
+        """Summary table as text (admin panel, log)."""
+        lines = [f"Since {time.strftime('%H:%M:%S', time.localtime(self.started))}",
+                 f"{'name':<22} {'count':>8} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}  (ms)"]
+        for name, s in self.snapshot().items():
+            lines.append(f"{name:<22} {s['count']:>8} {s['mean_ms']:>9.3f} {s['p50_ms']:>9.3f} "
+                         f"{s['p95_ms']:>9.3f} {s['p99_ms']:>9.3f} {s['max_ms']:>9.3f}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Writes the summaries and the raw bucket counts as JSON."""
+        data = {
+            "started": self.started,
+            "dumped": time.time(),
+            "summary": self.snapshot(),
+            "buckets_s": _default_bounds(),
+            "counts": {name: list(h.counts) for name, h in sorted(self.histograms.items())},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        log.info(f"Timing statistics written to {path}")
+        return path
+
+
+class InstrumentedInstrument:
+    """Times every readParameter/writeParameter of a propar instrument, per parameter."""
+
+    def __init__(self, instrument, instrumentation):
+        self._instrument = instrument
+        self._instrumentation = instrumentation
+        self._reads = {}
+        self._writes = {}
+
+    def readParameter(self, dde_nr, *args, **kwargs):
+        histogram = self._reads.get(dde_nr)
+        if histogram is None:
+            histogram = self._reads[dde_nr] = self._instrumentation.histogram(f"read p{dde_nr}")
+        started = time.perf_counter()
+        try:
+            return self._instrument.readParameter(dde_nr, *args, **kwargs)
+        finally:
+            histogram.record(time.perf_counter() - started)
+
+    def writeParameter(self, dde_nr, *args, **kwargs):
+        histogram = self._writes.get(dde_nr)
+        if histogram is None:
+            histogram = self._writes[dde_nr] = self._instrumentation.histogram(f"write p{dde_nr}")
+        started = time.perf_counter()
+        try:
+            return self._instrument.writeParameter(dde_nr, *args, **kwargs)
+        finally:
+            histogram.record(time.perf_counter() - started)
+
+    def __getattr__(self, name):
+        # Everything else (master, other propar calls) goes to the real instrument
+        return getattr(self._instrument, name)
+
+
+class TimedMutex(QMutex):
+    """QMutex recording how long callers wait for it and how long they hold it."""
+
+    def __init__(self, instrumentation):
+        super().__init__()
+        self._wait = instrumentation.histogram("mutex wait")
+        self._hold = instrumentation.histogram("mutex hold")
+        self._acquired_at = 0.0
+
+    def lock(self):
+        started = time.perf_counter()
+        super().lock()
+        # Only the holder writes this until unlock()
+        self._acquired_at = time.perf_counter()
+        self._wait.record(self._acquired_at - started)
+
+    def tryLock(self, *args):
+        acquired = super().tryLock(*args)
+        if acquired:
+            self._acquired_at = time.perf_counter()
+        return acquired
+
+    def unlock(self):
+        self._hold.record(time.perf_counter() - self._acquired_at)
+        super().unlock()
@@ -0,0 +1,60 @@
+"""
+Queue-based logging.
+The root handlers (log file, console) are moved behind a QueueListener: a
+logging call only formats the record and puts it on a bounded queue, the
+file and console writes happen in the listener thread.
+"""
+
+# libraries
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+QUEUE_SIZE = 100000
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Drops (and counts) records when the queue is full instead of blocking or raising."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogQueue:
+    """Owns the queue handler on the root logger and the listener thread."""
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.handler = BoundedQueueHandler(self.queue)
+        self.listener = None
+
+    def start(self, logger=None):
+        """Moves the current handlers of 'logger' (root) to the listener thread."""
+        logger = logger or logging.getLogger()
+        handlers = [h for h in logger.handlers if not isinstance(h, QueueHandler)]
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(self.handler)
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop)  # Writes what is still queued
+        return self
+
+    def add_handler(self, handler):
+        """Adds a handler run by the listener thread (e.g. the GUI log view)."""
+        self.listener.handlers = self.listener.handlers + (handler,)
+
+    def remove_handler(self, handler):
+        self.listener.handlers = tuple(h for h in self.listener.handlers if h is not handler)
+
+    def stop(self):
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
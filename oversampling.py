@@ -0,0 +1,76 @@
+"""
+Oversampling support for the acquisition thread.
+Pressure is read as fast as the bus allows within a cycle and reduced to
+one block (mean, min, max) per emitted sample.
+"""
+
+# libraries
+import time
+
+
+class BlockStats:
+    """Running mean/min/max of the raw reads of one block."""
+    __slots__ = ("count", "total", "low", "high")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.low = None
+        self.high = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if self.low is None or value < self.low:
+            self.low = value
+        if self.high is None or value > self.high:
+            self.high = value
+
+    def take(self):
+        """Returns (mean, min, max, count) of the block and starts a new one."""
+        if not self.count:
+            return None, None, None, 0
+        result = (self.total / self.count, self.low, self.high, self.count)
+        self.reset()
+        return result
+
+
+def fill_block(block, read, first_raw, deadline, min_read_interval=0.0, stopped=lambda: False,
+               reads=None, first_at=None):
+    """
+    Adds 'first_raw' and the values returned by 'read()' (None is skipped)
+    to 'block' until the next read would end after 'deadline' (time.time()),
+    then returns block.take(). If a read raises, the block is reset so its
+    values do not end up in the next one.
+
+    If 'reads' is a list, (time, value) of every value of the block is
+    appended to it, read at the middle of the read ('first_raw' at 'first_at');
+    it is cleared with the block on a failed read.
+    """
+    block.add(first_raw)
+    if reads is not None:
+        reads.append((time.time() if first_at is None else first_at, first_raw))
+    read_duration = 0.0
+    try:
+        while not stopped():
+            # Stop when the next read would overrun the cycle
+            if time.time() + max(read_duration, min_read_interval) > deadline:
+                break
+            read_start = time.time()
+            raw = read()
+            read_duration = time.time() - read_start
+            if raw is not None:
+                block.add(raw)
+                if reads is not None:
+                    reads.append((read_start + read_duration / 2.0, raw))
+            if min_read_interval > read_duration:
+                time.sleep(min_read_interval - read_duration)
+    except BaseException:
+        block.reset()
+        if reads is not None:
+            reads.clear()
+        raise
+    return block.take()
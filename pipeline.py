@@ -0,0 +1,116 @@
+"""
+Sample pipeline.
+Every acquisition sample flows through registered stages, in order. Each
+stage declares where it runs: in the acquisition thread (convert, filter,
+detect, record, publish: must be short) or in the consumer (GUI) thread
+(display, metrics, server, plot). Every stage is timed.
+"""
+
+# libraries
+import logging
+import threading
+import time
+
+log = logging.getLogger("laplace.gas")
+
+ACQUISITION = "acquisition"
+CONSUMER = "consumer"
+
+
+class Stage:
+    """One registered step of the pipeline and its timing counters."""
+    __slots__ = ("name", "func", "where", "required", "calls", "errors", "total_s", "max_s")
+
+    def __init__(self, name, func, where, required=False):
+        self.name = name
+        self.func = func
+        self.where = where
+        self.required = required  # An error in a required stage drops the sample
+        self.calls = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+
+class SamplePipeline:
+    """
+    Ordered stages run on each Sample.
+
+    'func(sample)' may fill or change the sample; returning False stops the
+    pipeline for that sample (e.g. a filter dropping it). Stages can be added
+    or removed at any time from any thread: the stage lists are replaced, never
+    modified in place, so a running pass is not disturbed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {ACQUISITION: (), CONSUMER: ()}
+
+    def add(self, name, func, where=CONSUMER, before=None, required=False):
+        """
+        Registers a stage, at the end or before the stage named 'before'.
+        A stage with the same name is replaced in place.
+        """
+        if where not in self._stages:
+            raise ValueError(f"Unknown pipeline side '{where}'.")
+        stage = Stage(name, func, where, required)
+        with self._lock:
+            stages = list(self._stages[where])
+            names = [s.name for s in stages]
+            if name in names:
+                stages[names.index(name)] = stage
+            else:
+                stages.insert(names.index(before) if before in names else len(stages), stage)
+            self._stages[where] = tuple(stages)
+        return stage
+
+    def remove(self, name):
+        with self._lock:
+            for where, stages in self._stages.items():
+                self._stages[where] = tuple(s for s in stages if s.name != name)
+
+    def stages(self, where=None):
+        if where is not None:
+            return self._stages[where]
+        return self._stages[ACQUISITION] + self._stages[CONSUMER]
+
+    def run(self, where, sample):
+        """Runs the stages of one side on 'sample'. Returns False if it was dropped."""
+        for stage in self._stages[where]:
+            started = time.perf_counter()
+            try:
+                result = stage.func(sample)
+            except Exception as e:
+                result = not stage.required
+                stage.errors += 1
+                if stage.errors == 1 or stage.errors % 1000 == 0:
+                    log.error(f"Pipeline stage '{stage.name}' failed ({stage.errors} errors): {e}")
+            elapsed = time.perf_counter() - started
+            stage.calls += 1
+            stage.total_s += elapsed
+            if elapsed > stage.max_s:
+                stage.max_s = elapsed
+            if result is False:
+                return False
+        return True
+
+    def timings(self):
+        """{stage name: {"where", "calls", "errors", "mean_ms", "max_ms"}}."""
+        return {
+            s.name: {
+                "where": s.where,
+                "calls": s.calls,
+                "errors": s.errors,
+                "mean_ms": round(1000.0 * s.total_s / s.calls, 4) if s.calls else 0.0,
+                "max_ms": round(1000.0 * s.max_s, 4),
+            }
+            for s in self.stages()
+        }
+
+    def report(self):
+        """Timing table as text (for the log)."""
+        lines = [f"{'stage':<14} {'side':<12} {'calls':>8} {'mean ms':>9} {'max ms':>9} {'errors':>7}"]
+        for name, t in self.timings().items():
+            lines.append(f"{name:<14} {t['where']:<12} {t['calls']:>8} {t['mean_ms']:>9.3f} "
+                         f"{t['max_ms']:>9.3f} {t['errors']:>7}")
+        return "\n".join(lines)
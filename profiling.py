@@ -0,0 +1,194 @@
+"""
+Opt-in profiling of a running station.
+A session profiles the acquisition thread and the GUI event loop for a
+bounded time, either with cProfile or by sampling the thread stacks, and
+takes tracemalloc snapshots at intervals. Reports go to the log folder.
+"""
+
+# libraries
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+log = logging.getLogger("laplace.gas")
+
+MODE_CPROFILE = "cprofile"
+MODE_SAMPLING = "sampling"
+
+
+class ProfilingSession(threading.Thread):
+    """
+    One bounded profiling window.
+
+    cProfile only sees the thread it was enabled in, so each profiled thread
+    calls 'attach(name)' itself and 'detach(name)' when 'active' turns False;
+    the session waits for the detaches before writing the reports.
+    In sampling mode the session thread reads the stacks of the registered
+    threads ('watch(name, ident)') every 'sample_interval_s', which has no
+    cost in the profiled threads.
+    """
+
+    def __init__(self, folder, duration_s=30.0, mode=MODE_CPROFILE, tracemalloc_interval_s=10.0,
+                 top=40, sample_interval_s=0.005):
+        super().__init__(daemon=True, name="profiling")
+        self.folder = folder
+        self.duration_s = float(duration_s)
+        self.mode = mode if mode in (MODE_CPROFILE, MODE_SAMPLING) else MODE_CPROFILE
+        self.tracemalloc_interval_s = float(tracemalloc_interval_s)
+        self.top = int(top)
+        self.sample_interval_s = float(sample_interval_s)
+        self.stamp = time.strftime("%Y%m%d_%H%M%S")
+
+        self.active = True
+        self.reports = []  # Paths written
+        self._lock = threading.Lock()
+        self._profilers = {}     # name -> cProfile.Profile
+        self._detached = {}      # name -> threading.Event
+        self._watched = {}       # name -> thread ident (sampling)
+        self._stacks = {}        # name -> Counter of collapsed stacks
+        self._snapshots = []     # (elapsed s, tracemalloc snapshot)
+        self._started_tracemalloc = False
+
+    # --- Called from the profiled threads ---
+    def attach(self, name):
+        """Starts cProfile in the calling thread (no-op in sampling mode)."""
+        if self.mode != MODE_CPROFILE or not self.active:
+            return False
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Python >= 3.12 allows one active profiler for all threads
+            log.warning(f"Profiler for '{name}' not started: {e}")
+            return False
+        with self._lock:
+            self._profilers[name] = profiler
+            self._detached[name] = threading.Event()
+        return True
+
+    def detach(self, name):
+        with self._lock:
+            profiler = self._profilers.get(name)
+            done = self._detached.get(name)
+        if profiler is not None and not done.is_set():
+            profiler.disable()
+            done.set()
+
+    def watch(self, name, ident):
+        """Registers a thread for sampling mode."""
+        self._watched[name] = ident
+
+    # --- Session thread ---
+    def run(self):
+        log.info(f"Profiling started ({self.mode}, {self.duration_s:.0f} s).")
+        if self.tracemalloc_interval_s > 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._started_tracemalloc = True
+
+        started = time.time()
+        next_snapshot = started
+        while time.time() - started < self.duration_s:
+            now = time.time()
+            if self.tracemalloc_interval_s > 0 and now >= next_snapshot:
+                self._snapshots.append((now - started, self._take_snapshot()))
+                next_snapshot = now + self.tracemalloc_interval_s
+            if self.mode == MODE_SAMPLING:
+                self._sample()
+                time.sleep(self.sample_interval_s)
+            else:
+                time.sleep(0.2)
+
+        self.active = False
+        if self.tracemalloc_interval_s > 0:
+            self._snapshots.append((time.time() - started, self._take_snapshot()))
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+        # Profiled threads notice 'active' on their next loop / timer
+        with self._lock:
+            events = list(self._detached.values())
+        for event in events:
+            event.wait(timeout=5.0)
+
+        try:
+            self._write_reports()
+        except OSError as e:
+            log.error(f"Could not write profiling reports: {e}")
+            return
+        log.info("Profiling finished, reports: " + ", ".join(str(p) for p in self.reports))
+
+    def _take_snapshot(self):
+        # The session's own allocations (stack samples) are not of interest
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+
+    def _sample(self):
+        frames = sys._current_frames()
+        for name, ident in self._watched.items():
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self._stacks.setdefault(name, Counter())[";".join(reversed(stack))] += 1
+
+    # --- Reports ---
+    def _path(self, kind, name, extension="txt"):
+        return self.folder / f"profile_{self.stamp}_{kind}_{name}.{extension}"
+
+    def _write_reports(self):
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+        for name, profiler in self._profilers.items():
+            raw_path = self._path("cprofile", name, "prof")
+            profiler.dump_stats(str(raw_path))  # For snakeviz / pstats
+            text = io.StringIO()
+            stats = pstats.Stats(profiler, stream=text)
+            stats.sort_stats("cumulative").print_stats(self.top)
+            stats.sort_stats("tottime").print_stats(self.top)
+            path = self._path("cprofile", name)
+            path.write_text(text.getvalue(), encoding="utf-8")
+            self.reports += [path, raw_path]
+
+        for name, stacks in self._stacks.items():
+            total = sum(stacks.values())
+            # Collapsed stacks: one "frame;frame;frame count" line each (flame graph input)
+            path = self._path("stacks", name)
+            path.write_text("\n".join(f"{stack} {count}" for stack, count in stacks.most_common()),
+                            encoding="utf-8")
+            # Leaf functions by share of samples
+            leaves = Counter()
+            for stack, count in stacks.items():
+                leaves[stack.rsplit(";", 1)[-1]] += count
+            summary = self._path("sampling", name)
+            summary.write_text(
+                f"{total} samples every {self.sample_interval_s * 1000:.1f} ms\n\n"
+                + "\n".join(f"{100.0 * count / total:6.2f} %  {leaf}" for leaf, count in leaves.most_common(self.top)),
+                encoding="utf-8")
+            self.reports += [path, summary]
+
+        if len(self._snapshots) >= 2:
+            first_elapsed, first = self._snapshots[0]
+            lines = []
+            for elapsed, snapshot in self._snapshots[1:]:
+                total = sum(stat.size for stat in snapshot.statistics("filename"))
+                lines.append(f"=== t = {elapsed:.0f} s, traced {total / 1024:.0f} KiB, "
+                             f"top {self.top} growth since t = {first_elapsed:.0f} s ===")
+                for stat in snapshot.compare_to(first, "lineno")[:self.top]:
+                    lines.append(str(stat))
+                lines.append("")
+            path = self._path("memory", "tracemalloc")
+            path.write_text("\n".join(lines), encoding="utf-8")
+            self.reports.append(path)
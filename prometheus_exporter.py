@@ -0,0 +1,170 @@
+"""
+Local metrics endpoint in the Prometheus text format.
+A stdlib HTTP server answers /metrics from values kept in memory: scrapes
+never read the instrument and never run on the GUI thread.
+"""
+
+# libraries
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sample_record import ALARM_CRITICAL
+
+log = logging.getLogger("laplace.gas")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Event counters: name -> help text
+COUNTERS = {
+    "samples": "Samples acquired.",
+    "outliers": "Readings rejected by the outlier filter.",
+    "critical_alarms": "Critical (setpoint deviation) alarms raised by the device.",
+    "purges": "Purge sequences started.",
+    "disconnects": "Transitions to offline.",
+    "reconnects": "Transitions back online.",
+    "restarts": "Restarts of a wedged measurement thread.",
+    "safety_trips": "Over-pressure trips of the software safety monitor.",
+}
+
+# Alarm status word (parameter 28) bits
+STATUS_BITS = 8
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsExporter:
+    """
+    Holds the latest values and counters, and serves them over HTTP.
+
+    'observe()' is a pipeline stage of the acquisition thread: it only
+    assigns a few fields of a dict created once. The timing histograms of
+    the Instrumentation object are read as they are at scrape time.
+    """
+
+    def __init__(self, host="127.0.0.1", port=9123, instrumentation=None, name="GAS"):
+        self.host = host
+        self.port = int(port)
+        self.instrumentation = instrumentation
+        self.name = name
+        self.values = {"pressure": None, "setpoint": None, "valve": None, "status": None,
+                       "timestamp": None, "online": 1}
+        self.counters = {name: 0 for name in COUNTERS}
+        self._server = None
+        self._thread = None
+
+    # --- Updates (cheap, called from the acquisition and GUI threads) ---
+    def observe(self, sample):
+        values = self.values
+        values["pressure"] = sample.pressure
+        values["setpoint"] = sample.setpoint
+        values["timestamp"] = sample.timestamp
+        if sample.valve is not None:
+            values["valve"] = sample.valve
+        if sample.alarm is not None:
+            # Count rising edges of the critical alarm, not every sample carrying it
+            if sample.critical and not (values["status"] is not None and values["status"] & ALARM_CRITICAL):
+                self.counters["critical_alarms"] += 1
+            values["status"] = sample.alarm
+        self.counters["samples"] += 1
+        if sample.outlier:
+            self.counters["outliers"] += 1
+
+    def increment(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_online(self, online):
+        online = 1 if online else 0
+        if online != self.values["online"]:
+            self.increment("reconnects" if online else "disconnects")
+        self.values["online"] = online
+
+    # --- Rendering ---
+    def render(self):
+        """Returns the metrics page (Prometheus text exposition format 0.0.4)."""
+        lines = []
+        gauge_label = f'{{name="{_label(self.name)}"}}'
+
+        def gauge(metric, help_text, value):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            if value is not None:
+                lines.append(f"{metric}{gauge_label} {float(value)!r}")
+
+        values = dict(self.values)
+        gauge("gas_pressure_bar", "Measured pressure.", values["pressure"])
+        gauge("gas_setpoint_bar", "Pressure setpoint.", values["setpoint"])
+        gauge("gas_valve_percent", "Inlet valve opening.", values["valve"])
+        gauge("gas_device_online", "1 when the device answers.", values["online"])
+        gauge("gas_last_sample_timestamp_seconds", "Time of the last sample.", values["timestamp"])
+        gauge("gas_status_word", "Alarm status word (parameter 28).", values["status"])
+
+        status = values["status"]
+        lines.append("# HELP gas_status_bit Alarm status bits (parameter 28).")
+        lines.append("# TYPE gas_status_bit gauge")
+        if status is not None:
+            for bit in range(STATUS_BITS):
+                lines.append(f'gas_status_bit{{name="{_label(self.name)}",bit="{bit}"}} {(status >> bit) & 1}')
+
+        for counter, help_text in COUNTERS.items():
+            metric = f"gas_{counter}_total"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{gauge_label} {self.counters.get(counter, 0)}")
+
+        if self.instrumentation is not None:
+            lines.append("# HELP gas_latency_seconds Device calls, lock and acquisition loop timing.")
+            lines.append("# TYPE gas_latency_seconds histogram")
+            for name, histogram in sorted(list(self.instrumentation.histograms.items())):
+                labels = f'name="{_label(self.name)}",op="{_label(name)}"'
+                counts = list(histogram.counts)
+                cumulative = 0
+                for bound, count in zip(histogram.bounds, counts):
+                    cumulative += count
+                    lines.append(f'gas_latency_seconds_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+                cumulative += counts[-1]
+                lines.append(f'gas_latency_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+                lines.append(f"gas_latency_seconds_sum{{{labels}}} {histogram.total!r}")
+                lines.append(f"gas_latency_seconds_count{{{labels}}} {cumulative}")
+
+        lines.append("")
+        return "\n".join(lines)
+
+    # --- HTTP server ---
+    def start(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the log
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            log.error(f"Metrics endpoint could not bind {self.host}:{self.port}: {e}")
+            return False
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]  # Actual port when 0 was given
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        log.info(f"Metrics endpoint on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,132 @@
+"""
+Purge sequence state machine.
+Evaluated on every sample in the measurement thread: the valve is closed
+as soon as the pressure has stayed near the purge target for the hold
+time, or when the purge times out. The GUI only finishes the bookkeeping.
+"""
+
+# libraries
+import logging
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+log = logging.getLogger("laplace.gas")
+
+IDLE = "idle"
+PURGING = "purging"      # Waiting for the pressure to reach the target
+HOLDING = "holding"      # Within tolerance, waiting for the hold time
+
+TARGET = "target"
+TIMEOUT = "timeout"
+
+
+class PurgeSequence(QObject):
+    """
+    'start()' and 'cancel()' are called from the GUI thread, 'check(sample)'
+    is an acquisition stage. 'close_valve(generation)' is called once per
+    purge, from the thread that ends it, before 'finished' is emitted.
+
+    Each start and cancel opens a new generation: 'finished' is queued to the
+    GUI and may arrive after the user cancelled the purge or a new one
+    started, so receivers ignore it unless 'is_current(generation)'.
+
+    Without samples (device offline, wedged read) a GUI timer ends the purge
+    on its timeout, so the valve is closed in any case.
+    """
+
+    finished = pyqtSignal(str, float, int)  # reason (TARGET/TIMEOUT), elapsed s, generation
+
+    def __init__(self, close_valve, tolerance_bar=1.5, hold_s=0.0, parent=None):
+        super().__init__(parent)
+        self.close_valve = close_valve
+        self.tolerance_bar = float(tolerance_bar)
+        self.hold_s = float(hold_s)
+
+        self.state = IDLE
+        self.target_bar = 0.0
+        self.timeout_s = 0.0
+        self.started = 0.0
+        self.last_diff = None
+        self.peak_bar = None  # Highest reading of the current / last purge
+        self._in_band_since = None
+        self.generation = 0
+        self._lock = threading.Lock()
+
+        # Backstop when no sample arrives
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.expire)
+        self.finished.connect(self._stop_backstop)  # Queued when emitted from the measurement thread
+
+    @property
+    def active(self):
+        return self.state != IDLE
+
+    def is_current(self, generation):
+        """False once the purge of 'generation' was cancelled or followed by another one."""
+        return generation == self.generation
+
+    # --- GUI thread ---
+    def start(self, target_bar, timeout_s):
+        with self._lock:
+            self.target_bar = float(target_bar)
+            self.timeout_s = float(timeout_s)
+            self.started = time.time()
+            self.last_diff = None
+            self.peak_bar = None
+            self._in_band_since = None
+            self.state = PURGING
+            self.generation += 1
+        self.timer.start(int(self.timeout_s * 1000) + 500)
+
+    def cancel(self):
+        with self._lock:
+            self.state = IDLE
+            self.generation += 1
+        self.timer.stop()
+
+    def expire(self):
+        if self.active and time.time() - self.started >= self.timeout_s:
+            self._finish(TIMEOUT)
+
+    def _stop_backstop(self, reason, elapsed, generation):
+        # A late 'finished' of an older purge must not stop the timer of the current one
+        if self.is_current(generation):
+            self.timer.stop()
+
+    # --- Measurement thread ---
+    def check(self, sample):
+        """Acquisition stage."""
+        if self.state == IDLE:
+            return
+        if self.peak_bar is None or sample.pressure_max > self.peak_bar:
+            self.peak_bar = sample.pressure_max
+        # Filtered: a single low glitch must not end the purge as "target reached"
+        self.last_diff = abs(sample.filtered - self.target_bar)
+        if self.last_diff <= self.tolerance_bar:
+            if self._in_band_since is None:
+                self._in_band_since = sample.timestamp
+                self.state = HOLDING
+            if sample.timestamp - self._in_band_since >= self.hold_s:
+                self._finish(TARGET)
+                return
+        elif self._in_band_since is not None:
+            self._in_band_since = None
+            self.state = PURGING
+        if time.time() - self.started >= self.timeout_s:
+            self._finish(TIMEOUT)
+
+    def _finish(self, reason):
+        with self._lock:
+            if self.state == IDLE:
+                return  # Already ended by the other thread, or cancelled
+            self.state = IDLE
+            generation = self.generation
+        elapsed = time.time() - self.started
+        try:
+            self.close_valve(generation)
+        except Exception as e:
+            log.error(f"Purge: closing the valve failed: {e}")
+        self.finished.emit(reason, elapsed, generation)
@@ -1,24 +1,71 @@
 """
 Qt logging bridge.
-Emits a Qt signal for every logging record.
+Log records are collected by a handler (run by the log listener thread)
+and shown in the GUI in batches by a timer, with a bounded line count.
 """
 
 # libraries
 import logging
+import threading
+from collections import deque
+
 from PyQt6 import QtCore
 
 
-class QtLogHandler(logging.Handler, QtCore.QObject):
-    """Logging handler that emits log messages as Qt signals."""
-    new_log = QtCore.pyqtSignal(str)
+class QtLogHandler(logging.Handler):
+    """Keeps the formatted lines not yet shown (at most 'max_lines', older ones are counted as skipped)."""
 
-    def __init__(self):
-        QtCore.QObject.__init__(self)
+    def __init__(self, max_lines=2000):
         logging.Handler.__init__(self)
-        
+        self.pending = deque(maxlen=max_lines)
+        self.skipped = 0
+        self._pending_lock = threading.Lock()
+
         # Set formatter
         self.setFormatter(logging.Formatter("[%(levelname)s] %(message)s")) # [%(name)s]
 
     def emit(self, record: logging.LogRecord):
         msg = self.format(record)  # applies formatter
-        self.new_log.emit(msg)     # emit message
\ No newline at end of file
+        with self._pending_lock:
+            if len(self.pending) == self.pending.maxlen:
+                self.skipped += 1
+            self.pending.append(msg)
+
+    def take(self):
+        """Returns (lines, skipped) collected since the last call."""
+        with self._pending_lock:
+            lines = list(self.pending)
+            skipped = self.skipped
+            self.pending.clear()
+            self.skipped = 0
+        return lines, skipped
+
+
+class LogView(QtCore.QObject):
+    """
+    Moves the lines of a QtLogHandler into a QTextEdit / QPlainTextEdit every
+    'interval_ms': one append per batch, and the document keeps at most
+    'max_lines' blocks, so memory and layout work stay bounded.
+    """
+
+    def __init__(self, handler, widget, interval_ms=250, max_lines=2000, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self.widget = widget
+        self.widget.document().setMaximumBlockCount(int(max_lines))
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(int(interval_ms))
+
+    def flush(self):
+        lines, skipped = self.handler.take()
+        if skipped:
+            lines.insert(0, f"[...] {skipped} lines skipped")
+        if lines:
+            if hasattr(self.widget, "appendPlainText"):
+                self.widget.appendPlainText("\n".join(lines))
+            else:
+                self.widget.append("\n".join(lines))
+
+    def stop(self):
+        self.timer.stop()
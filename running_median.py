@@ -0,0 +1,213 @@
+"""
+Streaming order statistics for outlier rejection.
+Running median and MAD over a sliding window in O(log n) per sample, and a
+Hampel filter built on them to remove single-read glitches of param 8.
+"""
+
+# libraries
+import math
+import random
+from collections import deque
+
+# MAD to standard deviation for normally distributed noise
+MAD_SCALE = 1.4826
+
+
+class _Node:
+    __slots__ = ("value", "next", "width")
+
+    def __init__(self, value, levels):
+        self.value = value
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+class IndexableSkiplist:
+    """
+    Sorted multiset with O(log n) insert, remove and access by rank.
+    Each link stores how many elements it skips, so the i-th smallest value
+    is found by walking down the levels.
+    """
+
+    def __init__(self, expected_size=1000, seed=None):
+        self.size = 0
+        self.max_levels = max(1, int(1 + math.log2(max(2, expected_size))))
+        self.head = _Node(None, self.max_levels)
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError("skiplist index out of range")
+        node = self.head
+        i += 1
+        for level in reversed(range(self.max_levels)):
+            while node.next[level] is not None and node.width[level] <= i:
+                i -= node.width[level]
+                node = node.next[level]
+        return node.value
+
+    def _random_levels(self):
+        levels = 1
+        while levels < self.max_levels and self._random.random() < 0.5:
+            levels += 1
+        return levels
+
+    def insert(self, value):
+        # Find the last node of each level before 'value' and its rank
+        chain = [None] * self.max_levels
+        steps_at_level = [0] * self.max_levels
+        node = self.head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level] is not None and node.next[level].value <= value:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self._random_levels()
+        new_node = _Node(value, levels)
+        steps = 0
+        for level in range(levels):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.max_levels):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, value):
+        chain = [None] * self.max_levels
+        node = self.head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level] is not None and node.next[level].value < value:
+                node = node.next[level]
+            chain[level] = node
+        target = chain[0].next[0]
+        if target is None or target.value != value:
+            raise KeyError("value not found in skiplist")
+
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.max_levels):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+
+class RunningMedian:
+    """Median and MAD of the last 'window' values."""
+
+    def __init__(self, window=15):
+        self.window = max(1, int(window))
+        self._values = deque()
+        self._sorted = IndexableSkiplist(self.window, seed=self.window)
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, value):
+        value = float(value)
+        self._values.append(value)
+        self._sorted.insert(value)
+        if len(self._values) > self.window:
+            self._sorted.remove(self._values.popleft())
+
+    def clear(self):
+        self._values.clear()
+        self._sorted = IndexableSkiplist(self.window, seed=self.window)
+
+    def median(self):
+        n = len(self._sorted)
+        if n == 0:
+            return None
+        s = self._sorted
+        if n % 2:
+            return s[n // 2]
+        return (s[n // 2 - 1] + s[n // 2]) / 2.0
+
+    def mad(self):
+        """
+        Median absolute deviation, in O(log^2 n) without building the deviations.
+
+        Below the median split the distances m - s[p-1-j] grow with j, above it
+        the distances s[p+j] - m grow with j: the MAD is the median of these two
+        sorted sequences, found by a rank search over both.
+        """
+        n = len(self._sorted)
+        if n == 0:
+            return None
+        s = self._sorted
+        m = self.median()
+        p = n // 2
+
+        def below(j):
+            return m - s[p - 1 - j]
+
+        def above(j):
+            return s[p + j] - m
+
+        if n % 2:
+            return _kth_of_two(below, p, above, n - p, n // 2)
+        return (_kth_of_two(below, p, above, n - p, n // 2 - 1)
+                + _kth_of_two(below, p, above, n - p, n // 2)) / 2.0
+
+
+def _kth_of_two(a, len_a, b, len_b, k):
+    """k-th smallest (0-based) of two ascending sequences given as index functions."""
+    # i = number of elements taken from 'a' among the k+1 smallest
+    low, high = max(0, k + 1 - len_b), min(k + 1, len_a)
+    while low < high:
+        i = (low + high) // 2
+        if a(i) < b(k - i):
+            low = i + 1
+        else:
+            high = i
+    i = low
+    j = k + 1 - i
+    candidates = []
+    if i > 0:
+        candidates.append(a(i - 1))
+    if j > 0:
+        candidates.append(b(j - 1))
+    return max(candidates)
+
+
+class HampelFilter:
+    """
+    Replaces a value by the window median when it is further than
+    'n_sigmas' robust standard deviations (1.4826 * MAD) from it.
+
+    'min_deviation' (bar) is a floor on the threshold: a steady, quantized
+    signal has a MAD of 0 and would otherwise flag every step.
+    The window always receives the raw value, so a real step change is
+    accepted once it makes up half of the window.
+    """
+
+    def __init__(self, window=15, n_sigmas=3.0, min_deviation=0.05):
+        self.window = RunningMedian(window)
+        self.n_sigmas = float(n_sigmas)
+        self.min_deviation = float(min_deviation)
+        self.outliers = 0
+
+    def update(self, value):
+        """Adds a raw value and returns (filtered value, is_outlier)."""
+        self.window.add(value)
+        if len(self.window) < 3:
+            return value, False
+        median = self.window.median()
+        threshold = max(self.n_sigmas * MAD_SCALE * self.window.mad(), self.min_deviation)
+        if abs(value - median) > threshold:
+            self.outliers += 1
+            return median, True
+        return value, False
+
+    def reset(self):
+        self.window.clear()
@@ -0,0 +1,98 @@
+"""
+Software over-pressure monitor.
+Runs as an acquisition pipeline stage: every sample is compared with
+setpoint + tolerance, and on a trip the safe setpoint is written from the
+measurement thread itself. The GUI is told afterwards, for the purge
+sequence and the user notification; if a command could not be sent, the GUI
+purge sends them again.
+"""
+
+# libraries
+import logging
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+log = logging.getLogger("laplace.gas")
+
+
+class SafetyMonitor(QObject):
+    """
+    Mirrors the device deviation alarm (parameter 118 in mode 2).
+
+    The GUI thread arms it wherever the device alarm is enabled and disarms
+    it wherever the alarm is disabled (cooldown, purge, valve closed), so the
+    software and device checks always watch the same periods. After a trip it
+    stays disarmed until armed again.
+    """
+
+    tripped = pyqtSignal(object)  # dict: pressure, limit, setpoint, response_s, success, failed
+
+    def __init__(self, instrument, mutex, tolerance_bar, delay_s, safe_setpoint_raw, instrumentation=None,
+                 parent=None):
+        super().__init__(parent)
+        self.instrument = instrument
+        self.mutex = mutex  # Replaced by restart_acquisition() with the instrument mutex
+        self.tolerance_bar = float(tolerance_bar)
+        self.delay_s = float(delay_s)
+        self.safe_setpoint_raw = int(safe_setpoint_raw)
+        self.response_histogram = instrumentation.histogram("safety response") if instrumentation else None
+
+        self.armed = False
+        self.trips = 0
+        self._above_since = None
+
+    # --- GUI thread ---
+    def arm(self):
+        self._above_since = None
+        self.armed = True
+
+    def disarm(self):
+        self.armed = False
+
+    # --- Measurement thread ---
+    def check(self, sample):
+        """Acquisition stage."""
+        if not self.armed or sample.setpoint is None:
+            self._above_since = None
+            return
+        limit = sample.setpoint + self.tolerance_bar
+        # Highest raw reading of the cycle: the outlier filter must not hide an over-pressure
+        pressure = sample.pressure_max
+        if pressure <= limit:
+            self._above_since = None
+            return
+        if self._above_since is None:
+            self._above_since = sample.timestamp
+        if sample.timestamp - self._above_since < self.delay_s:
+            return
+
+        # Trip: same commands as the purge sequence (alarm off, safe setpoint, PID).
+        # Each one is tried even if the previous failed; the GUI is told in any case.
+        self.armed = False
+        self.trips += 1
+        failed = []
+        self.mutex.lock()
+        try:
+            for dde_nr, value in ((118, 0), (9, self.safe_setpoint_raw), (12, 0)):
+                try:
+                    if not self.instrument.writeParameter(dde_nr, value):
+                        failed.append(dde_nr)
+                except Exception as e:
+                    log.error(f"Safety trip: writing parameter {dde_nr} failed: {e}")
+                    failed.append(dde_nr)
+        finally:
+            self.mutex.unlock()
+        # From the reading that crossed the delay to the acknowledged commands
+        response_s = time.time() - sample.timestamp
+        if self.response_histogram is not None:
+            self.response_histogram.record(response_s)
+        if failed:
+            log.error(f"SOFTWARE SAFETY TRIP: {pressure:.3f} bar > {limit:.3f} bar for "
+                      f"{sample.timestamp - self._above_since:.2f} s, parameters {failed} NOT acknowledged.")
+        else:
+            log.error(f"SOFTWARE SAFETY TRIP: {pressure:.3f} bar > {limit:.3f} bar for "
+                      f"{sample.timestamp - self._above_since:.2f} s, safe setpoint sent in "
+                      f"{response_s * 1000:.1f} ms.")
+        self.tripped.emit({"pressure": pressure, "limit": limit, "setpoint": sample.setpoint,
+                           "response_s": response_s, "success": not failed, "failed": failed})
@@ -0,0 +1,67 @@
+"""
+In-memory ring buffer of acquisition samples.
+Pre-allocated NumPy storage, written by the acquisition thread and read by
+remote history requests without going through the plot widgets.
+"""
+
+# libraries
+import threading
+
+import numpy as np
+
+SAMPLE_FIELDS = ("t", "pressure", "setpoint")
+
+
+class SampleRingBuffer:
+    """
+    Fixed-size ring of (timestamp, pressure, setpoint) rows.
+
+    Rows are stored in a single (capacity, 3) float64 array so a time slice
+    can be returned as one contiguous packed block. Timestamps are increasing,
+    so time queries are binary searches.
+    """
+
+    def __init__(self, capacity=24000):
+        self.capacity = max(1, int(capacity))
+        self._data = np.zeros((self.capacity, len(SAMPLE_FIELDS)), dtype=np.float64)
+        self._next = 0      # Write position
+        self._count = 0     # Number of valid rows
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, pressure, setpoint):
+        """Stores one sample, overwriting the oldest when full."""
+        with self._lock:
+            row = self._data[self._next]
+            row[0] = timestamp
+            row[1] = pressure
+            row[2] = setpoint
+            self._next = (self._next + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+
+    def _ordered(self):
+        """Copy of the valid rows, oldest first (caller holds the lock)."""
+        if self._count < self.capacity:
+            return self._data[:self._count].copy()
+        return np.concatenate((self._data[self._next:], self._data[:self._next]))
+
+    def since(self, timestamp, max_points=None):
+        """Rows with t >= timestamp, oldest first, as a (n, 3) float64 array."""
+        with self._lock:
+            rows = self._ordered()
+        start = int(np.searchsorted(rows[:, 0], timestamp, side="left"))
+        rows = rows[start:]
+        if max_points is not None and len(rows) > max_points:
+            rows = rows[-int(max_points):]  # Keep the most recent ones
+        return rows
+
+    def last_seconds(self, seconds, max_points=None):
+        """Rows of the last 'seconds' relative to the newest sample."""
+        with self._lock:
+            if self._count == 0:
+                return np.empty((0, len(SAMPLE_FIELDS)), dtype=np.float64)
+            newest = self._data[(self._next - 1) % self.capacity, 0]
+        return self.since(newest - float(seconds), max_points=max_points)
@@ -0,0 +1,60 @@
+"""
+Sample record of one acquisition cycle.
+Built by the measurement thread and sent to the GUI thread as a single signal.
+"""
+
+# Alarm status (parameter 28) bits
+ALARM_ERROR = 1
+ALARM_WARNING = 2
+ALARM_CRITICAL = 8 | 32  # Setpoint deviation alarms that trigger the safety purge
+
+
+class Sample:
+    """
+    Everything read in one cycle: the GUI dispatcher fans it out to the
+    display, metrics, server and plot, so only one queued cross-thread call
+    is made per sample.
+    """
+    __slots__ = ("timestamp", "pressure", "valve", "alarm", "setpoint", "raw_pressure", "raw_valve",
+                 "reads", "raw_min", "raw_max", "block_reads", "pressure_min", "pressure_max", "filtered",
+                 "outlier", "emitted_at")
+
+    def __init__(self, timestamp, pressure, valve=None, alarm=None, setpoint=0.0,
+                 raw_pressure=None, raw_valve=None, reads=1, raw_min=None, raw_max=None):
+        self.timestamp = timestamp  # Seconds since epoch
+        self.pressure = pressure    # bar
+        self.valve = valve          # Inlet valve opening (%), None if not read
+        self.alarm = alarm          # Raw alarm status word, None if not read
+        self.setpoint = setpoint    # bar, setpoint known when the sample was taken
+        self.raw_pressure = raw_pressure  # Propar value (param 8), converted by the pipeline
+        self.raw_valve = raw_valve        # Raw valve output (param 55)
+        # Oversampling: number of pressure reads averaged in this sample and their extremes
+        self.reads = reads
+        self.raw_min = raw_min
+        self.raw_max = raw_max
+        self.block_reads = None  # [(timestamp, propar value)] of the block, kept for the trigger capture
+        self.pressure_min = pressure
+        self.pressure_max = pressure
+        # Outlier filter output, used for control decisions (equal to pressure when filtering is off)
+        self.filtered = pressure
+        self.outlier = False
+        self.emitted_at = 0.0  # perf_counter() when the signal was emitted (delivery delay)
+
+    @property
+    def status(self):
+        """'Error', 'Warning' or 'Normal' from the alarm word, None if not read."""
+        if self.alarm is None:
+            return None
+        if self.alarm & ALARM_ERROR:
+            return 'Error'
+        if self.alarm & ALARM_WARNING:
+            return 'Warning'
+        return 'Normal'
+
+    @property
+    def critical(self):
+        return self.alarm is not None and bool(self.alarm & ALARM_CRITICAL)
+
+    def __repr__(self):
+        return (f"Sample(t={self.timestamp:.3f}, p={self.pressure:.4f} bar, valve={self.valve}, "
+                f"alarm={self.alarm}, setpoint={self.setpoint})")
@@ -0,0 +1,101 @@
+"""
+Coalescing and rate limiting of remote setpoints.
+Bursts of CMD_SET from scanning masters are reduced to the latest value,
+written at a bounded rate, and acknowledged with the value actually applied.
+"""
+
+# libraries
+import logging
+import time
+
+from PyQt6 import QtCore
+from laplace_server.protocol import CMD_SET, make_message, make_error
+from laplace_server.validations import validate_payload
+
+log = logging.getLogger("laplace.gas")
+
+
+class RemoteSetpointCoalescer(QtCore.QObject):
+    """
+    Keeps only the latest requested setpoint and applies it once the
+    coalescing window has elapsed, never more often than 'max_rate_hz'.
+    Lives in the GUI thread; 'apply' is emitted there.
+    """
+    apply = QtCore.pyqtSignal(float)
+
+    def __init__(self, window_ms=100, max_rate_hz=5.0, parent=None):
+        super().__init__(parent)
+        self.window_ms = max(0, int(window_ms))
+        self.min_interval = 1.0 / max_rate_hz if max_rate_hz > 0 else 0.0
+
+        self.pending = None           # Latest requested value not applied yet
+        self.pending_requests = 0     # Requests merged into 'pending'
+        self.last_apply_time = 0.0
+        self.requests_total = 0
+        self.writes_total = 0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+
+    def submit(self, value: float):
+        """Queues a setpoint; only the most recent one survives the window."""
+        self.pending = float(value)
+        self.pending_requests += 1
+        self.requests_total += 1
+        if self._timer.isActive():
+            return
+
+        # Wait for the window, and longer if the last write is too recent
+        until_allowed = self.min_interval - (time.time() - self.last_apply_time)
+        delay_ms = max(self.window_ms, int(until_allowed * 1000))
+        self._timer.start(delay_ms)
+
+    def _flush(self):
+        if self.pending is None:
+            return
+        value = self.pending
+        merged = self.pending_requests
+        self.pending = None
+        self.pending_requests = 0
+        self.last_apply_time = time.time()
+        self.writes_total += 1
+        if merged > 1:
+            log.debug(f"Remote setpoint: {merged} requests coalesced into {value} bar")
+        self.apply.emit(value)
+
+    def cancel(self):
+        self._timer.stop()
+        self.pending = None
+        self.pending_requests = 0
+
+
+def register_set_ack(server, get_ack):
+    """
+    Replaces the CMD_SET handler of a GasServer so the reply also tells the
+    client what was queued and the last value actually applied ('get_ack()').
+    """
+
+    def handle_set(server, message: dict, target: str) -> None:
+        log.debug(f"[Server {server.name}] Received: '{CMD_SET}' from '{target}'.")
+        err = validate_payload(message, expected_keys=["positions"])
+        if err:
+            server.socket.send_json(
+                make_error(sender=server.name, target=target, cmd=CMD_SET, error_msg=err)
+            )
+            return
+
+        positions = message["payload"]["positions"]
+        server.emit("on_position_changed", positions)
+
+        server.socket.send_json(
+            make_message(
+                cmd=CMD_SET,
+                sender=server.name,
+                target=target,
+                payload={"queued": positions, "last_applied": get_ack()},
+                msg="Positions queued."
+            )
+        )
+
+    server.register_command(CMD_SET, handle_set)
@@ -0,0 +1,98 @@
+"""
+Simulated Bronkhorst EL-PRESS instrument.
+Implements the subset of the propar 'instrument' API used by this application
+(readParameter / writeParameter / master.propar.stop) with a first-order
+pressure response, so servers and tools can be exercised without hardware.
+"""
+
+# libraries
+import random
+import threading
+import time
+
+PROPAR_FULL_SCALE = 32000
+VALVE_FULL_SCALE = 16777215
+
+
+class _SimulatedPropar:
+    def stop(self):
+        pass
+
+
+class _SimulatedMaster:
+    def __init__(self):
+        self.propar = _SimulatedPropar()
+
+
+class SimulatedInstrument:
+    """
+    Drop-in replacement for 'propar.instrument(port)'.
+
+    The pressure follows the setpoint (param 9) with time constant 'tau_s'
+    while in PID mode (param 12 = 0) and is held when the valve is closed.
+    'read_latency_s' emulates the time a request takes on the serial bus;
+    requests are serialized like on the real RS232 link.
+    """
+
+    def __init__(self, port="SIM", capacity=50.0, tau_s=1.0, noise_bar=0.01,
+                 read_latency_s=0.0, user_tag="SIM", seed=None):
+        self.port = port
+        self.capacity = float(capacity)
+        self.tau_s = float(tau_s)
+        self.noise_bar = float(noise_bar)
+        self.read_latency_s = float(read_latency_s)
+        self.master = _SimulatedMaster()
+
+        self._rng = random.Random(seed)
+        self._bus = threading.Lock()
+        self._pressure = 0.0
+        self._last_update = time.time()
+        self.params = {
+            1: f"SIM-{port}",                         # serial number
+            7: 0,                                     # init/reset
+            9: 0,                                     # setpoint (0-32000)
+            12: 3,                                    # control mode (3 = valve closed)
+            21: self.capacity,                        # capacity
+            28: 0,                                    # alarm/status word
+            115: user_tag,                            # user tag
+            129: "bar",                               # unit
+            167: 2000.0, 168: 0.25, 169: 0.0, 254: 1.0,
+            165: 128, 72: 128, 141: 128, 361: 0.001,
+        }
+
+    def _advance(self):
+        """Integrates the pressure response up to now."""
+        now = time.time()
+        dt = now - self._last_update
+        self._last_update = now
+        if self.params.get(12) == 0:
+            target = self.params.get(9, 0) / PROPAR_FULL_SCALE * self.capacity
+            alpha = 1.0 if self.tau_s <= 0 else min(1.0, dt / self.tau_s)
+            self._pressure += (target - self._pressure) * alpha
+
+    def _valve_output(self):
+        if self.params.get(12) != 0:
+            return 0
+        target = self.params.get(9, 0) / PROPAR_FULL_SCALE * self.capacity
+        opening = min(1.0, max(0.0, 0.3 + (target - self._pressure) / max(self.capacity, 1e-9)))
+        return int(opening * VALVE_FULL_SCALE * 0.6167)
+
+    def readParameter(self, number):
+        with self._bus:
+            if self.read_latency_s > 0:
+                time.sleep(self.read_latency_s)
+            self._advance()
+            if number == 8:
+                measured = self._pressure + self._rng.gauss(0.0, self.noise_bar)
+                return int(max(0.0, min(1.0, measured / self.capacity)) * PROPAR_FULL_SCALE)
+            if number == 55:
+                return self._valve_output()
+            return self.params.get(number, 0)
+
+    def writeParameter(self, number, value):
+        with self._bus:
+            if self.read_latency_s > 0:
+                time.sleep(self.read_latency_s)
+            self._advance()
+            self.params[number] = value
+            return True  # Like propar: True once acknowledged
@@ -0,0 +1,159 @@
+"""
+Simulated GAS node: the application's server path (GasServer, SET handler,
+setpoint coalescer, encoded GET, reused payload dicts) and an acquisition
+loop on a SimulatedInstrument.
+Used by the load test and the fleet dashboard to run servers locally.
+"""
+
+# libraries
+import random
+import threading
+import time
+
+from PyQt6 import QtCore
+from laplace_server.protocol import DEVICE_GAS
+from laplace_server.server_controller import ServerController
+
+from codec import ServerPayload, register_encoded_get
+from gas_server import GasServer
+from setpoint_coalescer import RemoteSetpointCoalescer, register_set_ack
+from simulated_instrument import SimulatedInstrument, PROPAR_FULL_SCALE
+from stream_publisher import SamplePublisher
+
+
+class SimulatedGui(QtCore.QObject):
+    """
+    GUI-thread side of a simulated node, wired like Bronkhost: CMD_SET ->
+    ServerController signal -> coalescer -> device write in this thread.
+    Lives in the thread that creates it, which must run a Qt event loop for
+    remote setpoints to be applied.
+    """
+
+    def __init__(self, node, window_ms=100, max_rate_hz=5.0):
+        super().__init__()
+        self.node = node
+        self.server_controller = ServerController()
+        self.server_controller.position_changed.connect(self.on_remote_setpoint_received)
+        self.setpoint_coalescer = RemoteSetpointCoalescer(window_ms=window_ms, max_rate_hz=max_rate_hz,
+                                                          parent=self)
+        self.setpoint_coalescer.apply.connect(self.apply_remote_setpoint)
+        self.remote_setpoint_ack = None
+
+    @QtCore.pyqtSlot(list)
+    def on_remote_setpoint_received(self, positions):
+        try:
+            self.setpoint_coalescer.submit(float(positions[0]))
+        except (IndexError, TypeError, ValueError):
+            pass
+
+    @QtCore.pyqtSlot(float)
+    def apply_remote_setpoint(self, value):
+        self.node.write_setpoint(value)
+        self.remote_setpoint_ack = {
+            "status": "applied",
+            "applied": value,
+            "time": time.time(),
+            "requests": self.setpoint_coalescer.requests_total,
+            "writes": self.setpoint_coalescer.writes_total
+        }
+
+
+class SimulatedGasServer(threading.Thread):
+    """
+    Runs the THREADFlow acquisition sequence (params 28, 8, 55 under the
+    instrument lock, then a ServerPayload commit) against a simulated
+    instrument, with a GAS server answering GET/SET through the application
+    handlers (see SimulatedGui) and an optional PUB stream.
+
+    'wander_s' > 0 makes the node pick a new random setpoint periodically.
+    """
+
+    def __init__(self, name, port, stream_port=None, period_s=0.2,
+                 bus_latency_s=0.0, wander_s=0.0, capacity=50.0):
+        super().__init__(daemon=True)
+        self.node_name = name
+        self.period_s = float(period_s)
+        self.wander_s = float(wander_s)
+        self.instrument = SimulatedInstrument(port=name, capacity=capacity,
+                                              read_latency_s=bus_latency_s, user_tag=name)
+        self.lock = threading.Lock()
+        self.setpoint = 0.0
+        self.stop_flag = False
+        self.record = False
+        self.periods = []
+
+        self.server = GasServer(name=name, address=f"tcp://*:{port}", freedom=1,
+                                device=DEVICE_GAS, data={})
+        self.gui = SimulatedGui(self)
+        self.server.set_on_position_changed(self.gui.server_controller.on_position_changed)
+        register_set_ack(self.server, lambda: self.gui.remote_setpoint_ack)
+        register_encoded_get(self.server)
+        self.payload = ServerPayload(self.server, {
+            "shootNumber": 0,
+            "stabilized": False,
+            "positions": [0.0],
+            "setpoint": 0.0,
+            "status": None,
+            "unit": "bar",
+            "lastRemoteSet": None
+        })
+
+        self.publisher = None
+        if stream_port is not None:
+            self.publisher = SamplePublisher(f"tcp://*:{stream_port}", name=name)
+
+    def write_setpoint(self, bar):
+        # The GUI path writes params 9 and 12 under the instrument mutex
+        with self.lock:
+            self.instrument.writeParameter(9, int(bar / self.instrument.capacity * PROPAR_FULL_SCALE))
+            self.instrument.writeParameter(12, 0)
+        self.setpoint = bar
+
+    def start(self):
+        self.server.start()
+        if self.publisher is not None:
+            self.publisher.start()
+        super().start()
+
+    def run(self):
+        last_start = None
+        next_wander = time.time()
+        while not self.stop_flag:
+            loop_start = time.time()
+            if self.record and last_start is not None:
+                self.periods.append(loop_start - last_start)
+            last_start = loop_start
+
+            if self.wander_s > 0 and loop_start >= next_wander:
+                self.write_setpoint(round(random.uniform(1.0, 0.5 * self.instrument.capacity), 1))
+                next_wander = loop_start + self.wander_s
+
+            with self.lock:
+                status = self.instrument.readParameter(28)
+                raw_measure = self.instrument.readParameter(8)
+                self.instrument.readParameter(55)
+            pressure = raw_measure / PROPAR_FULL_SCALE * self.instrument.capacity
+
+            data = self.payload.spare()
+            data["positions"][0] = pressure
+            data["setpoint"] = self.setpoint
+            data["status"] = "Error" if status & 1 else "Normal"
+            data["lastRemoteSet"] = self.gui.remote_setpoint_ack
+            self.payload.commit()
+            if self.publisher is not None:
+                self.publisher.publish(loop_start, pressure, self.setpoint)
+
+            sleep_time = self.period_s - (time.time() - loop_start)
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+
+    def take_periods(self):
+        periods, self.periods = self.periods, []
+        return periods
+
+    def shutdown(self):
+        self.stop_flag = True
+        self.join(timeout=2)
+        if self.publisher is not None:
+            self.publisher.stop()
+        self.server.stop()
@@ -0,0 +1,134 @@
+"""
+Rolling-window pressure stability detector.
+Decides per sample whether the regulated pressure has settled on its setpoint.
+"""
+
+# libraries
+import math
+from collections import deque
+
+
+class StabilityDetector:
+    """
+    Tracks the rolling mean, variance and least-squares slope of the pressure
+    over a time window using running sums, so each sample costs O(1) amortized.
+
+    The pressure is considered stabilized once the window has been filled since
+    the last setpoint change and:
+        |mean - setpoint| <= tolerance
+        std               <= tolerance
+        |slope|           <= max_slope
+    with tolerance = max(absolute_tolerance, relative_tolerance * |setpoint|).
+    """
+
+    # Rebase the time origin and recompute the sums every N evictions
+    RESYNC_EVERY = 1000
+
+    def __init__(self, window_s=3.0, relative_tolerance=0.01,
+                 absolute_tolerance=0.05, max_slope=0.02):
+        self.window_s = float(window_s)
+        self.relative_tolerance = float(relative_tolerance)
+        self.absolute_tolerance = float(absolute_tolerance)
+        self.max_slope = float(max_slope)  # bar/s
+
+        self._samples = deque()  # (t relative to self._t0, value)
+        self.reset()
+
+    def reset(self, setpoint=None):
+        """Restarts the detection, e.g. after a setpoint change."""
+        self._samples.clear()
+        self._t0 = None
+        self._window_start = None
+        self._sum_t = self._sum_tt = 0.0
+        self._sum_y = self._sum_yy = self._sum_ty = 0.0
+        self._evictions = 0
+
+        self.setpoint = setpoint
+        self.stabilized = False
+        self.stable_since = None  # Epoch timestamp when stability was reached
+
+    def tolerance(self):
+        """Allowed deviation in bar for the current setpoint."""
+        return max(self.absolute_tolerance, self.relative_tolerance * abs(self.setpoint or 0.0))
+
+    def update(self, timestamp, value, setpoint):
+        """Adds one sample and returns the stabilized flag."""
+        if setpoint != self.setpoint:
+            self.reset(setpoint)
+
+        if self._t0 is None:
+            self._t0 = timestamp
+            self._window_start = timestamp
+
+        t = timestamp - self._t0
+        self._samples.append((t, value))
+        self._add(t, value, 1.0)
+
+        # Drop samples older than the window
+        oldest_allowed = t - self.window_s
+        while self._samples[0][0] < oldest_allowed:
+            old_t, old_value = self._samples.popleft()
+            self._add(old_t, old_value, -1.0)
+            self._evictions += 1
+        if self._evictions >= self.RESYNC_EVERY:
+            self._resync()
+
+        stable = (timestamp - self._window_start) >= self.window_s and self._is_within_limits()
+        if stable and not self.stabilized:
+            self.stable_since = timestamp
+        elif not stable:
+            self.stable_since = None
+        self.stabilized = stable
+        return stable
+
+    def _add(self, t, y, sign):
+        self._sum_t += sign * t
+        self._sum_tt += sign * t * t
+        self._sum_y += sign * y
+        self._sum_yy += sign * y * y
+        self._sum_ty += sign * t * y
+
+    def _resync(self):
+        """Rebases time on the oldest sample and recomputes the sums exactly."""
+        self._evictions = 0
+        shift = self._samples[0][0]
+        self._t0 += shift
+        rebased = [(t - shift, y) for t, y in self._samples]
+        self._samples = deque(rebased)
+        self._sum_t = self._sum_tt = 0.0
+        self._sum_y = self._sum_yy = self._sum_ty = 0.0
+        for t, y in rebased:
+            self._add(t, y, 1.0)
+
+    @property
+    def count(self):
+        return len(self._samples)
+
+    @property
+    def mean(self):
+        return self._sum_y / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        n = self.count
+        if n < 2:
+            return 0.0
+        variance = (self._sum_yy - self._sum_y * self._sum_y / n) / (n - 1)
+        return math.sqrt(max(0.0, variance))
+
+    @property
+    def slope(self):
+        """Least-squares slope of the window in bar/s."""
+        n = self.count
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        if n < 2 or denominator <= 0.0:
+            return 0.0
+        return (n * self._sum_ty - self._sum_t * self._sum_y) / denominator
+
+    def _is_within_limits(self):
+        if self.setpoint is None or self.count < 2:
+            return False
+        tol = self.tolerance()
+        return (abs(self.mean - self.setpoint) <= tol
+                and self.std <= tol
+                and abs(self.slope) <= self.max_slope)
@@ -0,0 +1,148 @@
+"""
+ZeroMQ PUB stream of acquisition samples.
+Every sample is pushed to subscribers, batched into small numbered frames.
+"""
+
+# libraries
+import logging
+import queue
+import sys
+import threading
+
+import zmq
+
+from codec import ENCODING_JSON, decode, encode, negotiate
+
+log = logging.getLogger("laplace.gas")
+
+STREAM_FIELDS = ["t", "pressure", "setpoint"]
+
+
+class SamplePublisher(threading.Thread):
+    """
+    Publishes samples on a PUB socket owned by its own thread.
+
+    'publish()' only puts a tuple on a queue, so the acquisition loop never
+    waits on the network. The thread sends whatever is queued as one frame
+    (up to 'max_batch' samples): one sample per frame at low rate, batches
+    when the rate is high, without adding latency.
+
+    Frame (multipart): [topic, encoding, body] with body (json or msgpack) =
+        {"seq": frame number, "first": index of the first sample,
+         "name": ..., "unit": "bar", "fields": [...], "samples": [[t, p, sp], ...]}
+    Subscribers detect lost frames when 'seq' is not the previous 'seq' + 1,
+    and the number of lost samples from 'first'.
+    """
+
+    def __init__(self, address, name="GAS", topic=b"GAS", max_batch=50, hwm=1000,
+                 encoding=ENCODING_JSON):
+        super().__init__(daemon=True)
+        self.address = address
+        self.stream_name = name
+        self.topic = topic
+        self.max_batch = max(1, int(max_batch))
+        self.hwm = int(hwm)
+        self.encoding = negotiate(encoding)
+        if self.encoding != encoding:
+            log.warning(f"Stream encoding '{encoding}' not available, using '{self.encoding}'.")
+
+        # Frame dict reused for every send, only its values change
+        self._frame = {"seq": 0, "first": 0, "name": name, "unit": "bar",
+                       "fields": STREAM_FIELDS, "samples": None}
+
+        self._queue = queue.SimpleQueue()
+        self._running = threading.Event()
+        self._running.set()
+
+        self.seq = 0            # Next frame number
+        self.sample_index = 0   # Index of the next sample to send
+
+    def publish(self, timestamp, pressure, setpoint):
+        """Queues one sample. Safe to call from any thread."""
+        self._queue.put((timestamp, pressure, setpoint))
+
+    def run(self):
+        context = zmq.Context()
+        socket = context.socket(zmq.PUB)
+        socket.setsockopt(zmq.SNDHWM, self.hwm)
+        socket.setsockopt(zmq.LINGER, 0)
+        try:
+            socket.bind(self.address)
+        except zmq.ZMQError as e:
+            log.error(f"Sample stream could not bind {self.address}: {e}")
+            socket.close()
+            context.term()
+            return
+        log.info(f"Sample stream publishing on {self.address}")
+
+        while self._running.is_set():
+            try:
+                first = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if first is None:  # Stop marker
+                break
+
+            batch = [first]
+            # Take whatever else is already waiting, without blocking
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._running.clear()
+                    break
+                batch.append(item)
+
+            self._send(socket, batch)
+
+        socket.close()
+        context.term()
+        log.info("Sample stream stopped.")
+
+    def _send(self, socket, batch):
+        frame = self._frame
+        frame["seq"] = self.seq
+        frame["first"] = self.sample_index
+        frame["samples"] = batch
+        try:
+            # PUB never blocks: above the HWM messages are dropped for slow subscribers
+            socket.send_multipart([self.topic, self.encoding.encode("ascii"), encode(frame, self.encoding)],
+                                  zmq.NOBLOCK)
+        except zmq.ZMQError as e:
+            log.debug(f"Sample stream frame {self.seq} dropped: {e}")
+        self.seq += 1
+        self.sample_index += len(batch)
+
+    def stop(self):
+        self._running.clear()
+        self._queue.put(None)
+        self.join(timeout=2)
+
+
+def follow(address, topic=b""):
+    """Prints a stream to the console and reports gaps (debug helper)."""
+    context = zmq.Context()
+    socket = context.socket(zmq.SUB)
+    socket.connect(address)
+    socket.setsockopt(zmq.SUBSCRIBE, topic)
+    expected_seq = None
+    try:
+        while True:
+            _, encoding, body = socket.recv_multipart()
+            frame = decode(body, encoding.decode("ascii"))
+            if expected_seq is not None and frame["seq"] != expected_seq:
+                print(f"Gap: frames {expected_seq}..{frame['seq'] - 1} lost")
+            expected_seq = frame["seq"] + 1
+            for t, p, sp in frame["samples"]:
+                print(f"{frame['name']} {t:.3f} {p:.4f} bar (setpoint {sp})")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        socket.close()
+        context.term()
+
+
+if __name__ == "__main__":
+    follow(sys.argv[1] if len(sys.argv) > 1 else "tcp://localhost:1123")
@@ -0,0 +1,177 @@
+"""
+Load-testing harness for the GAS server endpoint.
+
+Starts a local SimulatedGasServer (the application's GasServer handlers backed
+by a SimulatedInstrument and an acquisition loop equivalent to THREADFlow:
+params 28, 8, 55 read under the instrument lock, then a payload commit),
+measures the acquisition cadence alone, then again while many concurrent REQ
+clients send a mix of GET and SET requests. SETs go through the real path:
+SET handler, ServerController signal, setpoint coalescer and the device write
+in this (Qt event loop) thread, standing in for the GUI thread.
+
+Example:
+    python tests/load_test_server.py --clients 20 --rate 10 --set-ratio 0.1 --duration 10
+"""
+
+# libraries
+import argparse
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+
+import zmq
+from PyQt6 import QtCore
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from laplace_server.protocol import LOGGER_NAME, make_get_request, make_set_request
+from simulated_server import SimulatedGasServer
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def client_worker(address, target, rate_hz, set_ratio, stop_event, results, index, timeout_ms):
+    """One REQ client; appends (cmd, latency_s, ok) tuples to 'results'."""
+    context = zmq.Context.instance()
+    socket = context.socket(zmq.REQ)
+    socket.setsockopt(zmq.LINGER, 0)
+    socket.connect(address)
+    interval = 1.0 / rate_hz if rate_hz > 0 else 0.0
+    counter = index  # Spreads SET requests evenly across clients
+    local = []
+
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        counter += 1
+        if set_ratio > 0 and (counter * set_ratio) % 1.0 < set_ratio:
+            cmd = "SET"
+            request = make_set_request(f"load_{index}", target, positions=[(counter % 50) * 0.1])
+        else:
+            cmd = "GET"
+            request = make_get_request(f"load_{index}", target)
+
+        socket.send_json(request)
+        if socket.poll(timeout_ms):
+            socket.recv_json()
+            local.append((cmd, time.perf_counter() - start, True))
+        else:
+            local.append((cmd, time.perf_counter() - start, False))
+            # REQ is stuck waiting for a reply: start over with a new socket
+            socket.close()
+            socket = context.socket(zmq.REQ)
+            socket.setsockopt(zmq.LINGER, 0)
+            socket.connect(address)
+
+        if interval:
+            remaining = interval - (time.perf_counter() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    socket.close()
+    results.extend(local)
+
+
+def run_events(seconds):
+    """Runs the Qt event loop (remote setpoints are applied here) for 'seconds'."""
+    loop = QtCore.QEventLoop()
+    QtCore.QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def describe_periods(label, periods, nominal):
+    if not periods:
+        print(f"{label}: no data")
+        return
+    ordered = sorted(periods)
+    jitter = statistics.pstdev(periods) * 1000
+    print(f"{label}: n={len(periods)} mean={statistics.mean(periods) * 1000:.1f} ms "
+          f"p99={percentile(ordered, 99) * 1000:.1f} ms max={ordered[-1] * 1000:.1f} ms "
+          f"jitter={jitter:.2f} ms (nominal {nominal * 1000:.0f} ms)")
+
+
+def run_load_test(args):
+    logging.getLogger(LOGGER_NAME).setLevel(logging.WARNING)
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])  # Runs the coalescer timers
+
+    acquisition = SimulatedGasServer("GAS LOAD", args.port, period_s=args.period,
+                                     bus_latency_s=args.bus_latency)
+    server = acquisition.server
+    acquisition.start()
+
+    try:
+        # 1. Baseline cadence without clients
+        acquisition.record = True
+        run_events(args.baseline)
+        baseline = acquisition.take_periods()
+
+        # 2. Load phase
+        stop_event = threading.Event()
+        results = []
+        address = f"tcp://localhost:{args.port}"
+        workers = [
+            threading.Thread(
+                target=client_worker,
+                args=(address, server.name, args.rate, args.set_ratio, stop_event,
+                      results, i, args.timeout_ms),
+                daemon=True
+            )
+            for i in range(args.clients)
+        ]
+        load_start = time.time()
+        for worker in workers:
+            worker.start()
+        run_events(args.duration)
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=args.timeout_ms / 1000.0 + 1.0)
+        elapsed = time.time() - load_start
+        loaded = acquisition.take_periods()
+        run_events(0.5)  # Last coalesced setpoint
+        coalescer = acquisition.gui.setpoint_coalescer
+    finally:
+        acquisition.shutdown()
+
+    # 3. Report
+    print(f"\n=== GAS server load test: {args.clients} clients, "
+          f"{'max' if args.rate <= 0 else args.rate} req/s each, SET ratio {args.set_ratio} ===")
+    ok = [r for r in results if r[2]]
+    print(f"Requests: {len(results)} | OK: {len(ok)} | Timeouts: {len(results) - len(ok)} | "
+          f"Throughput: {len(ok) / elapsed:.1f} req/s")
+    for cmd in ("GET", "SET"):
+        latencies = sorted(r[1] for r in ok if r[0] == cmd)
+        if latencies:
+            print(f"{cmd}: n={len(latencies)} p50={percentile(latencies, 50) * 1000:.2f} ms "
+                  f"p95={percentile(latencies, 95) * 1000:.2f} ms "
+                  f"p99={percentile(latencies, 99) * 1000:.2f} ms "
+                  f"max={latencies[-1] * 1000:.2f} ms")
+    print(f"Remote setpoints: {coalescer.requests_total} SET received, "
+          f"{coalescer.writes_total} device writes after coalescing")
+    describe_periods("Acquisition (baseline)", baseline, args.period)
+    describe_periods("Acquisition (loaded)  ", loaded, args.period)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test a local GAS server.")
+    parser.add_argument("--port", type=int, default=5599)
+    parser.add_argument("--clients", type=int, default=10, help="concurrent REQ clients")
+    parser.add_argument("--rate", type=float, default=10.0, help="requests/s per client (0 = as fast as possible)")
+    parser.add_argument("--set-ratio", type=float, default=0.1, help="share of SET requests (0-1)")
+    parser.add_argument("--duration", type=float, default=10.0, help="load phase duration (s)")
+    parser.add_argument("--baseline", type=float, default=3.0, help="baseline phase duration (s)")
+    parser.add_argument("--period", type=float, default=0.2, help="acquisition period (s), like thread_sleep_time")
+    parser.add_argument("--bus-latency", type=float, default=0.005, help="simulated serial latency per request (s)")
+    parser.add_argument("--timeout-ms", type=int, default=2000)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    run_load_test(parse_args())
@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtWidgets
+from PyQt6.QtCore import QMutex, QTimer
+
+from acquisition_supervisor import AcquisitionSupervisor, try_lock
+from instrumentation import Instrumentation
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+class _Thread:
+    def __init__(self):
+        self.last_cycle = time.monotonic()
+
+
+def test_stale_restart_backoff_and_recovery():
+    thread = _Thread()
+    restarts = []
+    stale = []
+    supervisor = AcquisitionSupervisor(
+        period_s=0.1, get_thread=lambda: thread, restart=lambda: restarts.append(time.monotonic()),
+        stale_periods=2, restart_after_s=1.0, max_restart_interval_s=4.0, instrumentation=Instrumentation())
+    supervisor.stale_changed.connect(stale.append)
+
+    supervisor.beat(None)
+    supervisor.check()
+    assert not supervisor.stale and not restarts
+
+    # Loop alive but no samples (device offline): stale, no restart
+    supervisor.last_sample -= 0.5
+    supervisor.check()
+    assert stale == [True] and not restarts
+
+    # Loop wedged: one restart, then none until the back-off elapses
+    thread.last_cycle -= 2.0
+    supervisor.check()
+    supervisor.check()
+    assert supervisor.restarts == 1 and len(restarts) == 1
+    assert supervisor._restart_interval == 2.0
+
+    # New thread delivers a sample: recovery measured from the last loop
+    supervisor.beat(None)
+    thread.last_cycle = time.monotonic()
+    supervisor.check()
+    assert stale == [True, False]
+    assert supervisor.last_recovery_s >= 2.0
+    assert supervisor.recovery_histogram.count == 1
+    assert supervisor._restart_interval == 1.0
+
+
+class _LiveThread:
+    @property
+    def last_cycle(self):
+        return time.monotonic()
+
+
+def test_recovery_while_gui_waits_on_the_lock():
+    threads = [_Thread()]
+    lock = {"mutex": QMutex()}
+    release = threading.Event()
+
+    def hung_read(mutex):
+        mutex.lock()
+        release.wait(10)
+        mutex.unlock()
+
+    threading.Thread(target=hung_read, args=(lock["mutex"],), daemon=True).start()
+    time.sleep(0.05)
+
+    def restart():
+        # Like restart_acquisition(): the old lock stays with the wedged thread
+        lock["mutex"] = QMutex()
+        threads.append(_LiveThread())
+        supervisor.beat(None)
+
+    supervisor = AcquisitionSupervisor(period_s=0.05, get_thread=lambda: threads[-1], restart=restart,
+                                       stale_periods=2, restart_after_s=0.3, max_restart_interval_s=1.0)
+    writes = []
+
+    def gui_write():
+        # A GUI-thread device call, e.g. a setpoint
+        if try_lock(lock["mutex"], 100, "setpoint"):
+            writes.append(time.monotonic())
+            lock["mutex"].unlock()
+
+    timer = QTimer()
+    timer.timeout.connect(gui_write)
+    timer.start(20)
+    supervisor.start()
+    threads[0].last_cycle -= 0.1  # The read hung 0.1 s ago
+    longest = 0.0
+    last = time.monotonic()
+    end = last + 1.5
+    try:
+        while time.monotonic() < end:
+            app.processEvents()
+            now = time.monotonic()
+            longest = max(longest, now - last)
+            last = now
+            time.sleep(0.005)
+    finally:
+        timer.stop()
+        supervisor.stop()
+        release.set()
+
+    assert supervisor.restarts == 1
+    assert supervisor.last_recovery_s is not None
+    assert writes  # The GUI got through once the lock was replaced
+    assert longest < 0.4  # The event loop never waited longer than a lock timeout or so
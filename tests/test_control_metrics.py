@@ -0,0 +1,40 @@
+from control_metrics import ControlQualityMetrics
+
+
+def test_integrals_and_time_in_band():
+    """Constant error of 0.5 bar over 10 s gives IAE=5 and ISE=2.5."""
+    metrics = ControlQualityMetrics(window_s=100.0, band_tolerance=0.1)
+    for i in range(101):
+        metrics.update(float(i) * 0.1, 10.5, 10.0)
+
+    assert abs(metrics.iae - 5.0) < 1e-6
+    assert abs(metrics.ise - 2.5) < 1e-6
+    assert metrics.in_band_percent == 0.0
+
+
+def test_window_eviction():
+    """Old contributions leave the window, recent in-band time remains."""
+    metrics = ControlQualityMetrics(window_s=5.0, band_tolerance=0.1, max_dt=1.0)
+    t = 0.0
+    for _ in range(50):           # 5 s far from setpoint
+        t += 0.1
+        metrics.update(t, 12.0, 10.0)
+    for _ in range(100):          # 10 s on setpoint
+        t += 0.1
+        metrics.update(t, 10.0, 10.0)
+
+    assert metrics.iae < 1e-9
+    assert abs(metrics.in_band_percent - 100.0) < 1e-6
+
+
+def test_tracking_lag():
+    """The lag is measured from the setpoint step to the first in-band sample."""
+    metrics = ControlQualityMetrics(window_s=60.0, band_tolerance=0.2)
+    metrics.update(0.0, 0.0, 0.0)
+    metrics.update(1.0, 0.0, 5.0)         # setpoint step
+    metrics.update(2.0, 3.0, 5.0)
+    assert metrics.pending_lag(2.0) == 1.0
+    metrics.update(3.5, 4.9, 5.0)         # enters the band
+
+    assert metrics.tracking_lag_s == 2.5
+    assert metrics.pending_lag(3.5) is None
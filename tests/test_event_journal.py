@@ -0,0 +1,29 @@
+import time
+
+from event_journal import EventJournal, parse_age, query, summary
+
+
+def test_record_and_query(tmp_path):
+    path = tmp_path / "events.sqlite"
+    journal = EventJournal(path)
+    journal.start()
+    journal.record("purge_start", "ui", 0.0, pressure=12.0, timeout_s=10.0)
+    journal.record("purge_end", "target", 0.0, duration_s=3.5, pressure=12.4, final_diff=0.3)
+    journal.record("setpoint", "remote", 2.5)
+    journal.close()
+    assert journal.written == 3
+
+    purges = query(path, types="purge_end", since=time.time() - parse_age("7d"))
+    assert len(purges) == 1
+    assert purges[0]["duration_s"] == 3.5 and purges[0]["pressure"] == 12.4
+    assert purges[0]["data"] == {"final_diff": 0.3}
+    assert [e["type"] for e in query(path, source="remote")] == ["setpoint"]
+    assert summary(path) == {"purge_end": 1, "purge_start": 1, "setpoint": 1}
+    assert query(path, since=time.time() + 60) == []
+
+
+def test_parse_age():
+    assert parse_age("90s") == 90
+    assert parse_age("24h") == 86400
+    assert parse_age("1w") == 604800
+    assert parse_age("30") == 30
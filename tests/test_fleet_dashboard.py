@@ -0,0 +1,67 @@
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt6 import QtWidgets
+
+from fleet_dashboard import FleetCollector, FleetModel, NodeState
+from simulated_server import SimulatedGasServer
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def _wait(condition, timeout=5.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def fleet():
+    """Two simulated nodes: one polled only, one with a sample stream."""
+    servers = [SimulatedGasServer("GAS T0", 5641, period_s=0.05),
+               SimulatedGasServer("GAS T1", 5642, stream_port=5652, period_s=0.05)]
+    for i, server in enumerate(servers):
+        server.write_setpoint(1.5 + i)
+        server.start()
+    nodes = {
+        "GAS T0": NodeState("GAS T0", "tcp://localhost:5641"),
+        "GAS T1": NodeState("GAS T1", "tcp://localhost:5642", "tcp://localhost:5652"),
+    }
+    collector = FleetCollector(nodes, poll_hz=10.0, timeout=0.5)
+    collector.start()
+    yield servers, nodes
+    collector.stop()
+    for server in servers:
+        if server.server.running.is_set():  # Not shut down by the test
+            server.shutdown()
+
+
+def test_model_values_and_stale_state(fleet):
+    servers, nodes = fleet
+    model = FleetModel(nodes, stale_s=0.5)
+    streamed = nodes["GAS T1"]
+    assert _wait(lambda: all(n.pressure is not None and n.setpoint is not None for n in nodes.values())
+                 and len(streamed.history) > 5)
+
+    for row, node in enumerate(model.nodes):
+        assert model.data(model.index(row, 0)) == node.name
+        assert model.data(model.index(row, 2)) == f"{1.5 + row:.2f}"
+        assert model.data(model.index(row, 3)) == "Normal"
+        assert float(model.data(model.index(row, 1))) == pytest.approx(node.pressure, abs=1e-3)
+        assert model.alarm(node) is None
+
+    # The stream stops: the streamed node goes stale, the polled one still answers
+    servers[1].stop_flag = True
+    assert _wait(lambda: model.alarm(streamed) == "Stale", timeout=3.0)
+    assert model.data(model.index(1, 3)) == "Stale"
+    assert model.alarm(nodes["GAS T0"]) is None
+
+    # No reply at all
+    servers[0].shutdown()
+    assert _wait(lambda: model.alarm(nodes["GAS T0"]) == "No reply", timeout=3.0)
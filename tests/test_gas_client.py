@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+from laplace_server.server_lhc import ServerLHC
+from laplace_server.protocol import DEVICE_GAS
+
+from gas_client import ConnectionPool, GasFleet, GasNode, GasTimeout
+
+
+@pytest.fixture
+def servers():
+    """Three local GAS servers echoing the last setpoint in their data."""
+    started = []
+    for i, port in enumerate((5611, 5612, 5613)):
+        server = ServerLHC(name=f"GAS {i}", address=f"tcp://*:{port}", freedom=1,
+                           device=DEVICE_GAS, data={"positions": [0.0]}, time_sleep_ms=1)
+        server.set_on_position_changed(
+            lambda positions, s=server: s.set_data({"positions": [float(positions[0])]})
+        )
+        server.start()
+        started.append(server)
+    yield {s.name: f"tcp://localhost:{s.server_port}" for s in started}
+    for server in started:
+        server.stop()
+
+
+def test_fleet_fan_out(servers):
+    async def scenario():
+        fleet = GasFleet(servers)
+        replies = await fleet.set_many({name: 1.5 + i for i, name in enumerate(servers)})
+        data = await fleet.read_all()
+        fleet.close()
+        return replies, data
+
+    replies, data = asyncio.run(scenario())
+
+    assert all(not isinstance(r, Exception) for r in replies.values())
+    assert [d["positions"][0] for d in data.values()] == [1.5, 2.5, 3.5]
+
+
+def test_timeout_discards_socket():
+    async def scenario():
+        pool = ConnectionPool()
+        node = GasNode("tcp://localhost:5619", name="GAS none", pool=pool, timeout=0.2, retries=1)
+        start = time.time()
+        with pytest.raises(GasTimeout):
+            await node.read()
+        return pool, time.time() - start
+
+    pool, elapsed = asyncio.run(scenario())
+
+    assert pool.open_sockets() == 0
+    assert elapsed < 1.0
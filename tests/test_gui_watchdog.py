@@ -0,0 +1,41 @@
+import logging
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtWidgets
+
+from gui_watchdog import GuiWatchdog
+from instrumentation import Instrumentation
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def _pump(seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def _block_event_loop(seconds):
+    time.sleep(seconds)
+
+
+def test_stall_is_counted_and_stack_logged(caplog):
+    instrumentation = Instrumentation()
+    watchdog = GuiWatchdog(instrumentation=instrumentation, heartbeat_ms=20, stall_threshold_ms=200)
+    with caplog.at_level(logging.WARNING, logger="laplace.gas"):
+        watchdog.start()
+        _pump(0.1)
+        assert watchdog.stalls == 0
+        _block_event_loop(0.5)
+        _pump(0.1)
+        watchdog.stop()
+
+    assert watchdog.stalls == 1
+    assert watchdog.max_stall_s >= 0.45
+    assert instrumentation.histograms["gui stall"].count == 1
+    stacks = [r.getMessage() for r in caplog.records if "stack:" in r.getMessage()]
+    assert len(stacks) == 1 and "_block_event_loop" in stacks[0]
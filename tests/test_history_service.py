@@ -0,0 +1,89 @@
+import pytest
+
+from gas_client.wire import CMD_HISTORY, decode_history, decode_reply, make_history_request
+from gas_server import GasServer
+from history_service import make_history_handler, register_history_command
+from laplace_server.protocol import DEVICE_GAS
+from sample_buffer import SampleRingBuffer
+
+
+class _FakeSocket:
+    def __init__(self):
+        self.sent = []
+        self.raw = []
+
+    def send_json(self, message):
+        self.sent.append(message)
+
+    def send(self, data):
+        self.raw.append(data)
+        self.sent.append(decode_reply(data))
+
+
+class _FakeServer:
+    name = "GAS test"
+
+    def __init__(self):
+        self.socket = _FakeSocket()
+
+
+def test_ring_buffer_wraps_and_slices():
+    buffer = SampleRingBuffer(capacity=5)
+    for i in range(8):
+        buffer.append(float(i), i * 10.0, 1.0)
+
+    rows = buffer.since(0.0)
+    assert len(buffer) == 5
+    assert list(rows[:, 0]) == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert list(buffer.last_seconds(1.5)[:, 1]) == [60.0, 70.0]
+    assert list(buffer.since(4.0, max_points=2)[:, 0]) == [6.0, 7.0]
+
+
+def test_history_round_trip():
+    buffer = SampleRingBuffer(capacity=100)
+    for i in range(50):
+        buffer.append(1000.0 + i * 0.2, 2.0 + i, 5.0)
+    server = _FakeServer()
+    handler = make_history_handler(buffer)
+
+    handler(server, make_history_request("test", server.name, since=1008.0), "test")
+
+    reply = server.socket.sent[-1]
+    assert reply["cmd"] == CMD_HISTORY
+    assert reply["payload"]["count"] == 10
+    rows = decode_history(reply)
+    assert rows.shape == (10, 3)
+    assert rows[0, 1] == 42.0
+
+
+def test_history_msgpack_reply():
+    pytest.importorskip("msgpack")
+    buffer = SampleRingBuffer(capacity=1000)
+    for i in range(1000):
+        buffer.append(1000.0 + i * 0.2, 2.0 + i, 5.0)
+    server = _FakeServer()
+    handler = make_history_handler(buffer)
+
+    handler(server, make_history_request("test", server.name, seconds=1e6), "test")
+    handler(server, make_history_request("test", server.name, seconds=1e6, encoding="msgpack"), "test")
+
+    json_size, msgpack_size = (len(raw) for raw in server.socket.raw)
+    assert msgpack_size < 0.8 * json_size
+    assert (decode_history(server.socket.sent[-1]) == decode_history(server.socket.sent[-2])).all()
+
+
+def test_history_rejects_empty_request():
+    server = _FakeServer()
+    make_history_handler(SampleRingBuffer(10))(server, make_history_request("test", server.name), "test")
+
+    assert server.socket.sent[-1]["error_msg"]
+
+
+def test_history_command_registered():
+    server = GasServer(name="GAS test", address="tcp://*:5631", freedom=1, device=DEVICE_GAS, data={})
+    try:
+        register_history_command(server, SampleRingBuffer(10))
+        assert CMD_HISTORY in server.capabilities
+    finally:
+        server.socket.close(0)
+        server.context.term()
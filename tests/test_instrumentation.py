@@ -0,0 +1,32 @@
+from instrumentation import Instrumentation, InstrumentedInstrument
+
+
+class _Device:
+    def readParameter(self, dde_nr):
+        return dde_nr * 2
+
+    def writeParameter(self, dde_nr, value):
+        return True
+
+
+def test_histogram_percentiles():
+    histogram = Instrumentation().histogram("read p8")
+    for _ in range(90):
+        histogram.record(0.001)
+    for _ in range(10):
+        histogram.record(0.2)
+    assert histogram.count == 100
+    assert 0.001 <= histogram.percentile(50) < 0.002
+    assert 0.2 <= histogram.percentile(99) <= 0.2
+    assert abs(histogram.mean - 0.0209) < 1e-9
+
+
+def test_instrument_proxy_counts_per_parameter(tmp_path):
+    instrumentation = Instrumentation()
+    device = InstrumentedInstrument(_Device(), instrumentation)
+    assert device.readParameter(8) == 16
+    device.readParameter(8)
+    device.writeParameter(9, 100)
+    assert instrumentation.histograms["read p8"].count == 2
+    assert instrumentation.histograms["write p9"].count == 1
+    assert instrumentation.dump(tmp_path / "timing.json").exists()
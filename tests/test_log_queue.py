@@ -0,0 +1,33 @@
+import logging
+
+from log_queue import LogQueue
+from qt_logging_bridge import QtLogHandler
+
+
+def test_records_reach_listener_handlers_and_bounded_view():
+    logger = logging.getLogger("test.log_queue")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    collected = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            collected.append(record.getMessage())
+
+    logger.addHandler(Collect())
+    log_queue = LogQueue(queue_size=1000).start(logger)
+    view = QtLogHandler(max_lines=5)
+    view.setLevel(logging.INFO)
+    log_queue.add_handler(view)
+    try:
+        for i in range(20):
+            logger.info("line %d", i)
+        logger.debug("hidden")
+    finally:
+        log_queue.stop()
+
+    assert collected == [f"line {i}" for i in range(20)] + ["hidden"]
+    lines, skipped = view.take()
+    assert lines == [f"[INFO] line {i}" for i in range(15, 20)]
+    assert skipped == 15
+    assert view.take() == ([], 0)
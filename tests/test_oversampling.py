@@ -0,0 +1,41 @@
+import time
+
+import pytest
+
+from oversampling import BlockStats, fill_block
+
+
+def test_block_mean_min_max():
+    block = BlockStats()
+    for value in (10, 12, 8, 10):
+        block.add(value)
+    assert block.take() == (10.0, 8, 12, 4)
+    # A new block starts after take()
+    assert block.take() == (None, None, None, 0)
+
+
+def test_failed_block_does_not_leak_into_the_next():
+    def reads(values):
+        values = iter(values)
+
+        def read():
+            value = next(values, None)
+            if isinstance(value, Exception):
+                raise value
+            return value
+        return read
+
+    block = BlockStats()
+    kept = []
+    with pytest.raises(OSError):
+        fill_block(block, reads([100, 200, OSError("bus error")]), 50, time.time() + 1.0, reads=kept)
+    assert kept == []
+
+    start = time.time()
+    mean, low, high, count = fill_block(block, reads([12, 14]), 10, time.time() + 0.05, min_read_interval=0.001,
+                                        reads=kept, first_at=start - 0.01)
+
+    assert (mean, low, high, count) == (12.0, 10, 14, 3)
+    assert [value for _, value in kept] == [10, 12, 14]
+    times = [t for t, _ in kept]
+    assert times[0] == start - 0.01 and times == sorted(times)
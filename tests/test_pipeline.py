@@ -0,0 +1,32 @@
+from pipeline import ACQUISITION, CONSUMER, SamplePipeline
+from sample_record import Sample
+
+
+def test_stage_order_and_insertion():
+    pipeline = SamplePipeline()
+    seen = []
+    pipeline.add("convert", lambda s: seen.append("convert"), ACQUISITION)
+    pipeline.add("record", lambda s: seen.append("record"), ACQUISITION)
+    pipeline.add("filter", lambda s: seen.append("filter"), ACQUISITION, before="record")
+    pipeline.add("display", lambda s: seen.append("display"), CONSUMER)
+
+    assert pipeline.run(ACQUISITION, Sample(0.0, 1.0))
+    assert seen == ["convert", "filter", "record"]
+    assert pipeline.timings()["filter"]["calls"] == 1
+    assert pipeline.timings()["display"]["calls"] == 0
+
+
+def test_drop_and_errors():
+    pipeline = SamplePipeline()
+    after = []
+    pipeline.add("broken", lambda s: 1 / 0, CONSUMER)
+    pipeline.add("after", after.append, CONSUMER)
+    assert pipeline.run(CONSUMER, Sample(0.0, 1.0))
+    assert len(after) == 1 and pipeline.timings()["broken"]["errors"] == 1
+
+    # A failing required stage, or a stage returning False, drops the sample
+    pipeline.add("broken", lambda s: 1 / 0, CONSUMER, required=True)
+    assert not pipeline.run(CONSUMER, Sample(0.0, 1.0))
+    pipeline.add("broken", lambda s: False, CONSUMER)
+    assert not pipeline.run(CONSUMER, Sample(0.0, 1.0))
+    assert len(after) == 1
@@ -0,0 +1,44 @@
+import threading
+import time
+
+from profiling import MODE_SAMPLING, ProfilingSession
+
+
+def _busy(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_sampling_session_writes_reports(tmp_path):
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy, args=(stop,))
+    worker.start()
+    session = ProfilingSession(tmp_path, duration_s=0.3, mode=MODE_SAMPLING, tracemalloc_interval_s=0.1)
+    session.watch("worker", worker.ident)
+    session.start()
+    session.join(timeout=10)
+    stop.set()
+    worker.join()
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert any("_sampling_worker" in name for name in names)
+    assert any("_memory_tracemalloc" in name for name in names)
+    assert "_busy" in next(tmp_path.glob("*_stacks_worker.txt")).read_text()
+
+
+def test_cprofile_session_waits_for_detach(tmp_path):
+    session = ProfilingSession(tmp_path, duration_s=0.2, tracemalloc_interval_s=0)
+
+    def profiled():
+        session.attach("worker")
+        while session.active:
+            sum(i * i for i in range(1000))
+            time.sleep(0.01)
+        session.detach("worker")
+
+    worker = threading.Thread(target=profiled)
+    worker.start()
+    session.start()
+    session.join(timeout=10)
+    worker.join()
+    assert "<genexpr>" in next(tmp_path.glob("*_cprofile_worker.txt")).read_text()
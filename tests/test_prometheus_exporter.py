@@ -0,0 +1,28 @@
+import urllib.request
+
+from instrumentation import Instrumentation
+from prometheus_exporter import MetricsExporter
+from sample_record import Sample
+
+
+def test_metrics_page_served_from_memory():
+    instrumentation = Instrumentation()
+    instrumentation.histogram("read p8").record(0.004)
+    exporter = MetricsExporter(port=0, instrumentation=instrumentation, name="GAS He")
+    exporter.observe(Sample(1000.0, 2.5, valve=40.0, alarm=0, setpoint=3.0))
+    exporter.observe(Sample(1000.2, 2.6, valve=41.0, alarm=32, setpoint=3.0))
+    exporter.observe(Sample(1000.4, 2.7, valve=41.0, alarm=32, setpoint=3.0))
+    exporter.set_online(False)
+    exporter.set_online(True)
+
+    assert exporter.start()
+    try:
+        body = urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5).read().decode()
+    finally:
+        exporter.stop()
+
+    assert 'gas_pressure_bar{name="GAS He"} 2.7' in body
+    assert 'gas_status_bit{name="GAS He",bit="5"} 1' in body
+    assert 'gas_critical_alarms_total{name="GAS He"} 1' in body
+    assert 'gas_reconnects_total{name="GAS He"} 1' in body
+    assert 'gas_latency_seconds_bucket{name="GAS He",op="read p8",le="+Inf"} 1' in body
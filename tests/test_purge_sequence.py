@@ -0,0 +1,83 @@
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtWidgets
+
+from purge_sequence import HOLDING, IDLE, TARGET, TIMEOUT, PurgeSequence
+from sample_record import Sample
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def _sample(t, pressure):
+    return Sample(t, pressure)
+
+
+def _sequence(**kwargs):
+    closed = []
+    ended = []
+    sequence = PurgeSequence(close_valve=lambda generation: closed.append(generation), **kwargs)
+    sequence.finished.connect(lambda reason, elapsed, generation: ended.append(reason))
+    return sequence, closed, ended
+
+
+def test_target_reached_after_hold():
+    sequence, closed, ended = _sequence(tolerance_bar=1.0, hold_s=0.5)
+    sequence.start(0.0, timeout_s=60.0)
+    sequence.check(_sample(0.0, 5.0))
+    sequence.check(_sample(0.1, 0.8))
+    assert sequence.state == HOLDING
+    sequence.check(_sample(0.2, 1.5))  # Left the band: hold restarts
+    sequence.check(_sample(0.3, 0.5))
+    sequence.check(_sample(0.7, 0.4))
+    assert not closed
+    sequence.check(_sample(0.8, 0.3))
+    assert closed == [1] and ended == [TARGET]
+    assert sequence.state == IDLE
+    assert sequence.peak_bar == 5.0
+
+    sequence.check(_sample(0.9, 0.3))  # Ended: nothing more
+    assert len(closed) == 1
+
+
+def test_timeout_and_cancel():
+    sequence, closed, ended = _sequence()
+    sequence.start(0.0, timeout_s=0.0)
+    time.sleep(0.01)
+    sequence.expire()  # GUI backstop, no sample needed
+    assert ended == [TIMEOUT]
+
+    sequence.start(0.0, timeout_s=60.0)
+    sequence.cancel()
+    sequence.check(_sample(0.0, 0.0))
+    assert len(closed) == 1
+
+
+def test_late_finish_of_an_older_purge_is_not_current():
+    sequence, closed, ended = _sequence()
+    finished = []
+    sequence.finished.connect(lambda reason, elapsed, generation: finished.append(generation))
+    sequence.start(0.0, timeout_s=60.0)
+    sequence.check(_sample(0.0, 0.0))  # Ends: 'finished' would be queued to the GUI
+    assert finished == [1] and sequence.is_current(1)
+
+    sequence.cancel()  # The user changed mode before the GUI handled it
+    assert not sequence.is_current(1)
+
+    sequence.start(0.0, timeout_s=60.0)
+    assert sequence.timer.isActive()
+    sequence._stop_backstop(TARGET, 0.0, 1)  # The late signal leaves the new backstop running
+    assert sequence.timer.isActive()
+    sequence.cancel()
+    assert not sequence.timer.isActive()
+
+
+def test_single_low_glitch_does_not_end_the_purge():
+    sequence, closed, ended = _sequence(tolerance_bar=0.5)
+    sequence.start(0.0, timeout_s=60.0)
+    glitch = _sample(0.0, 0.0)
+    glitch.filtered = 5.0  # Replaced by the median of the window
+    sequence.check(glitch)
+    assert not closed and sequence.last_diff == 5.0
@@ -0,0 +1,31 @@
+import random
+import statistics
+
+from running_median import HampelFilter, RunningMedian
+
+
+def test_median_and_mad_match_brute_force():
+    rng = random.Random(3)
+    for window in (1, 2, 5, 16):
+        running = RunningMedian(window)
+        values = []
+        for _ in range(500):
+            value = rng.choice([rng.gauss(0.0, 1.0), float(rng.randint(0, 3))])
+            running.add(value)
+            values.append(value)
+            last = values[-window:]
+            median = statistics.median(last)
+            assert running.median() == median
+            assert abs(running.mad() - statistics.median(abs(v - median) for v in last)) < 1e-12
+
+
+def test_hampel_rejects_spike_but_follows_step():
+    hampel = HampelFilter(window=7, n_sigmas=3.0, min_deviation=0.05)
+    for i in range(20):
+        hampel.update(5.0 + 0.01 * (i % 3))
+    filtered, outlier = hampel.update(12.0)
+    assert outlier and abs(filtered - 5.01) < 0.011
+
+    # A real step is accepted once it fills half of the window
+    results = [hampel.update(8.0) for _ in range(6)]
+    assert results[-1] == (8.0, False)
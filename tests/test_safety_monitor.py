@@ -0,0 +1,74 @@
+from PyQt6.QtCore import QMutex
+
+from safety_monitor import SafetyMonitor
+from sample_record import Sample
+
+
+class _Device:
+    def __init__(self, fail_on=None, result=True):
+        self.writes = []
+        self.fail_on = fail_on
+        self.result = result
+
+    def writeParameter(self, dde_nr, value):
+        if dde_nr == self.fail_on:
+            raise IOError("no acknowledgement")
+        self.writes.append((dde_nr, value))
+        return self.result
+
+
+def _sample(t, pressure, setpoint=10.0):
+    sample = Sample(t, pressure, setpoint=setpoint)
+    sample.filtered = setpoint  # The outlier filter must not hide an over-pressure
+    return sample
+
+
+def test_trips_after_delay_once_per_arming():
+    device = _Device()
+    monitor = SafetyMonitor(device, QMutex(), tolerance_bar=2.0, delay_s=1.0, safe_setpoint_raw=0)
+    trips = []
+    monitor.tripped.connect(trips.append)
+
+    monitor.check(_sample(0.0, 20.0))
+    assert not device.writes  # Not armed
+
+    monitor.arm()
+    monitor.check(_sample(1.0, 12.5))
+    monitor.check(_sample(1.5, 11.0))  # Back under the limit: delay restarts
+    monitor.check(_sample(2.0, 12.5))
+    monitor.check(_sample(2.9, 12.5))
+    assert not device.writes
+    monitor.check(_sample(3.0, 12.5))
+    assert device.writes == [(118, 0), (9, 0), (12, 0)]
+    assert len(trips) == 1 and trips[0]["limit"] == 12.0 and trips[0]["success"]
+    assert not monitor.armed
+
+    monitor.check(_sample(4.0, 30.0))
+    assert monitor.trips == 1
+
+
+def _trip(device):
+    monitor = SafetyMonitor(device, QMutex(), tolerance_bar=2.0, delay_s=0.0, safe_setpoint_raw=0)
+    trips = []
+    monitor.tripped.connect(trips.append)
+    monitor.arm()
+    monitor.check(_sample(0.0, 20.0))
+    return monitor, trips
+
+
+def test_raising_write_still_reports_the_trip():
+    device = _Device(fail_on=118)
+    monitor, trips = _trip(device)
+    assert device.writes == [(9, 0), (12, 0)]  # The other commands are still sent
+    assert len(trips) == 1
+    assert not trips[0]["success"] and trips[0]["failed"] == [118]
+    assert monitor.mutex.tryLock()  # Released
+    assert not monitor.armed and monitor.trips == 1
+
+
+def test_unacknowledged_writes_are_reported():
+    device = _Device(result=False)
+    monitor, trips = _trip(device)
+    assert len(device.writes) == 3
+    assert len(trips) == 1
+    assert not trips[0]["success"] and trips[0]["failed"] == [118, 9, 12]
@@ -0,0 +1,11 @@
+from sample_record import Sample
+
+
+def test_status_from_alarm_word():
+    assert Sample(0.0, 1.0).status is None
+    assert Sample(0.0, 1.0, alarm=0).status == 'Normal'
+    assert Sample(0.0, 1.0, alarm=2).status == 'Warning'
+    assert Sample(0.0, 1.0, alarm=3).status == 'Error'
+    assert not Sample(0.0, 1.0, alarm=3).critical
+    assert Sample(0.0, 1.0, alarm=32).critical
+    assert Sample(0.0, 1.0, alarm=8).critical
@@ -0,0 +1,74 @@
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtWidgets
+from laplace_server.protocol import CMD_SET, make_set_request
+
+from setpoint_coalescer import RemoteSetpointCoalescer, register_set_ack
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def _pump(seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        app.processEvents()
+        time.sleep(0.002)
+
+
+def _coalescer(window_ms, max_rate_hz):
+    coalescer = RemoteSetpointCoalescer(window_ms=window_ms, max_rate_hz=max_rate_hz)
+    applied = []
+    coalescer.apply.connect(lambda value: applied.append((time.time(), value)))
+    return coalescer, applied
+
+
+def test_burst_applies_only_the_last_value():
+    coalescer, applied = _coalescer(window_ms=30, max_rate_hz=100.0)
+    for i in range(200):
+        coalescer.submit(i * 0.01)
+    _pump(0.15)
+
+    assert [value for _, value in applied] == [1.99]
+    assert (coalescer.requests_total, coalescer.writes_total) == (200, 1)
+
+
+def test_rate_limit_holds_across_bursts():
+    coalescer, applied = _coalescer(window_ms=10, max_rate_hz=5.0)
+    for burst in range(4):
+        for i in range(20):
+            coalescer.submit(burst + i / 100.0)
+        _pump(0.05)
+    _pump(0.8)
+
+    times = [t for t, _ in applied]
+    assert applied[-1][1] == 3.19
+    assert len(applied) < 4  # Bursts 50 ms apart, at most one write per 200 ms
+    assert all(b - a >= 0.2 - 0.01 for a, b in zip(times, times[1:]))
+
+
+def test_set_reply_carries_last_applied():
+    class _Socket:
+        def send_json(self, message):
+            self.reply = message
+
+    class _Server:
+        name = "GAS test"
+        socket = _Socket()
+        positions = None
+
+        def register_command(self, cmd, handler):
+            self.handler = handler
+
+        def emit(self, callback, positions):
+            self.positions = positions
+
+    server = _Server()
+    register_set_ack(server, lambda: 2.5)
+    server.handler(server, make_set_request("test", server.name, positions=[3.0]), "test")
+
+    assert server.positions == [3.0]
+    assert server.socket.reply["cmd"] == CMD_SET
+    assert server.socket.reply["payload"] == {"queued": [3.0], "last_applied": 2.5}
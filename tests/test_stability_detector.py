@@ -0,0 +1,39 @@
+from stability_detector import StabilityDetector
+
+
+def test_stabilizes_after_full_window():
+    """A flat trace on setpoint becomes stable once the window is filled."""
+    detector = StabilityDetector(window_s=2.0, relative_tolerance=0.01,
+                                 absolute_tolerance=0.05, max_slope=0.02)
+    t = 100.0
+    results = []
+    for _ in range(40):
+        t += 0.1
+        results.append(detector.update(t, 5.01, 5.0))
+
+    assert not results[0]
+    assert results[-1]
+    assert 102.0 < detector.stable_since < 102.25
+
+
+def test_ramp_is_not_stable():
+    """A slow ramp inside the band is rejected by the slope criterion."""
+    detector = StabilityDetector(window_s=2.0, absolute_tolerance=0.5, max_slope=0.02)
+    t = 0.0
+    for i in range(60):
+        t += 0.1
+        detector.update(t, 5.0 + 0.1 * (t - 3.0), 5.0)
+
+    assert abs(detector.slope - 0.1) < 1e-6
+    assert not detector.stabilized
+
+
+def test_setpoint_change_resets():
+    detector = StabilityDetector(window_s=1.0)
+    for i in range(30):
+        detector.update(i * 0.1, 2.0, 2.0)
+    assert detector.stabilized
+
+    detector.update(3.1, 2.0, 4.0)
+    assert not detector.stabilized
+    assert detector.stable_since is None
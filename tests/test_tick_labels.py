@@ -0,0 +1,27 @@
+import datetime as dt
+import random
+
+from tick_labels import TickLabelCache
+
+
+def _reference(value):
+    return dt.datetime.fromtimestamp(value, dt.timezone.utc).astimezone(None).strftime('%H:%M:%S')
+
+
+def test_labels_match_local_time():
+    cache = TickLabelCache()
+    rng = random.Random(1)
+    values = [rng.uniform(1.6e9, 1.9e9) for _ in range(500)] + [1.8e9, 1.8e9 + 59.9999999]
+    assert cache.labels(values, 1.0) == [_reference(v) for v in values]
+    assert cache.labels(values, 1.0) == [_reference(v) for v in values]  # From the cache
+
+
+def test_sub_second_spacing_and_errors():
+    cache = TickLabelCache()
+    base = 1.8e9 + 30
+    seconds = _reference(base)
+    assert cache.labels([base + 0.25], 0.05) == [seconds + ".25"]
+    assert cache.labels([base + 0.123], 0.001) == [seconds + ".123"]
+    assert cache.labels([base + 0.5], 0.5) == [seconds + ".5"]
+    assert cache.labels([base + 0.9999], 0.01) == [_reference(base + 1) + ".00"]
+    assert cache.labels([float("nan")], 1.0) == ['']
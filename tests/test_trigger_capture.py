@@ -0,0 +1,57 @@
+import time
+
+from sample_record import Sample
+from trigger_capture import TriggerCapture
+
+
+def test_pre_and_post_windows_written(tmp_path):
+    rates = []
+    capture = TriggerCapture(folder=lambda: tmp_path, set_fast=rates.append, pre_s=1.0, post_s=0.5, period_s=0.1)
+    now = time.time()
+    for i in range(20):  # 2 s of history, only the last second is kept
+        capture.record(Sample(now - 2.0 + i * 0.1, 1.0, setpoint=1.0, alarm=0))
+    assert capture.trigger("manual")
+    assert not capture.trigger("alarm")
+
+    t = now
+    while capture.capturing or not capture.captures:
+        capture.record(Sample(t, 2.0, setpoint=1.0, alarm=8))
+        t += 0.05
+    assert rates == [True, False]
+
+    for _ in range(100):
+        if capture.files:
+            break
+        time.sleep(0.01)
+    lines = capture.files[0].read_text().splitlines()
+    assert lines[0] == "# trigger: manual"
+    rows = [line.split(",") for line in lines[4:]]
+    pre = [row for row in rows if row[2] == "pre"]
+    post = [row for row in rows if row[2] == "post"]
+    assert 9 <= len(pre) <= 12
+    assert len(post) >= 10 and post[-1][8] == "8"
+
+
+def test_oversampled_blocks_written_read_by_read(tmp_path):
+    capture = TriggerCapture(folder=lambda: tmp_path, set_fast=lambda fast: None, pre_s=1.0, post_s=0.1,
+                             period_s=0.2, convert=lambda raw: raw / 100.0)
+    now = time.time()
+    for i in range(3):
+        sample = Sample(now - 0.6 + i * 0.2, 1.0, setpoint=1.0, alarm=0, reads=4)
+        sample.block_reads = [(sample.timestamp - 0.075 + k * 0.05, 100 + k) for k in range(4)]
+        capture.record(sample)
+    capture.trigger("manual")
+    capture.record(Sample(now, 1.0, setpoint=1.0, alarm=0))  # Without reads: block row
+    capture.record(Sample(now + 0.2, 1.0, setpoint=1.0, alarm=0))
+
+    for _ in range(100):
+        if capture.files:
+            break
+        time.sleep(0.01)
+    rows = [line.split(",") for line in capture.files[0].read_text().splitlines()[4:]]
+    pre = [row for row in rows if row[2] == "pre"]
+    assert len(pre) == 3 * 4 + 1
+    assert [row[3] for row in pre[:4]] == ["1.00000", "1.01000", "1.02000", "1.03000"]
+    assert all(row[9] == "1" and row[4] == "" for row in pre[:12])
+    times = [float(row[1]) for row in pre]
+    assert times == sorted(times)
@@ -0,0 +1,35 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtWidgets
+
+from ui_state import UiState
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_unchanged_values_are_skipped():
+    ui = UiState()
+    label = QtWidgets.QLabel()
+    assert ui.set_text(label, "1.00")
+    assert not ui.set_text(label, "1.00")
+    assert ui.set_style(label, "color: red;")
+    assert not ui.set_style(label, "color: red;")
+    label.setText("...")  # Written elsewhere: compared with the widget, not a copy
+    assert ui.set_text(label, "1.00")
+    assert (ui.applied, ui.skipped) == (3, 2)
+
+
+def test_enabled_ignores_parent_state():
+    ui = UiState()
+    parent = QtWidgets.QWidget()
+    button = QtWidgets.QPushButton(parent)
+    parent.setEnabled(False)
+    assert not ui.set_enabled(button, True)  # Own flag is still set
+    assert ui.set_enabled(button, False)
+    assert not ui.set_enabled(button, False)
+    parent.setEnabled(True)
+    assert not button.isEnabled()
+    assert ui.set_enabled(button, True)
+    assert button.isEnabled()
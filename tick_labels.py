@@ -0,0 +1,72 @@
+"""
+Time axis tick labels.
+Labels for epoch timestamps in local time, cached on (value, spacing).
+The UTC offset is looked up once per hour of time (DST changes happen on
+hour boundaries) and the label is built arithmetically, without datetime.
+"""
+
+# libraries
+import datetime as dt
+import math
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+
+class TickLabelCache:
+    """
+    'labels(values, spacing)': HH:MM:SS, with 1 to 3 decimals of seconds
+    when the tick spacing is below one second.
+    """
+
+    def __init__(self, max_size=2048):
+        self.max_size = int(max_size)
+        self._labels = {}
+        self._offsets = {}  # hour index -> UTC offset (s)
+
+    def utc_offset(self, value):
+        hour = int(value // SECONDS_PER_HOUR)
+        offset = self._offsets.get(hour)
+        if offset is None:
+            if len(self._offsets) > 256:
+                self._offsets.clear()
+            local = dt.datetime.fromtimestamp(hour * SECONDS_PER_HOUR, dt.timezone.utc).astimezone(None)
+            offset = self._offsets[hour] = local.utcoffset().total_seconds()
+        return offset
+
+    @staticmethod
+    def decimals(spacing):
+        if spacing >= 1.0 or spacing <= 0:
+            return 0
+        return min(3, max(1, math.ceil(-math.log10(spacing) - 1e-9)))
+
+    def label(self, value, spacing):
+        key = (value, spacing)
+        text = self._labels.get(key)
+        if text is None:
+            if len(self._labels) >= self.max_size:
+                self._labels.clear()
+            text = self._labels[key] = self._format(value, self.decimals(spacing))
+        return text
+
+    def labels(self, values, spacing):
+        strings = []
+        for value in values:
+            try:
+                strings.append(self.label(value, spacing))
+            except (ValueError, OverflowError, OSError):
+                strings.append('')
+        return strings
+
+    def _format(self, value, decimals):
+        # Microseconds like datetime; with decimals, round first so the carry goes into the seconds
+        local = round(value + self.utc_offset(value), decimals or 6)
+        seconds_of_day = local % SECONDS_PER_DAY
+        whole = int(seconds_of_day)
+        hours, rest = divmod(whole, SECONDS_PER_HOUR)
+        minutes, seconds = divmod(rest, 60)
+        text = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        if decimals:
+            fraction = int(round((seconds_of_day - whole) * 10 ** decimals))
+            text += f".{min(fraction, 10 ** decimals - 1):0{decimals}d}"
+        return text
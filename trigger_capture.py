@@ -0,0 +1,122 @@
+"""
+Pre-/post-trigger capture.
+A short ring buffer keeps the last samples; on a trigger (alarm, purge,
+manual) the acquisition period is lowered for the post-trigger window and
+both windows are written to a CSV file by a background thread.
+With oversampling, samples carry the individual reads of their block, and
+these are written one per row instead of the block average.
+"""
+
+# libraries
+import logging
+import threading
+import time
+from collections import deque
+
+log = logging.getLogger("laplace.gas")
+
+COLUMNS = ("t_rel_s", "timestamp", "phase", "pressure_bar", "pressure_min_bar", "pressure_max_bar",
+           "setpoint_bar", "valve_percent", "status_word", "reads")
+
+
+class TriggerCapture:
+    """
+    'record(sample)' is an acquisition stage; 'trigger(reason)' may be called
+    from any thread and is picked up with the next sample.
+
+    'set_fast(True/False)' is called from the measurement thread when the
+    post-trigger window starts and ends (raised / normal polling rate).
+    'folder()' returns the folder of the capture files. 'convert(raw)'
+    returns the pressure in bar of a raw read ('Sample.block_reads').
+    """
+
+    def __init__(self, folder, set_fast, pre_s=10.0, post_s=10.0, period_s=0.2, convert=None):
+        self.folder = folder
+        self.set_fast = set_fast
+        self.convert = convert
+        self.pre_s = float(pre_s)
+        self.post_s = float(post_s)
+        # Twice the expected number of samples, trimmed by time when triggered
+        self._pre = deque(maxlen=max(10, int(2 * self.pre_s / max(float(period_s), 0.001))))
+        self._post = None           # List of rows while capturing
+        self._trigger = None        # (reason, time) requested, not yet started
+        self._current = None        # (reason, time) of the running capture
+        self._ends_at = 0.0
+        self.captures = 0
+        self.files = []
+
+    @property
+    def capturing(self):
+        return self._post is not None
+
+    def trigger(self, reason):
+        """Requests a capture; ignored while one is requested or running."""
+        if self._trigger is None and self._post is None:
+            self._trigger = (reason, time.time())
+            return True
+        log.debug(f"Capture trigger '{reason}' ignored: a capture is already running.")
+        return False
+
+    # --- Measurement thread ---
+    def record(self, sample):
+        """Acquisition stage."""
+        row = (sample.timestamp, sample.pressure, sample.pressure_min, sample.pressure_max,
+               sample.setpoint, sample.valve, sample.alarm, sample.reads, sample.block_reads)
+        if self._post is not None:
+            self._post.append(row)
+            if sample.timestamp >= self._ends_at:
+                self._finish()
+            return
+        self._pre.append(row)
+        if self._trigger is not None:
+            self._current, self._trigger = self._trigger, None
+            self._ends_at = self._current[1] + self.post_s
+            self._post = []
+            self.set_fast(True)
+            log.info(f"Capture started ({self._current[0]}), post-trigger window {self.post_s:.0f} s.")
+
+    def _finish(self):
+        self.set_fast(False)
+        reason, triggered_at = self._current
+        pre = [row for row in self._pre if row[0] >= triggered_at - self.pre_s]
+        post = self._post
+        self._pre.clear()
+        self._post = self._current = None
+        self.captures += 1
+        threading.Thread(target=self._write, args=(reason, triggered_at, pre, post),
+                         name="capture-writer", daemon=True).start()
+
+    # --- Writer thread ---
+    def _write(self, reason, triggered_at, pre, post):
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(triggered_at))
+        safe_reason = "".join(c if c.isalnum() else "_" for c in reason)[:32]
+        try:
+            folder = self.folder()
+            path = folder / f"capture_{stamp}_{safe_reason}.csv"
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(f"# trigger: {reason}\n")
+                f.write(f"# time: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(triggered_at))}"
+                        f".{int(triggered_at * 1000) % 1000:03d} ({triggered_at:.3f})\n")
+                f.write(f"# pre: {len(pre)} samples, post: {len(post)} samples\n")
+                f.write(",".join(COLUMNS) + "\n")
+                for phase, rows in (("pre", pre), ("post", post)):
+                    for timestamp, pressure, p_min, p_max, setpoint, valve, alarm, reads, block_reads in rows:
+                        status = '' if alarm is None else alarm
+                        if block_reads and self.convert is not None:
+                            # One row per read of the block (min/max left empty)
+                            for read_at, raw in block_reads:
+                                f.write(f"{read_at - triggered_at:.4f},{read_at:.4f},{phase},"
+                                        f"{_fmt(self.convert(raw))},,,{_fmt(setpoint)},{_fmt(valve)},{status},1\n")
+                            continue
+                        f.write(f"{timestamp - triggered_at:.3f},{timestamp:.3f},{phase},{_fmt(pressure)},"
+                                f"{_fmt(p_min)},{_fmt(p_max)},{_fmt(setpoint)},{_fmt(valve)},"
+                                f"{status},{reads}\n")
+        except OSError as e:
+            log.error(f"Could not write the capture file: {e}")
+            return
+        self.files.append(path)
+        log.info(f"Capture ({reason}) written to {path}")
+
+
+def _fmt(value):
+    return "" if value is None else f"{value:.5f}"
@@ -0,0 +1,54 @@
+"""
+Change-only widget updates.
+setText / setStyleSheet / setEnabled are only called when the value
+differs from what the widget shows: an unchanged stylesheet is not
+re-polished and an unchanged label does not trigger a relayout.
+"""
+
+# libraries
+from PyQt6.QtCore import Qt
+
+
+class UiState:
+    """
+    Compares with the widget's current value rather than a shadow copy, so
+    direct writes elsewhere (flicker timer, dialogs) can never leave it out
+    of date. 'applied' / 'skipped' count the calls passed to Qt or saved.
+    """
+
+    def __init__(self):
+        self.applied = 0
+        self.skipped = 0
+
+    def set_text(self, widget, text):
+        if widget.text() == text:
+            self.skipped += 1
+            return False
+        widget.setText(text)
+        self.applied += 1
+        return True
+
+    def set_style(self, widget, style):
+        if widget.styleSheet() == style:
+            self.skipped += 1
+            return False
+        widget.setStyleSheet(style)
+        self.applied += 1
+        return True
+
+    def set_enabled(self, widget, enabled):
+        # The widget's own flag: isEnabled() is also False when a parent is disabled
+        if widget.testAttribute(Qt.WidgetAttribute.WA_ForceDisabled) != enabled:
+            self.skipped += 1
+            return False
+        widget.setEnabled(enabled)
+        self.applied += 1
+        return True
+
+    def show_message(self, status_bar, text):
+        if status_bar.currentMessage() == text:
+            self.skipped += 1
+            return False
+        status_bar.showMessage(text)
+        self.applied += 1
+        return True